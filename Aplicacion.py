@@ -1,7 +1,8 @@
 import streamlit as st
-import yfinance as yf
 import os
 
+from servicio_cotizaciones import ServicioCotizaciones
+
 # ---------------------- CINTA SUPERIOR CON DIVISAS, CRIPTOS Y COMMODITIES ----------------------
 
 # Ticker: nombre -> símbolo de Yahoo Finance
@@ -16,9 +17,18 @@ activos = {
     "ETH/USD": "ETH-USD",
 }
 
-# Descargar precios actuales
-precios = yf.download(list(activos.values()), period="1d")['Close'].iloc[-1]
-texto_ticker = " | ".join([f"{nombre}: ${precios[ticker]:,.2f}" for nombre, ticker in activos.items()])
+# Servicio compartido por todas las sesiones: se refresca en segundo plano y
+# la página solo lee la última instantánea
+@st.cache_resource
+def obtener_servicio_cotizaciones():
+    return ServicioCotizaciones(list(activos.values())).iniciar()
+
+# Solo el primer arranque del proceso espera (como mucho unos segundos) a la red
+precios = obtener_servicio_cotizaciones().esperar_primera_carga(timeout=5).precios
+texto_ticker = " | ".join([
+    f"{nombre}: ${precios[ticker]:,.2f}" if ticker in precios else f"{nombre}: n/d"
+    for nombre, ticker in activos.items()
+])
 
 # Mostrar ticker en movimiento con HTML y CSS
 st.markdown(f"""
@@ -0,0 +1,279 @@
+# almacen_precios.py
+import json
+import os
+import tempfile
+import threading
+
+import numpy as np
+import pandas as pd
+
+# Directorio por defecto del almacén local de precios (un Parquet por ticker)
+RUTA_PRECIOS = os.environ.get(
+    "PRECIOS_CACHE",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "precios")
+)
+
+# Días hábiles seguidos sin sesión que se aceptan como festivos. yfinance no
+# falla con una excepción sino con una tabla vacía, así que una descarga vacía
+# solo se marca como cubierta si el calendario prueba que no pudo haber
+# sesiones: un fin de semana, o unos pocos días hábiles (festivos) entre
+# datos ya guardados a ambos lados. Cualquier otro hueco vacío se reintenta.
+MAX_FESTIVOS_SEGUIDOS = 2
+
+
+def _normalizar_columnas(data: pd.DataFrame) -> pd.DataFrame:
+    """Quitar el nivel de ticker que yfinance añade a las columnas."""
+    if isinstance(data.columns, pd.MultiIndex):
+        data = data.copy()
+        data.columns = data.columns.get_level_values(0)
+    data.columns.name = None
+    if isinstance(data.index, pd.DatetimeIndex) and data.index.tz is not None:
+        data = data.tz_localize(None)
+    return data
+
+
+def descargar_yfinance(ticker: str, fecha_inicio, fecha_fin) -> pd.DataFrame:
+    """Descargar precios diarios de Yahoo Finance en ``[fecha_inicio, fecha_fin)``."""
+    import yfinance as yf
+
+    data = yf.download(ticker, start=str(fecha_inicio), end=str(fecha_fin))
+    return _normalizar_columnas(data)
+
+
+def separar_tickers(data: pd.DataFrame, tickers) -> dict:
+    """Repartir una descarga conjunta (columnas ``(Price, Ticker)``) en un DataFrame por ticker."""
+    if not isinstance(data.columns, pd.MultiIndex):
+        return {tickers[0]: _normalizar_columnas(data)} if len(tickers) == 1 else {}
+    nivel = data.columns.nlevels - 1
+    presentes = set(data.columns.get_level_values(nivel))
+    return {
+        ticker: _normalizar_columnas(data.xs(ticker, axis=1, level=nivel).dropna(how="all"))
+        for ticker in tickers if ticker in presentes
+    }
+
+
+def descargar_yfinance_varios(tickers, fecha_inicio, fecha_fin) -> dict:
+    """Descargar varios tickers en una sola petición a Yahoo Finance."""
+    import yfinance as yf
+
+    tickers = list(tickers)
+    data = yf.download(tickers, start=str(fecha_inicio), end=str(fecha_fin))
+    return separar_tickers(data, tickers)
+
+
+class DescargadorFalso:
+    """Descargador sin red con precios sintéticos deterministas por ticker.
+
+    Guarda en ``llamadas`` cada rango pedido, para comprobar qué huecos se
+    descargaron realmente.
+    """
+
+    def __init__(self):
+        self.llamadas = []
+
+    def __call__(self, ticker: str, fecha_inicio, fecha_fin) -> pd.DataFrame:
+        inicio, fin = pd.Timestamp(fecha_inicio), pd.Timestamp(fecha_fin)
+        self.llamadas.append((ticker, inicio, fin))
+        fechas = pd.bdate_range(inicio, fin - pd.Timedelta(days=1), name="Date")
+        # Paseo aleatorio anclado en una fecha fija: el precio de un día es el
+        # mismo sea cual sea el rango pedido.
+        semilla = sum(map(ord, ticker))
+        dias = (fechas - pd.Timestamp("2000-01-01")).days.to_numpy()
+        ruido = np.sin(dias * 0.37 + semilla) * 0.02 + np.cos(dias * 0.011 + semilla) * 0.3
+        cierre = 50 + semilla % 200 + dias * 0.01 + ruido * 10
+        return pd.DataFrame({
+            "Close": cierre,
+            "High": cierre * 1.01,
+            "Low": cierre * 0.99,
+            "Open": cierre * (1 + ruido * 0.01),
+            "Volume": (1e6 + dias * 10).astype(np.int64),
+        }, index=fechas)
+
+
+def _unir_rangos(rangos):
+    """Fusionar rangos ``[inicio, fin)`` solapados o contiguos."""
+    unidos = []
+    for inicio, fin in sorted(rangos):
+        if unidos and inicio <= unidos[-1][1]:
+            unidos[-1] = (unidos[-1][0], max(unidos[-1][1], fin))
+        else:
+            unidos.append((inicio, fin))
+    return unidos
+
+
+def _reemplazar(ruta, escribir):
+    """Escribir ``ruta`` de forma atómica: otra sesión nunca lee un archivo a medias.
+
+    ``escribir(temporal)`` crea el archivo en un temporal de nombre único del
+    mismo directorio, así que dos sesiones o procesos que guardan el mismo
+    ticker a la vez no escriben en el mismo temporal; gana el último
+    ``os.replace``, siempre con un archivo completo.
+    """
+    directorio, nombre = os.path.split(ruta)
+    with tempfile.NamedTemporaryFile(dir=directorio, prefix=f".{nombre}.", suffix=".tmp", delete=False) as f:
+        temporal = f.name
+    try:
+        escribir(temporal)
+        os.replace(temporal, ruta)
+    except BaseException:
+        try:
+            os.remove(temporal)
+        except OSError:
+            pass
+        raise
+
+
+class AlmacenPrecios:
+    """Almacén local incremental de precios OHLCV diarios por ticker.
+
+    Cada ticker se guarda en un Parquet junto a un JSON con los rangos de
+    fechas ya descargados; solo se piden al descargador los huecos que falten.
+
+    ``descargador_varios`` baja varios tickers en una sola petición (ver
+    ``obtener_varios``); si no se indica, con el descargador de yfinance se
+    usa la descarga conjunta y con cualquier otro se pide ticker a ticker.
+
+    Sin ``directorio`` se usa ``PRECIOS_CACHE`` (leída al crear el almacén)
+    o ``RUTA_PRECIOS``; sin ``descargador``, las funciones de yfinance de
+    este módulo.
+    """
+
+    def __init__(self, directorio: str | None = None, descargador=None, descargador_varios=None):
+        if directorio is None:
+            directorio = os.environ.get("PRECIOS_CACHE", RUTA_PRECIOS)
+        if descargador is None:
+            descargador = descargar_yfinance
+            descargador_varios = descargador_varios or descargar_yfinance_varios
+        self.directorio = directorio
+        self.descargador = descargador
+        self.descargador_varios = descargador_varios
+        self._lock = threading.Lock()
+        os.makedirs(directorio, exist_ok=True)
+
+    def _ruta(self, ticker: str, extension: str) -> str:
+        nombre = "".join(c if c.isalnum() or c in "-_" else "_" for c in ticker)
+        return os.path.join(self.directorio, f"{nombre}.{extension}")
+
+    def rangos(self, ticker: str):
+        """Rangos ``[inicio, fin)`` ya cubiertos para el ticker."""
+        ruta = self._ruta(ticker, "json")
+        if not os.path.exists(ruta):
+            return []
+        with open(ruta, encoding="utf-8") as f:
+            return [(pd.Timestamp(a), pd.Timestamp(b)) for a, b in json.load(f)]
+
+    def _leer(self, ticker: str) -> pd.DataFrame:
+        ruta = self._ruta(ticker, "parquet")
+        if not os.path.exists(ruta):
+            return pd.DataFrame()
+        return pd.read_parquet(ruta)
+
+    def _escribir(self, ticker: str, datos: pd.DataFrame, rangos):
+        _reemplazar(self._ruta(ticker, "parquet"), datos.to_parquet)
+
+        def escribir_rangos(ruta):
+            with open(ruta, "w", encoding="utf-8") as f:
+                json.dump([[a.isoformat(), b.isoformat()] for a, b in rangos], f)
+
+        _reemplazar(self._ruta(ticker, "json"), escribir_rangos)
+
+    def huecos(self, ticker: str, fecha_inicio, fecha_fin):
+        """Subrangos de ``[fecha_inicio, fecha_fin)`` que aún no están en el almacén."""
+        inicio, fin = pd.Timestamp(fecha_inicio).normalize(), pd.Timestamp(fecha_fin).normalize()
+        huecos, cursor = [], inicio
+        for a, b in self.rangos(ticker):
+            if b <= cursor or a >= fin:
+                continue
+            if a > cursor:
+                huecos.append((cursor, a))
+            cursor = max(cursor, b)
+        if cursor < fin:
+            huecos.append((cursor, fin))
+        return huecos
+
+    def obtener(self, ticker: str, fecha_inicio, fecha_fin) -> pd.DataFrame:
+        """Devolver los precios de ``[fecha_inicio, fecha_fin)``, descargando solo los huecos."""
+        inicio, fin = pd.Timestamp(fecha_inicio).normalize(), pd.Timestamp(fecha_fin).normalize()
+        with self._lock:
+            faltantes = self.huecos(ticker, inicio, fin)
+            if faltantes:
+                datos = self._incorporar(ticker, [
+                    (a, b, self.descargador(ticker, a.date(), b.date())) for a, b in faltantes
+                ])
+            else:
+                datos = self._leer(ticker)
+        return _recortar(datos, inicio, fin)
+
+    def obtener_varios(self, tickers, fecha_inicio, fecha_fin) -> dict:
+        """Precios de ``[fecha_inicio, fecha_fin)`` de varios tickers, con descargas conjuntas.
+
+        Los tickers se agrupan por hueco: cada rango que falta se pide una
+        sola vez para todos los tickers a los que les falta exactamente ese
+        rango (lo habitual, la última sesión de todos, es una sola petición),
+        y a ningún ticker se le vuelve a bajar lo que ya tenía. Un ticker que
+        no llega en la descarga conjunta se vuelve a pedir solo.
+        """
+        inicio, fin = pd.Timestamp(fecha_inicio).normalize(), pd.Timestamp(fecha_fin).normalize()
+        tickers = list(dict.fromkeys(tickers))
+        datos = {}
+        with self._lock:
+            faltantes = {ticker: self.huecos(ticker, inicio, fin) for ticker in tickers}
+            por_hueco = {}
+            for ticker in tickers:
+                for hueco in faltantes[ticker]:
+                    por_hueco.setdefault(hueco, []).append(ticker)
+            piezas = {ticker: [] for ticker in tickers if faltantes[ticker]}
+            for (a, b), grupo in por_hueco.items():
+                if self.descargador_varios is None:
+                    partes = {ticker: self.descargador(ticker, a.date(), b.date()) for ticker in grupo}
+                else:
+                    partes = self.descargador_varios(grupo, a.date(), b.date())
+                    for ticker in grupo:
+                        parte = partes.get(ticker)
+                        if parte is None or parte.empty:
+                            # Falta en la descarga conjunta (fallo parcial, ticker retirado...):
+                            # se pide por separado en lugar de darlo por cubierto
+                            partes[ticker] = self.descargador(ticker, a.date(), b.date())
+                for ticker in grupo:
+                    piezas[ticker].append((a, b, partes[ticker]))
+            for ticker, partes_ticker in piezas.items():
+                datos[ticker] = self._incorporar(ticker, partes_ticker)
+            for ticker in tickers:
+                if ticker not in datos:
+                    datos[ticker] = self._leer(ticker)
+        return {ticker: _recortar(datos[ticker], inicio, fin) for ticker in tickers}
+
+    def _incorporar(self, ticker: str, partes) -> pd.DataFrame:
+        """Guardar las partes descargadas ``(inicio, fin, datos)`` y marcar sus rangos como cubiertos."""
+        datos = self._leer(ticker)
+        rangos = self.rangos(ticker)
+        hoy = pd.Timestamp.today().normalize()
+        nuevos = [_normalizar_columnas(parte) for _, _, parte in partes
+                  if parte is not None and not parte.empty]
+        if nuevos:
+            datos = pd.concat([datos] + nuevos) if not datos.empty else pd.concat(nuevos)
+            datos = datos[~datos.index.duplicated(keep="last")].sort_index()
+        for a, b, parte in partes:
+            if (parte is None or parte.empty) and not _sin_sesiones(datos, a, min(b, hoy)):
+                continue
+            # El día en curso aún no ha cerrado: nunca se marca como cubierto
+            if a < hoy:
+                rangos.append((a, min(b, hoy)))
+        self._escribir(ticker, datos, _unir_rangos(rangos))
+        return datos
+
+
+def _sin_sesiones(datos: pd.DataFrame, inicio, fin) -> bool:
+    """Si ``[inicio, fin)`` no pudo tener sesiones: solo fin de semana, o festivos entre datos."""
+    habiles = len(pd.bdate_range(inicio, fin - pd.Timedelta(days=1))) if fin > inicio else 0
+    if habiles == 0:
+        return True
+    if habiles > MAX_FESTIVOS_SEGUIDOS or datos.empty:
+        return False
+    return bool((datos.index < inicio).any() and (datos.index >= fin).any())
+
+
+def _recortar(datos: pd.DataFrame, inicio, fin) -> pd.DataFrame:
+    if datos.empty:
+        return datos
+    return datos.loc[(datos.index >= inicio) & (datos.index < fin)]
@@ -0,0 +1,267 @@
+# analisis_sentimiento.py
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from importlib.metadata import version
+
+import numpy as np
+
+from cache_sentimiento import content_key
+
+# Umbral por defecto para clasificar la polaridad como positiva/negativa
+UMBRAL_SENTIMIENTO = 0.1
+
+# Versión del puntuador; forma parte de la clave del almacén persistente
+SCORER_VERSION = f"textblob-{version('textblob')}-pattern"
+
+# Modos de puntuación por lote
+MODOS = ("auto", "lexicon", "process", "serial")
+
+# A partir de cuántos textos únicos compensa arrancar un pool de procesos
+UMBRAL_PROCESOS = 2000
+
+
+def classify_polarity(polarity, threshold=UMBRAL_SENTIMIENTO):
+    """Clasificar un arreglo de polaridades en etiquetas de sentimiento."""
+    polarity = np.asarray(polarity, dtype=np.float64)
+    return np.select(
+        [polarity > threshold, polarity < -threshold],
+        ['Positivo', 'Negativo'],
+        default='Neutro'
+    ).astype(object)
+
+
+def analyze_sentiment(text, threshold=UMBRAL_SENTIMIENTO):
+    """Analizar el sentimiento del texto proporcionado."""
+    from textblob import TextBlob
+
+    analysis = TextBlob(text)
+    polarity = analysis.sentiment.polarity
+    subjectivity = analysis.sentiment.subjectivity
+
+    if polarity > threshold:
+        sentiment = 'Positivo'
+    elif polarity < -threshold:
+        sentiment = 'Negativo'
+    else:
+        sentiment = 'Neutro'
+
+    return {
+        'sentiment': sentiment,
+        'polarity': polarity,
+        'subjectivity': subjectivity
+    }
+
+
+# ------------------------ PREFILTRO DEL LÉXICO ------------------------
+# TextBlob solo genera valoraciones para palabras del léxico, emoticones y la
+# marca de sarcasmo "(!)". Si un texto no contiene ninguno de esos tokens su
+# resultado es (0.0, 0.0) y se puede omitir el tokenizador de TextBlob.
+# El prefiltro es conservador: puede marcar textos de más, nunca de menos.
+_RE_PALABRA = re.compile(r"[^\W_]+")
+_prefiltro = None
+
+
+def _lexico():
+    """Léxico de TextBlob (pattern) ya cargado.
+
+    Importar TextBlob arrastra NLTK y SciPy (más de un segundo), así que se
+    importa la primera vez que hay que puntuar, no al cargar el módulo.
+    """
+    from textblob.en import sentiment
+
+    if dict.__len__(sentiment) == 0:
+        sentiment.load()
+    return sentiment
+
+
+def _compilar_prefiltro():
+    """Construir (una sola vez) el conjunto de palabras y el patrón de emoticones."""
+    global _prefiltro
+    if _prefiltro is None:
+        from textblob._text import EMOTICONS
+
+        lexico = _lexico()
+        # Primer tramo alfanumérico de cada entrada del léxico ("well-off" -> "well")
+        primeros = set()
+        for palabra in dict.keys(lexico):
+            tramo = _RE_PALABRA.search(palabra.lower())
+            if tramo:
+                primeros.add(tramo.group())
+        emoticones = sorted(
+            {e.lower() for grupo in EMOTICONS.values() for e in grupo},
+            key=len, reverse=True
+        )
+        # El tokenizador de TextBlob vuelve a unir un emoticón escrito con
+        # espacios o tabuladores entre sus signos (": P", "* )"), así que se
+        # admiten espacios entre cada carácter
+        especiales = re.compile(r"%s|\(\s*!\s*\)" % "|".join(
+            r"\s*".join(map(re.escape, e)) for e in emoticones
+        ))
+        _prefiltro = (primeros, especiales)
+    return _prefiltro
+
+
+def _candidatos(texts):
+    """Índices de los textos que pueden tener una valoración distinta de cero."""
+    primeros, especiales = _compilar_prefiltro()
+    # Una sola pasada sobre todos los textos unidos; "n't" se separa igual que
+    # en el tokenizador de TextBlob ("isn't" -> "is n't"). El separador "\0"
+    # no es espacio, así que ningún emoticón se extiende de un texto al siguiente.
+    unido = "\0".join(texts).lower().replace("n't", " n't")
+    limites = np.cumsum([len(t.lower().replace("n't", " n't")) + 1 for t in texts])
+    posiciones = [m.start() for m in _RE_PALABRA.finditer(unido) if m.group() in primeros]
+    posiciones.extend(m.start() for m in especiales.finditer(unido))
+    return np.unique(np.searchsorted(limites, posiciones, side='right'))
+
+
+def _score_texts(texts):
+    """Puntuar una lista de textos; devuelve (polaridad, subjetividad) como arreglos."""
+    n = len(texts)
+    polarity = np.zeros(n, dtype=np.float64)
+    subjectivity = np.zeros(n, dtype=np.float64)
+    if n == 0:
+        return polarity, subjectivity
+
+    candidatos = _candidatos(texts)
+    lexico = _lexico()
+    for i in candidatos:
+        polarity[i], subjectivity[i] = lexico(texts[i])
+    return polarity, subjectivity
+
+
+def preload_lexicon():
+    """Importar TextBlob y preparar el léxico y el prefiltro antes del primer análisis."""
+    _compilar_prefiltro()
+
+
+def _score_chunk(texts):
+    """Punto de entrada de los procesos trabajadores."""
+    return _score_texts(texts)
+
+
+# ------------------------ PUNTUADORES ------------------------
+# Un puntuador es cualquier objeto con ``name``, ``version`` (parte de la
+# clave del almacén persistente) y ``score(texts) -> (polaridad, subjetividad)``.
+class TextBlobScorer:
+    """Puntuador por defecto: léxico de TextBlob (pattern), solo en inglés."""
+
+    name = "textblob"
+    version = SCORER_VERSION
+
+    def score(self, texts):
+        return _score_texts(texts)
+
+
+TEXTBLOB = TextBlobScorer()
+
+
+def analyze_batch(texts, mode="auto", threshold=UMBRAL_SENTIMIENTO,
+                  workers=None, chunk_size=500, progress=None, cache=None, scorer=None):
+    """Analizar el sentimiento de una lista de textos en un solo lote.
+
+    Devuelve un diccionario con los arreglos ``polarity``, ``subjectivity`` y
+    ``sentiment``, con los mismos valores que ``analyze_sentiment`` texto a texto.
+
+    Modos:
+    - ``lexicon``: deduplica los textos, descarta con un prefiltro del léxico los
+      que no pueden puntuar y evalúa el resto sin construir objetos ``TextBlob``.
+    - ``process``: igual que ``lexicon`` pero repartiendo bloques en un pool de procesos.
+    - ``serial``: llama a ``analyze_sentiment`` texto a texto (referencia).
+    - ``auto``: ``process`` para lotes grandes con varios núcleos, si no ``lexicon``.
+
+    ``progress`` es un callable opcional ``progress(hechos, total)``. Con
+    ``cache`` (un ``SentimentCache``) solo se puntúan los textos que no estén
+    ya guardados, y los nuevos resultados se guardan al terminar. El modo
+    ``serial`` no usa ``cache``: es la referencia con la que se comparan los
+    demás modos, así que siempre recalcula cada texto con ``analyze_sentiment``.
+
+    ``scorer`` sustituye al léxico de TextBlob por otro puntuador (por
+    ejemplo ``modelo_sentimiento.ModeloSentimiento``); cada bloque se le pasa
+    entero a su ``score`` en el proceso actual, sin pool de procesos (los
+    modos ``process`` y ``serial`` no lo admiten).
+    """
+    if mode not in MODOS:
+        raise ValueError(f"Modo de análisis desconocido: {mode!r}")
+    scorer = TEXTBLOB if scorer is None else scorer
+    textblob = isinstance(scorer, TextBlobScorer)
+    if mode == "serial" and not textblob:
+        raise ValueError("El modo serial es la referencia de TextBlob; no admite otros puntuadores")
+    if mode == "process" and not textblob:
+        # Los trabajadores solo saben puntuar con el léxico; mejor fallar que ignorar el modo
+        raise ValueError("El modo process solo admite el léxico de TextBlob; usa 'auto' o 'lexicon'")
+
+    texts = ["" if t is None else str(t) for t in texts]
+    total = len(texts)
+
+    if mode == "serial":
+        polarity = np.zeros(total, dtype=np.float64)
+        subjectivity = np.zeros(total, dtype=np.float64)
+        for i, text in enumerate(texts):
+            resultado = analyze_sentiment(text, threshold)
+            polarity[i] = resultado['polarity']
+            subjectivity[i] = resultado['subjectivity']
+            if progress is not None:
+                progress(i + 1, total)
+        return {
+            'sentiment': classify_polarity(polarity, threshold),
+            'polarity': polarity,
+            'subjectivity': subjectivity
+        }
+
+    # Los titulares repetidos se puntúan una sola vez
+    unicos, inverso = np.unique(np.array(texts, dtype=object), return_inverse=True)
+    unicos = unicos.tolist()
+    n_unicos = len(unicos)
+    polarity_u = np.zeros(n_unicos, dtype=np.float64)
+    subjectivity_u = np.zeros(n_unicos, dtype=np.float64)
+
+    # Los resultados ya guardados en el almacén persistente no se recalculan
+    pendientes = np.arange(n_unicos)
+    if cache is not None and n_unicos:
+        claves = [content_key(t, scorer.version) for t in unicos]
+        guardados = cache.get_many(claves)
+        acierto = np.array([c in guardados for c in claves])
+        for i in np.flatnonzero(acierto):
+            polarity_u[i], subjectivity_u[i] = guardados[claves[i]]
+        pendientes = np.flatnonzero(~acierto)
+    textos_pendientes = [unicos[i] for i in pendientes]
+    n_pendientes = len(textos_pendientes)
+
+    if mode == "auto" or not textblob:
+        cpus = os.cpu_count() or 1
+        grande = textblob and cpus > 1 and n_pendientes >= UMBRAL_PROCESOS
+        mode = "process" if grande else "lexicon"
+
+    inicios = range(0, n_pendientes, chunk_size)
+    bloques = [textos_pendientes[i:i + chunk_size] for i in inicios]
+
+    def guardar(inicio, resultado):
+        pol, subj = resultado
+        destino = pendientes[inicio:inicio + len(pol)]
+        polarity_u[destino] = pol
+        subjectivity_u[destino] = subj
+        if progress is not None:
+            progress(inicio + len(pol), n_pendientes)
+
+    if mode == "process" and len(bloques) > 1:
+        max_workers = min(workers or os.cpu_count() or 1, len(bloques))
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            for inicio, resultado in zip(inicios, executor.map(_score_chunk, bloques)):
+                guardar(inicio, resultado)
+    else:
+        for inicio, bloque in zip(inicios, bloques):
+            guardar(inicio, scorer.score(bloque))
+
+    if cache is not None and n_pendientes:
+        cache.put_many(
+            (claves[i], (polarity_u[i], subjectivity_u[i])) for i in pendientes
+        )
+
+    polarity = polarity_u[inverso]
+    subjectivity = subjectivity_u[inverso]
+    return {
+        'sentiment': classify_polarity(polarity, threshold),
+        'polarity': polarity,
+        'subjectivity': subjectivity
+    }
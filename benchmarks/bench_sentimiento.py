@@ -0,0 +1,99 @@
+# benchmarks/bench_sentimiento.py
+"""Comparar el rendimiento del análisis de sentimiento por artículo frente al análisis por lote.
+
+Uso:
+    python benchmarks/bench_sentimiento.py --articulos 1000 --repeticiones 3
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from analisis_sentimiento import analyze_batch, analyze_sentiment  # noqa: E402
+
+PALABRAS_ES = [
+    "mercado", "acciones", "empresa", "gobierno", "economía", "inflación", "dólar",
+    "bolsa", "crecimiento", "caída", "inversión", "tecnología", "banco", "crisis",
+    "récord", "anuncia", "sube", "baja", "nuevo", "informe", "trimestre", "ventas",
+]
+PALABRAS_EN = [
+    "market", "shares", "strong", "weak", "good", "bad", "record", "growth", "great",
+    "terrible", "not", "very", "really", "new", "best", "worst", "surprising", "!",
+]
+
+
+def generar_textos(n, proporcion_en=0.4, proporcion_repetidos=0.2, semilla=42):
+    """Generar titulares sintéticos en español/inglés con una fracción de repetidos."""
+    rng = random.Random(semilla)
+    textos = []
+    for _ in range(n):
+        if textos and rng.random() < proporcion_repetidos:
+            textos.append(rng.choice(textos))
+            continue
+        vocabulario = PALABRAS_EN if rng.random() < proporcion_en else PALABRAS_ES
+        titulo = " ".join(rng.choice(vocabulario) for _ in range(rng.randint(6, 12)))
+        resumen = " ".join(rng.choice(vocabulario) for _ in range(rng.randint(10, 25)))
+        textos.append(titulo + " " + resumen)
+    return textos
+
+
+def ruta_serial(textos):
+    """Referencia exacta: ``analyze_sentiment`` texto a texto en un solo hilo."""
+    return np.array([analyze_sentiment(t)['polarity'] for t in textos])
+
+
+def ruta_actual(textos):
+    """Ruta original de la página: un ThreadPoolExecutor con TextBlob por artículo."""
+    with ThreadPoolExecutor(max_workers=min(8, len(textos))) as executor:
+        resultados = list(executor.map(analyze_sentiment, textos))
+    return np.array([r['polarity'] for r in resultados])
+
+
+def medir(funcion, textos, repeticiones):
+    """Devolver el mejor tiempo de ``repeticiones`` ejecuciones y el último resultado."""
+    mejor, resultado = float("inf"), None
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        resultado = funcion(textos)
+        mejor = min(mejor, time.perf_counter() - inicio)
+    return mejor, resultado
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--articulos", type=int, default=1000)
+    parser.add_argument("--repeticiones", type=int, default=3)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    textos = generar_textos(args.articulos)
+    casos = {
+        "threads (actual)": ruta_actual,
+        "lexicon": lambda t: analyze_batch(t, mode="lexicon")['polarity'],
+        "process": lambda t: analyze_batch(t, mode="process", workers=args.workers,
+                                           chunk_size=max(1, len(t) // (os.cpu_count() or 1)))['polarity'],
+    }
+
+    # La ruta con hilos no es determinista (el analizador de TextBlob no es
+    # seguro entre hilos), así que la exactitud se comprueba contra la serial.
+    esperado = ruta_serial(textos)
+    referencia = None
+    print(f"{'modo':<18}{'segundos':>10}{'artículos/s':>14}{'aceleración':>14}")
+    for nombre, funcion in casos.items():
+        segundos, polaridad = medir(funcion, textos, args.repeticiones)
+        if referencia is None:
+            referencia = segundos
+        elif not np.array_equal(polaridad, esperado):
+            raise SystemExit(f"El modo {nombre} no coincide con analyze_sentiment")
+        print(f"{nombre:<18}{segundos:>10.3f}{len(textos) / segundos:>14.0f}"
+              f"{referencia / segundos:>13.1f}x")
+
+
+if __name__ == "__main__":
+    main()
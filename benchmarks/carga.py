@@ -0,0 +1,328 @@
+# benchmarks/carga.py
+"""Prueba de carga sin red: N sesiones simultáneas recorriendo la aplicación con ``AppTest``.
+
+Cada sesión simulada abre ``Aplicacion.py`` y las páginas, ejecuta cada
+script, busca su propio tema en el analizador de noticias, lleva cada slider
+a su mínimo y vuelve a ejecutar cada página como al interactuar con ella. Los feeds, ``yf.download``
+y las peticiones HTTP se sustituyen por los datos sintéticos de
+``fixtures``. Cada nivel de concurrencia corre en un proceso nuevo (como un
+servidor recién arrancado) e informa del rendimiento, los percentiles
+p50/p95/p99 de la duración de cada ejecución y la memoria por sesión.
+
+Uso:
+    python benchmarks/carga.py --sesiones 1 2 4 8 --salida carga.json
+    python benchmarks/carga.py --sesiones 4 --paginas 02 --latencia-red 0.2
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import types
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from urllib.parse import parse_qs, urlsplit
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+
+import fixtures  # noqa: E402
+
+# Los módulos de la aplicación se importan después de preparar el entorno:
+# las rutas de sus almacenes se leen de variables de entorno al importarlos
+PAGINAS = [
+    "Aplicacion.py",
+    "pages/01Visualizacion de Datos.py",
+    "pages/02Analisis de Sentimientos.py",
+    "pages/03Sentimiento vs Precios.py",
+    "pages/04Vigilancia de Noticias.py",
+]
+SESIONES = (1, 2, 4, 8)
+PERCENTILES = (50, 95, 99)
+
+
+# ------------------------ SUSTITUTOS DE LA RED ------------------------
+@lru_cache(maxsize=None)
+def feed_tema(tema, articulos):
+    """Feed sintético propio de cada tema: temas distintos no comparten artículos."""
+    return fixtures.generar_feed(articulos, semilla=zlib.crc32(tema.encode("utf-8")))
+
+
+def _tema_url(url):
+    return parse_qs(urlsplit(url).query).get("q", [""])[0]
+
+
+def instalar_sustitutos(articulos, latencia):
+    """Sustituir feedparser, urllib3 y yfinance por datos sintéticos con ``latencia`` segundos de red."""
+    import feedparser
+    import urllib3
+    import yfinance as yf
+
+    from almacen_precios import DescargadorFalso
+
+    parse_original = feedparser.parse
+    descargador = DescargadorFalso()
+
+    def parse(origen, *args, **kwargs):
+        if isinstance(origen, str) and origen.startswith("http"):
+            time.sleep(latencia)
+            origen = feed_tema(_tema_url(origen), articulos)
+        return parse_original(origen, *args, **kwargs)
+
+    def request(self, metodo, url, *args, **kwargs):
+        time.sleep(latencia)
+        return types.SimpleNamespace(status=200, data=feed_tema(_tema_url(url), articulos), headers={})
+
+    def download(tickers, start=None, end=None, period=None, **kwargs):
+        time.sleep(latencia)
+        tickers = [tickers] if isinstance(tickers, str) else list(tickers)
+        if period is not None:
+            end = pd.Timestamp.today().normalize() + pd.Timedelta(days=1)
+            start = end - pd.Timedelta(days=7)
+        precios = {ticker: descargador(ticker, start, end) for ticker in tickers}
+        return pd.concat(precios, axis=1).swaplevel(0, 1, axis=1).sort_index(axis=1)
+
+    feedparser.parse = parse
+    urllib3.PoolManager.request = request
+    yf.download = download
+
+
+# ------------------------ SESIONES ------------------------
+def compartir_runtime():
+    """Permitir varias ``AppTest`` ejecutándose a la vez en el mismo proceso.
+
+    Cada ``AppTest.run`` instala un ``Runtime`` simulado global y lo borra al
+    terminar, así que con sesiones en varios hilos una lo borraría mientras
+    otra sigue ejecutándose. Se conserva el último instalado, como el único
+    ``Runtime`` que comparten las sesiones de un servidor real.
+    """
+    from streamlit import config
+    from streamlit.runtime import Runtime
+
+    config.set_option("global.appTest", True)
+    ultimo = [None]
+
+    def actual(cls):
+        if cls._instance is not None:
+            ultimo[0] = cls._instance
+        return ultimo[0]
+
+    def instance(cls):
+        runtime = actual(cls)
+        if runtime is None:
+            raise RuntimeError("Runtime hasn't been created!")
+        return runtime
+
+    Runtime.instance = classmethod(instance)
+    Runtime.exists = classmethod(lambda cls: actual(cls) is not None)
+
+
+def memoria_residente():
+    """Memoria residente actual del proceso en bytes (pico si no hay /proc)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def sesion(indice, paginas, reejecuciones, timeout):
+    """Recorrer las páginas como un analista; devuelve las apps y las ejecuciones medidas."""
+    from streamlit.testing.v1 import AppTest
+
+    apps, ejecuciones = [], []
+    # Cada AppTest tiene su propio estado; los resultados del analizador se
+    # pasan a las páginas siguientes como si fueran la misma sesión del navegador
+    compartido = {}
+
+    def ejecutar(pagina, tipo, app):
+        inicio = time.perf_counter()
+        try:
+            app.run()
+            error = str(app.exception[0].value) if app.exception else None
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+        ejecuciones.append({"pagina": pagina, "tipo": tipo,
+                            "segundos": time.perf_counter() - inicio, "error": error})
+
+    for pagina in paginas:
+        app = AppTest.from_file(os.path.join(RAIZ, pagina), default_timeout=timeout)
+        apps.append(app)
+        for clave, valor in compartido.items():
+            app.session_state[clave] = valor
+        ejecutar(pagina, "primera", app)
+        if pagina.startswith("pages/02") and app.sidebar.text_input:
+            # Cada analista busca su propio tema: descarga y análisis sin caché
+            app.sidebar.text_input[0].set_value(f"empresa {indice}")
+            ejecutar(pagina, "busqueda", app)
+        # Cada slider a su mínimo, uno tras otro: los extremos son donde fallan los rangos
+        for i in range(len(app.slider)):
+            if i < len(app.slider) and not isinstance(app.slider[i].value, (tuple, list)):
+                app.slider[i].set_value(app.slider[i].min)
+                ejecutar(pagina, "controles", app)
+        for _ in range(reejecuciones):
+            ejecutar(pagina, "reejecucion", app)
+        if "results" in app.session_state:
+            compartido["results"] = app.session_state["results"]
+    return apps, ejecuciones
+
+
+def nivel(sesiones, paginas, reejecuciones, articulos, latencia, timeout):
+    """Ejecutar ``sesiones`` sesiones simultáneas en este proceso (ver ``main``)."""
+    # Los almacenes de precios y de sentimiento de la prueba se borran al terminar
+    with tempfile.TemporaryDirectory(prefix="carga_", ignore_cleanup_errors=True) as directorio:
+        return _nivel(directorio, sesiones, paginas, reejecuciones, articulos, latencia, timeout)
+
+
+def _nivel(directorio, sesiones, paginas, reejecuciones, articulos, latencia, timeout):
+    os.environ["PRECIOS_CACHE"] = os.path.join(directorio, "precios")
+    os.environ["SENTIMIENTO_CACHE"] = os.path.join(directorio, "sentimiento.sqlite3")
+    instalar_sustitutos(articulos, latencia)
+    compartir_runtime()
+
+    # Una sesión previa importa los módulos y llena los recursos compartidos,
+    # así la memoria medida es la que añade cada sesión a un servidor en marcha
+    calentamiento = time.perf_counter()
+    sesion(-1, paginas, 0, timeout)
+    calentamiento = time.perf_counter() - calentamiento
+    gc.collect()
+    base = memoria_residente()
+
+    inicio = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=sesiones) as executor:
+        resultados = list(executor.map(lambda i: sesion(i, paginas, reejecuciones, timeout), range(sesiones)))
+    total = time.perf_counter() - inicio
+    gc.collect()
+    # Las apps siguen vivas: su estado de sesión cuenta en la memoria
+    final = memoria_residente()
+    return {
+        "sesiones": sesiones,
+        "segundos": total,
+        "calentamiento_s": calentamiento,
+        "memoria_base_bytes": base,
+        "memoria_final_bytes": final,
+        "ejecuciones": [e for _, ejecuciones in resultados for e in ejecuciones],
+        "hilos": threading.active_count(),
+    }
+
+
+# ------------------------ INFORME ------------------------
+def resumir(medida):
+    """Rendimiento, percentiles y memoria por sesión de un nivel de concurrencia."""
+    tabla = pd.DataFrame(medida["ejecuciones"])
+    segundos = tabla["segundos"].to_numpy()
+    sesiones = medida["sesiones"]
+    resumen = {
+        "sesiones": sesiones,
+        "ejecuciones": len(tabla),
+        "errores": int(tabla["error"].notna().sum()),
+        "segundos": medida["segundos"],
+        "ejecuciones_por_s": len(tabla) / medida["segundos"],
+        "sesiones_por_min": sesiones / medida["segundos"] * 60,
+        **{f"p{p}_ms": float(np.percentile(segundos, p)) * 1e3 for p in PERCENTILES},
+        "memoria_por_sesion_mb": max(medida["memoria_final_bytes"] - medida["memoria_base_bytes"], 0)
+                                 / sesiones / 2**20,
+        "memoria_total_mb": medida["memoria_final_bytes"] / 2**20,
+        "calentamiento_s": medida["calentamiento_s"],
+    }
+    por_pagina = tabla.groupby(["pagina", "tipo"])["segundos"]
+    resumen["por_pagina"] = [
+        {"pagina": pagina, "tipo": tipo, "ejecuciones": len(valores),
+         **{f"p{p}_ms": float(np.percentile(valores, p)) * 1e3 for p in PERCENTILES}}
+        for (pagina, tipo), valores in por_pagina
+    ]
+    resumen["primeros_errores"] = tabla["error"].dropna().unique()[:3].tolist()
+    return resumen
+
+
+def imprimir(resumenes, detalle):
+    print(f"\n{'sesiones':>8}{'ejec':>7}{'err':>5}{'ejec/s':>9}{'p50 ms':>10}{'p95 ms':>10}"
+          f"{'p99 ms':>10}{'MB/sesión':>11}{'MB total':>10}", file=sys.stderr)
+    for r in resumenes:
+        print(f"{r['sesiones']:>8}{r['ejecuciones']:>7}{r['errores']:>5}{r['ejecuciones_por_s']:>9.2f}"
+              f"{r['p50_ms']:>10.0f}{r['p95_ms']:>10.0f}{r['p99_ms']:>10.0f}"
+              f"{r['memoria_por_sesion_mb']:>11.1f}{r['memoria_total_mb']:>10.0f}", file=sys.stderr)
+        for error in r["primeros_errores"]:
+            print(f"{'':>8}error: {error[:100]}", file=sys.stderr)
+    if detalle:
+        for r in resumenes:
+            print(f"\n{r['sesiones']} sesiones", file=sys.stderr)
+            for p in r["por_pagina"]:
+                print(f"  {os.path.basename(p['pagina']):<36}{p['tipo']:<12}{p['ejecuciones']:>5}"
+                      f"{p['p50_ms']:>10.0f}{p['p95_ms']:>10.0f}{p['p99_ms']:>10.0f}", file=sys.stderr)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sesiones", nargs="*", type=int, default=list(SESIONES),
+                        help="Niveles de concurrencia (sesiones simultáneas)")
+    parser.add_argument("--paginas", nargs="*", default=None,
+                        help="Páginas a recorrer, por prefijo (Aplicacion, 01, 02...); por defecto todas")
+    parser.add_argument("--reejecuciones", type=int, default=2,
+                        help="Ejecuciones extra de cada página por sesión, tras la primera")
+    parser.add_argument("--articulos", type=int, default=100, help="Entradas de cada feed sintético")
+    parser.add_argument("--latencia-red", type=float, default=0.0,
+                        help="Segundos de espera simulada en cada petición de red")
+    parser.add_argument("--timeout", type=float, default=300, help="Segundos máximos por ejecución")
+    parser.add_argument("--detalle", action="store_true", help="Percentiles por página y tipo de ejecución")
+    parser.add_argument("--salida", default=None, help="Archivo JSON de resultados (por defecto stdout)")
+    parser.add_argument("--nivel", type=int, default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    paginas = [p for p in PAGINAS if not args.paginas
+               or any(p.startswith(prefijo) or os.path.basename(p).startswith(prefijo) for prefijo in args.paginas)]
+    if not paginas:
+        parser.error(f"Ninguna página coincide con {args.paginas}")
+
+    if args.nivel is not None:
+        medida = nivel(args.nivel, paginas, args.reejecuciones, args.articulos,
+                       args.latencia_red, args.timeout)
+        json.dump(medida, sys.stdout)
+        return
+
+    resumenes = []
+    for sesiones in args.sesiones:
+        print(f"{sesiones} sesiones...", file=sys.stderr)
+        comando = [sys.executable, os.path.abspath(__file__), "--nivel", str(sesiones),
+                   "--paginas", *paginas, "--reejecuciones", str(args.reejecuciones),
+                   "--articulos", str(args.articulos), "--latencia-red", str(args.latencia_red),
+                   "--timeout", str(args.timeout)]
+        salida = subprocess.run(comando, cwd=RAIZ, capture_output=True, text=True)
+        if salida.returncode != 0:
+            sys.exit(f"Falló el nivel de {sesiones} sesiones:\n{salida.stderr[-2000:]}")
+        resumenes.append(resumir(json.loads(salida.stdout)))
+    imprimir(resumenes, args.detalle)
+
+    informe = {
+        "metadatos": {
+            "fecha": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "plataforma": platform.platform(),
+            "cpus": os.cpu_count(),
+            "paginas": paginas,
+            "reejecuciones": args.reejecuciones,
+            "articulos": args.articulos,
+            "latencia_red_s": args.latencia_red,
+        },
+        "resultados": resumenes,
+    }
+    if args.salida:
+        with open(args.salida, "w", encoding="utf-8") as f:
+            json.dump(informe, f, indent=2, ensure_ascii=False)
+    else:
+        json.dump(informe, sys.stdout, indent=2, ensure_ascii=False)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+# benchmarks/fixtures.py
+"""Datos de prueba sin red para los benchmarks: feeds RSS y precios con forma de yfinance."""
+import html
+import os
+import random
+
+import numpy as np
+import pandas as pd
+
+DIRECTORIO = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+# Muestra con la estructura de una respuesta de Google News RSS
+FEED_GRABADO = os.path.join(DIRECTORIO, "google_news_tecnologia.xml")
+
+_PALABRAS = [
+    "mercado", "acciones", "empresa", "gobierno", "economía", "inflación", "dólar",
+    "bolsa", "crecimiento", "caída", "inversión", "tecnología", "banco", "crisis",
+    "récord", "anuncia", "sube", "baja", "nuevo", "informe", "trimestre", "ventas",
+    "market", "shares", "strong", "weak", "good", "bad", "great", "terrible", "not", "very",
+]
+_FUENTES = ["El Tiempo", "Portafolio", "La República", "Semana", "Reuters", "Bloomberg Línea"]
+_DIAS = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]
+
+
+def cargar_feed_grabado() -> bytes:
+    """Contenido del feed RSS grabado."""
+    with open(FEED_GRABADO, "rb") as f:
+        return f.read()
+
+
+def generar_feed(n: int, semilla: int = 0, proporcion_repetidos: float = 0.1) -> bytes:
+    """Feed RSS sintético de ``n`` entradas con el mismo marcado que Google News."""
+    rng = random.Random(semilla)
+    inicio = pd.Timestamp("2026-10-17 23:59:00")
+    items, titulos = [], []
+    for i in range(n):
+        if titulos and rng.random() < proporcion_repetidos:
+            titulo = rng.choice(titulos)
+        else:
+            titulo = " ".join(rng.choice(_PALABRAS) for _ in range(rng.randint(6, 12))).capitalize()
+            titulos.append(titulo)
+        fuente = rng.choice(_FUENTES)
+        enlace = f"https://news.google.com/rss/articles/CBMi{i:08x}?oc=5"
+        fecha = inicio - pd.Timedelta(minutes=17 * i)
+        descripcion = (
+            f'<a href="{enlace}" target="_blank">{html.escape(titulo)}</a>'
+            f'&nbsp;&nbsp;<font color="#6f6f6f">{html.escape(fuente)}</font>'
+        )
+        items.append(
+            f"<item><title>{html.escape(titulo + ' - ' + fuente)}</title>"
+            f"<link>{enlace}</link><guid isPermaLink=\"false\">CBMi{i:08x}</guid>"
+            f"<pubDate>{_DIAS[fecha.dayofweek]}, {fecha:%d %b %Y %H:%M:%S} GMT</pubDate>"
+            f"<description>{html.escape(descripcion)}</description>"
+            f"<source url=\"https://www.example.com\">{html.escape(fuente)}</source></item>"
+        )
+    return (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<rss version="2.0"><channel><title>Google News</title>'
+        '<link>https://news.google.com</link>'
+        + "\n".join(items) + "</channel></rss>"
+    ).encode("utf-8")
+
+
+def generar_precios(tickers, dias: int, semilla: int = 0) -> pd.DataFrame:
+    """Precios diarios sintéticos con las columnas MultiIndex (Price, Ticker) de ``yf.download``."""
+    rng = np.random.default_rng(semilla)
+    fechas = pd.bdate_range(end="2026-10-16", periods=dias, name="Date")
+    tickers = list(tickers)
+    rendimientos = rng.normal(0.0005, 0.02, size=(dias, len(tickers)))
+    cierre = 100 * np.exp(np.cumsum(rendimientos, axis=0))
+    campos = {
+        "Close": cierre,
+        "High": cierre * (1 + rng.uniform(0, 0.02, cierre.shape)),
+        "Low": cierre * (1 - rng.uniform(0, 0.02, cierre.shape)),
+        "Open": cierre * (1 + rng.normal(0, 0.005, cierre.shape)),
+        "Volume": rng.integers(1_000_000, 50_000_000, cierre.shape),
+    }
+    columnas = pd.MultiIndex.from_product([list(campos), tickers], names=["Price", "Ticker"])
+    return pd.DataFrame(np.hstack(list(campos.values())), index=fechas, columns=columnas)
@@ -0,0 +1,468 @@
+# benchmarks/run_benchmarks.py
+"""Suite de benchmarks sin red de los flujos de análisis y de precios.
+
+Mide por separado cada etapa con feeds grabados y sintéticos de 10 a 100k
+entradas y precios con la forma de yfinance, y escribe los tiempos en JSON
+para comparar entre commits.
+
+Uso:
+    python benchmarks/run_benchmarks.py --salida resultados.json
+    python benchmarks/run_benchmarks.py --casos sentimiento --tamanos 10 100
+    python benchmarks/run_benchmarks.py --salida nuevo.json --comparar base.json
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import types
+from contextlib import ExitStack
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import feedparser  # noqa: E402
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+
+import fixtures  # noqa: E402
+from almacen_precios import AlmacenPrecios, _normalizar_columnas  # noqa: E402
+from analisis_sentimiento import analyze_batch, analyze_sentiment  # noqa: E402
+from graficos_sentimiento import (  # noqa: E402
+    plot_polarity_subjectivity,
+    plot_sentiment_distribution,
+    plot_sentiment_over_time
+)
+from correlacion import (  # noqa: E402
+    alinear_sentimiento_precios,
+    correlacion_movil,
+    correlaciones_rezagadas,
+    polaridad_diaria,
+    rendimientos_diarios
+)
+from duplicados import collapse_near_duplicates  # noqa: E402
+from exportacion import dataframe_fingerprint, export_dataframe  # noqa: E402
+from indicadores import (  # noqa: E402
+    calcular_rendimiento_diario,
+    matriz_correlacion,
+    metricas_riesgo,
+    rendimientos_cartera,
+    volatilidad_movil
+)
+from modelo_sentimiento import entrenar  # noqa: E402
+from precarga import PAGINAS, importaciones  # noqa: E402
+from resultados_sesion import compact_articles  # noqa: E402
+from submuestreo import submuestrear  # noqa: E402
+from tendencias import SentimentRollups, parse_published  # noqa: E402
+from vigilancia_noticias import VigilanteNoticias  # noqa: E402
+from noticias import (  # noqa: E402
+    create_sentiment_dataframe,
+    entry_to_raw,
+    fetch_news,
+    remove_html_tags,
+    score_articles
+)
+
+TAMANOS = (10, 100, 1000, 10_000, 100_000)
+DIAS_PRECIOS = (250, 1250, 2500, 5000)
+TICKERS = ("TSLA", "AAPL", "MSFT", "GOOGL", "AMZN", "NVDA", "META")
+
+# Registro de casos: nombre -> (grupo, tamaños, máximo por defecto, preparar)
+CASOS = {}
+
+
+def caso(nombre, grupo, tamanos=TAMANOS, maximo=None):
+    """Registrar un caso. ``preparar(n)`` devuelve la función sin argumentos a medir."""
+    def registrar(preparar):
+        CASOS[nombre] = (grupo, tamanos, maximo, preparar)
+        return preparar
+    return registrar
+
+
+# ------------------------ DATOS COMPARTIDOS ------------------------
+_memo = {}
+# Recursos de un caso (directorios temporales...) que se liberan al terminar de medirlo
+_temporales = ExitStack()
+
+
+def _feed(n):
+    if ("feed", n) not in _memo:
+        _memo[("feed", n)] = fixtures.generar_feed(n)
+    return _memo[("feed", n)]
+
+
+def _articulos(n):
+    """Artículos limpios y analizados a partir del feed sintético."""
+    if ("articulos", n) not in _memo:
+        crudos = fetch_news("bench", n, parse=lambda url: feedparser.parse(_feed(n)))
+        _memo[("articulos", n)] = score_articles(crudos)
+    return _memo[("articulos", n)]
+
+
+def _df(n):
+    if ("df", n) not in _memo:
+        _memo[("df", n)] = create_sentiment_dataframe(_articulos(n))
+    return _memo[("df", n)]
+
+
+# ------------------------ ANÁLISIS DE NOTICIAS ------------------------
+@caso("feed_grabado", "noticias", tamanos=(25,))
+def _(n):
+    contenido = fixtures.cargar_feed_grabado()
+    return lambda: fetch_news("tecnología", n, parse=lambda url: feedparser.parse(contenido))
+
+
+@caso("fetch_news_parseo", "noticias", maximo=10_000)
+def _(n):
+    contenido = _feed(n)
+    return lambda: fetch_news("bench", n, parse=lambda url: feedparser.parse(contenido))
+
+
+class _HttpFeed:
+    """Servidor de feeds sin red para ``VigilanteNoticias``: un ETag fijo y 304 si coincide."""
+
+    def __init__(self, cuerpo, condicional=True):
+        self.cuerpo = cuerpo
+        self.condicional = condicional
+
+    def request(self, metodo, url, headers=None, timeout=None):
+        if self.condicional and (headers or {}).get("If-None-Match") == '"v1"':
+            return types.SimpleNamespace(status=304, headers={}, data=b"")
+        return types.SimpleNamespace(status=200, headers={"ETag": '"v1"'}, data=self.cuerpo)
+
+
+@caso("vigilancia_sin_cambios", "noticias")
+def _(n):
+    vigilante = VigilanteNoticias(["bench"], max_articles=n, http=_HttpFeed(_feed(n)))
+    vigilante.consultar("bench")
+    return lambda: vigilante.consultar("bench")
+
+
+@caso("vigilancia_feed_visto", "noticias", maximo=10_000)
+def _(n):
+    # El feed cambió pero todas sus entradas ya se habían analizado
+    vigilante = VigilanteNoticias(["bench"], max_articles=n, http=_HttpFeed(_feed(n), condicional=False))
+    vigilante.consultar("bench")
+    return lambda: vigilante.consultar("bench")
+
+
+@caso("remove_html_tags", "noticias")
+def _(n):
+    resumenes = [e.summary for e in feedparser.parse(_feed(n)).entries]
+    return lambda: [remove_html_tags(r) for r in resumenes]
+
+
+@caso("collapse_near_duplicates", "noticias")
+def _(n):
+    entradas = [entry_to_raw(e) for e in feedparser.parse(_feed(n)).entries]
+    return lambda: collapse_near_duplicates(entradas)
+
+
+@caso("analyze_sentiment", "sentimiento", maximo=10_000)
+def _(n):
+    textos = [a['title'] + " " + a['summary'] for a in _articulos(n)]
+    return lambda: [analyze_sentiment(t) for t in textos]
+
+
+@caso("analyze_batch_lexicon", "sentimiento")
+def _(n):
+    textos = [a['title'] + " " + a['summary'] for a in _articulos(n)]
+    return lambda: analyze_batch(textos, mode="lexicon")
+
+
+@caso("analyze_batch_modelo", "sentimiento")
+def _(n):
+    # Modelo entrenado con las etiquetas de TextBlob del propio feed sintético
+    articulos = _articulos(min(n, 1000))
+    modelo = entrenar([a['title'] + " " + a['summary'] for a in articulos],
+                      [a['sentiment'] for a in articulos])
+    textos = [a['title'] + " " + a['summary'] for a in _articulos(n)]
+    return lambda: analyze_batch(textos, scorer=modelo)
+
+
+@caso("create_sentiment_dataframe", "sentimiento")
+def _(n):
+    articulos = _articulos(n)
+    return lambda: create_sentiment_dataframe(articulos)
+
+
+@caso("compact_articles", "sentimiento")
+def _(n):
+    articulos = _articulos(n)
+    return lambda: compact_articles(articulos)
+
+
+@caso("dataframe_fingerprint", "exportacion")
+def _(n):
+    df = compact_articles(_articulos(n))
+    return lambda: dataframe_fingerprint(df)
+
+
+@caso("export_csv", "exportacion")
+def _(n):
+    df = compact_articles(_articulos(n))
+    return lambda: export_dataframe(df, "CSV")
+
+
+@caso("export_parquet", "exportacion")
+def _(n):
+    df = compact_articles(_articulos(n))
+    return lambda: export_dataframe(df, "Parquet")
+
+
+@caso("plot_sentiment_distribution", "graficos")
+def _(n):
+    df = _df(n)
+    return lambda: plot_sentiment_distribution(df)
+
+
+@caso("plot_sentiment_over_time", "graficos")
+def _(n):
+    df = _df(n)
+    return lambda: plot_sentiment_over_time(df)
+
+
+@caso("parse_published", "sentimiento")
+def _(n):
+    fechas = [a['published'] for a in _articulos(n)]
+    return lambda: parse_published(fechas)
+
+
+@caso("sentiment_rollups", "sentimiento")
+def _(n):
+    articulos = _articulos(n)
+
+    def ejecutar():
+        rollups = SentimentRollups()
+        for i in range(0, len(articulos), 500):
+            rollups.add_articles(articulos[i:i + 500])
+        return rollups.frame("hora")
+    return ejecutar
+
+
+@caso("plot_polarity_subjectivity", "graficos")
+def _(n):
+    df = _df(n)
+    return lambda: plot_polarity_subjectivity(df)
+
+
+@caso("submuestrear_lttb", "graficos", tamanos=DIAS_PRECIOS)
+def _(n):
+    cierres = fixtures.generar_precios(TICKERS, n)["Close"]
+    return lambda: submuestrear(cierres, puntos=500)
+
+
+# ------------------------ PRECIOS ------------------------
+def _descargador(dias):
+    completo = fixtures.generar_precios(TICKERS, dias)
+
+    def descargar(ticker, fecha_inicio, fecha_fin):
+        datos = completo.xs(ticker, axis=1, level="Ticker")
+        return _normalizar_columnas(datos.loc[str(fecha_inicio):str(pd.Timestamp(fecha_fin) - pd.Timedelta(days=1))])
+    return descargar, completo.index[0], completo.index[-1] + pd.Timedelta(days=1)
+
+
+@caso("almacen_precios_frio", "precios", tamanos=DIAS_PRECIOS)
+def _(n):
+    descargar, inicio, fin = _descargador(n)
+
+    def medir():
+        with tempfile.TemporaryDirectory() as directorio:
+            AlmacenPrecios(directorio, descargar).obtener("TSLA", inicio, fin)
+    return medir
+
+
+@caso("almacen_precios_caliente", "precios", tamanos=DIAS_PRECIOS)
+def _(n):
+    descargar, inicio, fin = _descargador(n)
+    directorio = _temporales.enter_context(tempfile.TemporaryDirectory())
+    almacen = AlmacenPrecios(directorio, descargar)
+    almacen.obtener("TSLA", inicio, fin)
+    return lambda: almacen.obtener("TSLA", inicio, fin)
+
+
+@caso("calcular_rendimiento_diario", "precios", tamanos=DIAS_PRECIOS)
+def _(n):
+    datos = _normalizar_columnas(fixtures.generar_precios(["TSLA"], n))
+    return lambda: calcular_rendimiento_diario(datos)
+
+
+@caso("metricas_cartera", "precios", tamanos=DIAS_PRECIOS)
+def _(n):
+    cierres = fixtures.generar_precios(TICKERS, n)["Close"]
+    cierres.columns.name = None
+
+    def calcular():
+        rendimientos = rendimientos_cartera(cierres)
+        metricas_riesgo(rendimientos, rendimientos["Cartera"])
+        volatilidad_movil(rendimientos, 21)
+        matriz_correlacion(rendimientos)
+    return calcular
+
+
+def _alineado(dias):
+    """Polaridad de ~10 artículos por día alineada con los rendimientos de todos los tickers."""
+    if ("alineado", dias) not in _memo:
+        cierres = fixtures.generar_precios(TICKERS, dias)["Close"]
+        cierres.columns.name = None
+        n = dias * 10
+        indices = np.random.default_rng(0).integers(0, dias, n)
+        articulos = pd.DataFrame({
+            "date": cierres.index[indices].date,
+            "polarity": np.random.default_rng(1).normal(0, 0.3, n),
+        })
+        _memo[("alineado", dias)] = alinear_sentimiento_precios(
+            polaridad_diaria(articulos), rendimientos_diarios(cierres)
+        )
+    return _memo[("alineado", dias)]
+
+
+@caso("correlaciones_rezagadas", "precios", tamanos=DIAS_PRECIOS)
+def _(n):
+    alineado = _alineado(n)
+    return lambda: correlaciones_rezagadas(alineado, TICKERS, max_rezago=20)
+
+
+@caso("correlacion_movil", "precios", tamanos=DIAS_PRECIOS)
+def _(n):
+    alineado = _alineado(n)
+    return lambda: correlacion_movil(alineado, TICKERS, ventana=60, rezago=1)
+
+
+# ------------------------ ARRANQUE ------------------------
+# Importaciones de primer nivel de cada página en un intérprete nuevo: lo que
+# paga el primer script que ejecuta un worker antes de dibujar nada
+def _caso_arranque(ruta):
+    codigo = importaciones(ruta)
+    nombre = os.path.basename(ruta)
+    nombre = f"pagina_{nombre[:2]}" if nombre[:2].isdigit() else os.path.splitext(nombre)[0].lower()
+
+    @caso(f"arranque_{nombre}", "arranque", tamanos=(1,))
+    def _(n):
+        return lambda: subprocess.run([sys.executable, "-c", codigo], cwd=RAIZ, check=True)
+
+
+for _ruta in PAGINAS:
+    _caso_arranque(_ruta)
+
+
+# ------------------------ EJECUCIÓN ------------------------
+def medir(funcion, repeticiones, presupuesto):
+    """Ejecutar hasta ``repeticiones`` veces sin pasar de ``presupuesto`` segundos."""
+    tiempos = []
+    limite = time.perf_counter() + presupuesto
+    while len(tiempos) < repeticiones and (not tiempos or time.perf_counter() < limite):
+        inicio = time.perf_counter()
+        funcion()
+        tiempos.append(time.perf_counter() - inicio)
+    return tiempos
+
+
+def commit_actual():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=RAIZ,
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def ejecutar(casos, tamanos, max_n, repeticiones, presupuesto):
+    resultados = []
+    for nombre in casos:
+        grupo, tamanos_caso, maximo, preparar = CASOS[nombre]
+        for n in tamanos_caso:
+            if tamanos_caso is TAMANOS and (n not in tamanos or n > (max_n or maximo or n)):
+                continue
+            with _temporales:
+                funcion = preparar(n)
+                funcion()  # calentamiento
+                tiempos = medir(funcion, repeticiones, presupuesto)
+            resultado = {
+                "caso": nombre,
+                "grupo": grupo,
+                "n": n,
+                "repeticiones": len(tiempos),
+                "min_s": min(tiempos),
+                "mediana_s": statistics.median(tiempos),
+                "us_por_elemento": min(tiempos) / n * 1e6,
+            }
+            resultados.append(resultado)
+            print(f"{nombre:<30}{n:>8}{resultado['min_s'] * 1e3:>12.2f} ms"
+                  f"{resultado['us_por_elemento']:>12.1f} µs/elem", file=sys.stderr)
+    return resultados
+
+
+def comparar(resultados, base, tolerancia):
+    """Imprimir la relación con una ejecución anterior; devuelve las regresiones."""
+    anteriores = {(r["caso"], r["n"]): r for r in base["resultados"]}
+    regresiones = []
+    print(f"\n{'caso':<30}{'n':>8}{'base ms':>12}{'nuevo ms':>12}{'relación':>10}")
+    for r in resultados:
+        previo = anteriores.get((r["caso"], r["n"]))
+        if previo is None:
+            continue
+        relacion = r["min_s"] / previo["min_s"]
+        marca = " ⚠" if relacion > 1 + tolerancia else ""
+        print(f"{r['caso']:<30}{r['n']:>8}{previo['min_s'] * 1e3:>12.2f}"
+              f"{r['min_s'] * 1e3:>12.2f}{relacion:>9.2f}x{marca}")
+        if marca:
+            regresiones.append((r["caso"], r["n"], relacion))
+    return regresiones
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--casos", nargs="*", default=None,
+                        help="Nombres de casos o grupos (noticias, sentimiento, exportacion, graficos, precios, arranque)")
+    parser.add_argument("--tamanos", nargs="*", type=int, default=list(TAMANOS),
+                        help="Número de entradas de los feeds sintéticos")
+    parser.add_argument("--max-n", type=int, default=None,
+                        help="Ignorar el máximo por defecto de los casos lentos")
+    parser.add_argument("--repeticiones", type=int, default=5)
+    parser.add_argument("--presupuesto", type=float, default=10.0,
+                        help="Segundos máximos de repeticiones por caso y tamaño")
+    parser.add_argument("--salida", default=None, help="Archivo JSON de resultados (por defecto stdout)")
+    parser.add_argument("--comparar", default=None, help="JSON de una ejecución anterior")
+    parser.add_argument("--tolerancia", type=float, default=0.10,
+                        help="Aumento relativo que cuenta como regresión al comparar")
+    args = parser.parse_args()
+
+    seleccion = args.casos or list(CASOS)
+    casos = [n for n in CASOS if n in seleccion or CASOS[n][0] in seleccion]
+    if not casos:
+        parser.error(f"Ningún caso coincide con {seleccion}; disponibles: {', '.join(CASOS)}")
+
+    resultados = ejecutar(casos, args.tamanos, args.max_n, args.repeticiones, args.presupuesto)
+    informe = {
+        "metadatos": {
+            "commit": commit_actual(),
+            "fecha": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "plataforma": platform.platform(),
+            "cpus": os.cpu_count(),
+        },
+        "resultados": resultados,
+    }
+    texto = json.dumps(informe, indent=2, ensure_ascii=False)
+    if args.salida:
+        with open(args.salida, "w", encoding="utf-8") as f:
+            f.write(texto + "\n")
+    else:
+        print(texto)
+
+    if args.comparar:
+        with open(args.comparar, encoding="utf-8") as f:
+            regresiones = comparar(resultados, json.load(f), args.tolerancia)
+        if regresiones:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+# cache_sentimiento.py
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+import unicodedata
+
+# Ruta por defecto del almacén, compartido por todas las sesiones y reinicios
+RUTA_CACHE = os.environ.get(
+    "SENTIMIENTO_CACHE",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "sentimiento.sqlite3")
+)
+
+# Número máximo de resultados guardados antes de desalojar los menos usados
+MAX_ENTRADAS = 200_000
+
+
+def normalize_text(text):
+    """Normalizar el texto de un artículo antes de calcular su clave.
+
+    Solo se unifica la forma Unicode y los espacios, que no cambian el
+    resultado del análisis; las mayúsculas y la puntuación se conservan.
+    """
+    return " ".join(unicodedata.normalize("NFC", text or "").split())
+
+
+def content_key(text, version):
+    """Clave de contenido: hash del texto normalizado y de la versión del puntuador."""
+    data = f"{version}\0{normalize_text(text)}".encode("utf-8")
+    return hashlib.sha256(data).hexdigest()
+
+
+class SentimentCache:
+    """Almacén SQLite de resultados de sentimiento con desalojo LRU acotado."""
+
+    def __init__(self, path=RUTA_CACHE, max_entries=MAX_ENTRADAS):
+        self.path = path
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS resultados (
+                    clave TEXT PRIMARY KEY,
+                    polaridad REAL NOT NULL,
+                    subjetividad REAL NOT NULL,
+                    ultimo_acceso REAL NOT NULL
+                )
+            """)
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_ultimo_acceso ON resultados (ultimo_acceso)"
+            )
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS contadores (
+                    nombre TEXT PRIMARY KEY,
+                    valor INTEGER NOT NULL
+                )
+            """)
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO contadores (nombre, valor) VALUES (?, 0)",
+                [("aciertos",), ("fallos",), ("desalojos",)]
+            )
+
+    def get_many(self, keys):
+        """Devolver ``{clave: (polaridad, subjetividad)}`` de las claves guardadas."""
+        keys = list(keys)
+        found = {}
+        with self._lock, self._conn:
+            # SQLite limita el número de parámetros por consulta
+            for i in range(0, len(keys), 900):
+                lote = keys[i:i + 900]
+                marcas = ",".join("?" * len(lote))
+                filas = self._conn.execute(
+                    f"SELECT clave, polaridad, subjetividad FROM resultados WHERE clave IN ({marcas})",
+                    lote
+                ).fetchall()
+                found.update((clave, (pol, subj)) for clave, pol, subj in filas)
+            if found:
+                ahora = time.time()
+                self._conn.executemany(
+                    "UPDATE resultados SET ultimo_acceso = ? WHERE clave = ?",
+                    [(ahora, clave) for clave in found]
+                )
+            self._count("aciertos", len(found))
+            self._count("fallos", len(keys) - len(found))
+        return found
+
+    def put_many(self, items):
+        """Guardar pares ``(clave, (polaridad, subjetividad))`` y desalojar si hace falta."""
+        ahora = time.time()
+        filas = [(clave, float(pol), float(subj), ahora) for clave, (pol, subj) in items]
+        if not filas:
+            return
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO resultados (clave, polaridad, subjetividad, ultimo_acceso) "
+                "VALUES (?, ?, ?, ?)",
+                filas
+            )
+            self._evict()
+
+    def _evict(self):
+        """Eliminar las entradas menos usadas recientemente por encima del límite."""
+        total = self._conn.execute("SELECT COUNT(*) FROM resultados").fetchone()[0]
+        sobrantes = total - self.max_entries
+        if sobrantes > 0:
+            # Se desaloja un 10 % extra para no repetir el borrado en cada escritura
+            sobrantes += self.max_entries // 10
+            self._conn.execute(
+                "DELETE FROM resultados WHERE clave IN ("
+                "SELECT clave FROM resultados ORDER BY ultimo_acceso LIMIT ?)",
+                (sobrantes,)
+            )
+            self._count("desalojos", min(sobrantes, total))
+
+    def _count(self, name, amount):
+        if amount:
+            self._conn.execute(
+                "UPDATE contadores SET valor = valor + ? WHERE nombre = ?", (amount, name)
+            )
+
+    def stats(self):
+        """Número de entradas y contadores de aciertos, fallos y desalojos."""
+        with self._lock:
+            contadores = dict(self._conn.execute("SELECT nombre, valor FROM contadores"))
+            entradas = self._conn.execute("SELECT COUNT(*) FROM resultados").fetchone()[0]
+        consultas = contadores["aciertos"] + contadores["fallos"]
+        return {
+            "entradas": entradas,
+            "aciertos": contadores["aciertos"],
+            "fallos": contadores["fallos"],
+            "desalojos": contadores["desalojos"],
+            "tasa_aciertos": contadores["aciertos"] / consultas if consultas else 0.0
+        }
+
+    def clear(self):
+        """Vaciar el almacén y reiniciar los contadores."""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM resultados")
+            self._conn.execute("UPDATE contadores SET valor = 0")
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,128 @@
+# correlacion.py
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+# Las noticias de un día sin mercado (fin de semana, festivo) cuentan para la
+# siguiente sesión, siempre que llegue dentro de este margen.
+MAX_DIAS_HASTA_SESION = 4
+MIN_OBSERVACIONES = 10
+
+
+def polaridad_diaria(df: pd.DataFrame) -> pd.DataFrame:
+    """Polaridad media y número de artículos por día de publicación."""
+    fechas = pd.to_datetime(df['date'], errors='coerce')
+    diaria = (
+        pd.DataFrame({'fecha': fechas, 'polarity': df['polarity'].to_numpy()})
+        .dropna(subset=['fecha'])
+        .groupby('fecha')['polarity']
+        .agg(polaridad='mean', articulos='size')
+    )
+    return diaria
+
+
+def rendimientos_diarios(cierres: pd.DataFrame) -> pd.DataFrame:
+    """Rendimiento diario de cada columna de precios de cierre (una por ticker)."""
+    return cierres.sort_index().pct_change(fill_method=None).iloc[1:]
+
+
+def alinear_sentimiento_precios(polaridad: pd.DataFrame, rendimientos: pd.DataFrame,
+                                max_dias=MAX_DIAS_HASTA_SESION) -> pd.DataFrame:
+    """Asignar cada día de noticias a la siguiente sesión y unirlo a los rendimientos.
+
+    Unión ordenada *as-of*: cada día de ``polaridad`` se lleva a la primera
+    sesión de ``rendimientos`` en esa fecha o después; si varios días caen en
+    la misma sesión, su polaridad se promedia ponderada por artículos. Las
+    sesiones sin noticias quedan con ``polaridad`` NaN.
+    """
+    sesiones = pd.DataFrame({'sesion': rendimientos.index.astype('datetime64[ns]')})
+    dias = polaridad.reset_index().astype({'fecha': 'datetime64[ns]'}).sort_values('fecha')
+    asignados = pd.merge_asof(
+        dias, sesiones, left_on='fecha', right_on='sesion',
+        direction='forward', tolerance=pd.Timedelta(days=max_dias)
+    ).dropna(subset=['sesion'])
+
+    suma = (asignados['polaridad'] * asignados['articulos']).groupby(asignados['sesion']).sum()
+    articulos = asignados.groupby('sesion')['articulos'].sum()
+    alineado = rendimientos.copy()
+    alineado.index = sesiones['sesion'].to_numpy()
+    alineado.index.name = 'fecha'
+    alineado.insert(0, 'articulos', articulos.reindex(alineado.index).fillna(0).astype(int))
+    alineado.insert(0, 'polaridad', (suma / articulos).reindex(alineado.index))
+    return alineado
+
+
+def _matriz_rezagos(x, max_rezago):
+    """Vista ``(n, max_rezago + 1)`` con ``x`` desplazado 0..max_rezago posiciones."""
+    relleno = np.concatenate([np.full(max_rezago, np.nan), x])
+    return sliding_window_view(relleno, max_rezago + 1)[:, ::-1]
+
+
+def _centrar(a, valido):
+    """Restar la media por columna de los valores válidos y poner a cero el resto.
+
+    Centrar no cambia la correlación y evita la cancelación numérica en las sumas.
+    """
+    a = np.where(valido, a, 0.0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        media = np.nan_to_num(a.sum(axis=0) / valido.sum(axis=0))
+    return np.where(valido, a - media, 0.0)
+
+
+def _correlacion(n, sx, sy, sxx, syy, sxy, min_observaciones):
+    cov = n * sxy - sx * sy
+    var = (n * sxx - sx * sx) * (n * syy - sy * sy)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        r = cov / np.sqrt(var)
+    r[(n < min_observaciones) | ~(var > 0)] = np.nan
+    return np.clip(r, -1.0, 1.0)
+
+
+def correlaciones_rezagadas(alineado: pd.DataFrame, tickers, max_rezago=5,
+                            min_observaciones=MIN_OBSERVACIONES) -> pd.DataFrame:
+    """Correlación de Pearson entre la polaridad de ``t - k`` y el rendimiento de ``t``.
+
+    Calcula todos los rezagos ``k = 0..max_rezago`` y todos los tickers en una
+    sola pasada: la polaridad desplazada es una vista ``(n, k)`` y las sumas
+    de los pares válidos salen de productos de matrices ``(k, n) @ (n, tickers)``.
+    """
+    tickers = list(tickers)
+    x = _matriz_rezagos(alineado['polaridad'].to_numpy(float), max_rezago)
+    y = alineado[tickers].to_numpy(float)
+
+    mx, my = ~np.isnan(x), ~np.isnan(y)
+    x0, y0 = _centrar(x, mx), _centrar(y, my)
+    mx, my = mx.astype(float), my.astype(float)
+    r = _correlacion(
+        mx.T @ my, x0.T @ my, mx.T @ y0, (x0 * x0).T @ my, mx.T @ (y0 * y0), x0.T @ y0,
+        min_observaciones
+    )
+    return pd.DataFrame(r, index=pd.RangeIndex(max_rezago + 1, name='rezago'), columns=tickers)
+
+
+def correlacion_movil(alineado: pd.DataFrame, tickers, ventana=60, rezago=0,
+                      min_observaciones=MIN_OBSERVACIONES) -> pd.DataFrame:
+    """Correlación móvil en ``ventana`` sesiones entre la polaridad de ``t - rezago`` y el rendimiento.
+
+    Las sumas por ventana salen de diferencias de sumas acumuladas, para todos
+    los tickers a la vez.
+    """
+    tickers = list(tickers)
+    x = _matriz_rezagos(alineado['polaridad'].to_numpy(float), rezago)[:, -1:]
+    y = alineado[tickers].to_numpy(float)
+    x = np.broadcast_to(x, y.shape)
+    valido = ~(np.isnan(x) | np.isnan(y))
+    x0, y0 = _centrar(x, valido), _centrar(y, valido)
+    valido = valido.astype(float)
+
+    def movil(a):
+        acumulado = np.cumsum(np.vstack([np.zeros((1, a.shape[1])), a]), axis=0)
+        suma = acumulado[1:].copy()
+        suma[ventana:] -= acumulado[1:-ventana]
+        return suma
+
+    r = _correlacion(
+        movil(valido), movil(x0), movil(y0), movil(x0 * x0), movil(y0 * y0), movil(x0 * y0),
+        min_observaciones
+    )
+    return pd.DataFrame(r, index=alineado.index, columns=tickers)
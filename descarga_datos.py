@@ -1,7 +1,13 @@
 # descarga_datos.py
-import yfinance as yf
 import pandas as pd
 
+from almacen_precios import AlmacenPrecios
+
+_almacen = None
+
 def obtener_datos_tesla(fecha_inicio: str, fecha_fin: str):
-    data = yf.download("TSLA", start=fecha_inicio, end=fecha_fin)
-    return data
\ No newline at end of file
+    global _almacen
+    if _almacen is None:
+        _almacen = AlmacenPrecios()
+    data = _almacen.obtener("TSLA", fecha_inicio, fecha_fin)
+    return data
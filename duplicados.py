@@ -0,0 +1,151 @@
+# duplicados.py
+import re
+import zlib
+
+import numpy as np
+
+# Firma MinHash de 128 permutaciones en 32 bandas de 4 filas: dos títulos
+# caen en la misma cubeta de alguna banda con probabilidad 1 - (1 - J^4)^32,
+# que pasa de ~0.1 con Jaccard 0.25 a ~0.9 con Jaccard 0.5.
+NUM_PERMUTACIONES = 128
+BANDAS = 32
+LONGITUD_SHINGLE = 2
+UMBRAL_DUPLICADO = 0.5
+
+_MAX_VALORES_BLOQUE = 8_000_000
+_RE_FUENTE = re.compile(r"\s+[-–—|]\s+[^-–—|]{1,60}$")
+_RE_NO_ALFANUMERICO = re.compile(r"[\W_]+")
+
+# Permutaciones x -> a·x + b (mod 2^32) con a impar: la aritmética de uint32
+# desborda sola, sin el módulo por un primo, y estima el Jaccard con la misma
+# precisión.
+_rng = np.random.default_rng(20240917)
+_A = _rng.integers(0, 2**32, NUM_PERMUTACIONES, dtype=np.uint32) | np.uint32(1)
+_B = _rng.integers(0, 2**32, NUM_PERMUTACIONES, dtype=np.uint32)
+_MEZCLA = _rng.integers(0, 2**63, NUM_PERMUTACIONES, dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+
+
+def normalize_title(title):
+    """Título sin el medio final (" - Reuters"), en minúsculas y sin puntuación."""
+    title = _RE_FUENTE.sub("", title or "")
+    return _RE_NO_ALFANUMERICO.sub(" ", title.lower()).strip()
+
+
+def _shingle_hashes(texts, k=LONGITUD_SHINGLE):
+    """Hashes de los k-gramas de palabras de todos los textos y su texto de origen.
+
+    Cada palabra se resume con CRC32 y los k-gramas se combinan con NumPy
+    sobre el arreglo de todas las palabras, descartando los que cruzan de un
+    texto al siguiente. Un texto con menos de ``k`` palabras aporta un único
+    shingle con todas ellas.
+    """
+    palabras = [t.split() for t in texts]
+    longitudes = np.fromiter(map(len, palabras), dtype=np.int64, count=len(palabras))
+    hashes = np.fromiter(
+        (zlib.crc32(p.encode("utf-8")) for ps in palabras for p in ps),
+        dtype=np.uint64, count=int(longitudes.sum())
+    )
+    documento = np.repeat(np.arange(len(texts)), longitudes)
+    if not len(hashes):
+        return hashes.astype(np.uint32), documento
+    # Rellenar con ceros para que todo texto tenga al menos un k-grama completo
+    faltan = np.where(longitudes > 0, np.maximum(k - longitudes, 0), 0)
+    if faltan.any():
+        fines = np.cumsum(longitudes)
+        hashes = np.insert(hashes, np.repeat(fines, faltan), 0)
+        documento = np.insert(documento, np.repeat(fines, faltan), np.repeat(np.arange(len(texts)), faltan))
+    combinados = np.zeros(len(hashes) - k + 1, dtype=np.uint64)
+    for j in range(k):
+        combinados = combinados * np.uint64(1_000_003) + hashes[j:len(hashes) - k + 1 + j]
+    validas = documento[:len(combinados)] == documento[k - 1:]
+    combinados = combinados[validas]
+    return (combinados ^ (combinados >> np.uint64(32))).astype(np.uint32), documento[:len(validas)][validas]
+
+
+def minhash_signatures(texts, k=LONGITUD_SHINGLE):
+    """Matriz ``(len(texts), NUM_PERMUTACIONES)`` de firmas MinHash.
+
+    Las permutaciones se aplican por bloques a los shingles de todos los
+    textos a la vez y el mínimo por texto sale de ``np.minimum.reduceat``.
+    Un texto sin shingles queda con la firma ``-1``.
+    """
+    hashes, documento = _shingle_hashes(texts, k)
+    firmas = np.full((len(texts), NUM_PERMUTACIONES), -1, dtype=np.int64)
+    if not len(hashes):
+        return firmas
+    # ``documento`` ya está ordenado: cada texto ocupa un tramo contiguo
+    desplazamientos = np.flatnonzero(np.diff(documento, prepend=-1))
+    con_shingles = documento[desplazamientos]
+    paso = max(1, _MAX_VALORES_BLOQUE // len(hashes))
+    for p in range(0, NUM_PERMUTACIONES, paso):
+        permutados = _A[p:p + paso, None] * hashes[None, :]
+        permutados += _B[p:p + paso, None]
+        firmas[con_shingles, p:p + paso] = np.minimum.reduceat(permutados, desplazamientos, axis=1).T
+    return firmas
+
+
+def group_near_duplicates(texts, threshold=UMBRAL_DUPLICADO):
+    """Etiqueta de grupo de cada texto; los casi duplicados comparten etiqueta.
+
+    Las firmas se cortan en ``BANDAS`` y los textos con una banda idéntica
+    son candidatos; un candidato se une al grupo del primero de su cubeta si
+    la similitud estimada de sus firmas llega a ``threshold``. El coste es
+    casi lineal en el número de textos, sin comparar todos los pares. La
+    etiqueta es el índice del primer texto del grupo.
+    """
+    firmas = minhash_signatures(texts)
+    con_firma = np.flatnonzero(firmas[:, 0] >= 0)
+    filas = NUM_PERMUTACIONES // BANDAS
+
+    # Clave de 64 bits de cada banda; una colisión solo añade un candidato
+    # que la comprobación de similitud descarta
+    aristas = []
+    for banda in range(BANDAS):
+        claves = firmas[con_firma, banda * filas:(banda + 1) * filas].astype(np.uint64) @ _MEZCLA[:filas]
+        orden = np.argsort(claves, kind="stable")
+        nueva = np.diff(claves[orden], prepend=claves[orden[:1]] + np.uint64(1)) != 0
+        primero = orden[np.flatnonzero(nueva)[np.cumsum(nueva) - 1]]
+        repetido = ~nueva
+        aristas.append(np.stack([con_firma[primero[repetido]], con_firma[orden[repetido]]], axis=1))
+    pares = np.concatenate(aristas)
+    pares = pares[np.unique(pares[:, 0] * len(firmas) + pares[:, 1], return_index=True)[1]]
+    similitud = (firmas[pares[:, 0]] == firmas[pares[:, 1]]).mean(axis=1)
+    pares = pares[similitud >= threshold]
+
+    padre = list(range(len(firmas)))
+
+    def raiz(i):
+        while padre[i] != i:
+            padre[i] = padre[padre[i]]
+            i = padre[i]
+        return i
+
+    for i, j in pares.tolist():
+        ri, rj = raiz(i), raiz(j)
+        if ri != rj:
+            padre[max(ri, rj)] = min(ri, rj)
+    return np.array([raiz(i) for i in range(len(firmas))], dtype=np.int64)
+
+
+def collapse_near_duplicates(entries, threshold=UMBRAL_DUPLICADO):
+    """Dejar una entrada por grupo de casi duplicados, con el tamaño del grupo.
+
+    El representante es la primera entrada del grupo en el orden del feed y
+    lleva ``group_size`` (cuántas entradas representa) y ``group_links``
+    (los enlaces de las demás).
+    """
+    entries = list(entries)
+    if not entries:
+        return []
+    grupos = group_near_duplicates([normalize_title(e['title']) for e in entries], threshold)
+    miembros = {}
+    for i, grupo in enumerate(grupos):
+        miembros.setdefault(grupo, []).append(i)
+    return [
+        {
+            **entries[indices[0]],
+            'group_size': len(indices),
+            'group_links': [entries[i]['link'] for i in indices[1:]]
+        }
+        for indices in miembros.values()
+    ]
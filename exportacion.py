@@ -0,0 +1,126 @@
+# exportacion.py
+import gzip
+import hashlib
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+# Filas que se serializan de una vez: el archivo se escribe por bloques y
+# nunca existe una segunda copia completa de la tabla como texto
+FILAS_BLOQUE = 50_000
+
+# Por encima de este tamaño el archivo se escribe en disco en lugar de en
+# memoria, así que la única copia completa en memoria es la que se devuelve
+MAX_BYTES_MEMORIA = 8 * 1024 * 1024
+
+# Separador de los elementos de una columna de listas (``group_links``) en CSV;
+# los enlaces nunca llevan espacios sin codificar
+SEPARADOR_LISTAS = " "
+
+# Formato -> (extensión, tipo MIME)
+EXPORT_FORMATS = {
+    "CSV": ("csv", "text/csv"),
+    "CSV comprimido (gzip)": ("csv.gz", "application/gzip"),
+    "Parquet": ("parquet", "application/vnd.apache.parquet"),
+}
+
+
+def _arrow_table(df, index):
+    import pyarrow as pa
+
+    return pa.Table.from_pandas(df, preserve_index=index)
+
+
+def _update_digest(digest, array):
+    digest.update(f"{array.offset}:{len(array)}".encode("utf-8"))
+    for buffer in array.buffers():
+        if buffer is not None:
+            digest.update(buffer)
+    if hasattr(array, "dictionary"):
+        _update_digest(digest, array.dictionary)
+
+
+def dataframe_fingerprint(df: pd.DataFrame) -> str:
+    """Huella de los datos de ``df``, para cachear sus exportaciones.
+
+    Se calcula sobre los búferes de Arrow de cada columna (sin copiarlos en
+    las columnas que ya son de Arrow), mucho más rápido que convertir y
+    hashear cada valor.
+    """
+    table = _arrow_table(df, index=True)
+    digest = hashlib.sha1(str(table.schema).encode("utf-8"))
+    for column in table.columns:
+        for chunk in column.chunks:
+            _update_digest(digest, chunk)
+    return digest.hexdigest()
+
+
+def _chunks(df, chunk_rows):
+    for start in range(0, max(len(df), 1), chunk_rows):
+        yield df.iloc[start:start + chunk_rows]
+
+
+def _list_columns(df):
+    """Columnas de objetos cuyos valores son listas o arreglos."""
+    columnas = []
+    for columna in df.columns:
+        valores = df[columna]
+        if valores.dtype != object:
+            continue
+        primero = valores.first_valid_index()
+        if primero is not None and isinstance(valores.loc[primero], (list, tuple, np.ndarray)):
+            columnas.append(columna)
+    return columnas
+
+
+def _join_list(valor):
+    return SEPARADOR_LISTAS.join(map(str, valor)) if isinstance(valor, (list, tuple, np.ndarray)) else valor
+
+
+def _write_csv(df, stream, index, chunk_rows):
+    # Sin esto, to_csv escribe las listas como su repr ("['a' 'b']")
+    listas = _list_columns(df)
+    for i, chunk in enumerate(_chunks(df, chunk_rows)):
+        if listas:
+            chunk = chunk.copy()
+            for columna in listas:
+                chunk[columna] = chunk[columna].map(_join_list)
+        stream.write(chunk.to_csv(index=index, header=i == 0).encode("utf-8"))
+
+
+def _write_parquet(df, stream, index, chunk_rows):
+    import pyarrow.parquet as pq
+
+    writer = None
+    for chunk in _chunks(df, chunk_rows):
+        table = _arrow_table(chunk, index)
+        if not index:
+            # Sin índice que reconstruir, los metadatos de pandas sobran y
+            # algunas versiones no saben releer los de las columnas de listas
+            table = table.replace_schema_metadata(None)
+        if writer is None:
+            writer = pq.ParquetWriter(stream, table.schema, compression="zstd")
+        # Cada bloque es un grupo de filas del archivo
+        writer.write_table(table.cast(writer.schema))
+    writer.close()
+
+
+def export_dataframe(df: pd.DataFrame, fmt="CSV", index=False, chunk_rows=FILAS_BLOQUE) -> bytes:
+    """Bytes del archivo de ``df`` en el formato ``fmt`` de ``EXPORT_FORMATS``, escrito por bloques.
+
+    Las columnas de listas se escriben en CSV con sus elementos separados
+    por ``SEPARADOR_LISTAS``; en Parquet se conservan como listas.
+    """
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Formato de exportación desconocido: {fmt!r}")
+    with tempfile.SpooledTemporaryFile(max_size=MAX_BYTES_MEMORIA, prefix="exportacion_") as archivo:
+        if fmt == "Parquet":
+            _write_parquet(df, archivo, index, chunk_rows)
+        elif fmt == "CSV comprimido (gzip)":
+            with gzip.GzipFile(fileobj=archivo, mode="wb", compresslevel=6, mtime=0) as compressed:
+                _write_csv(df, compressed, index, chunk_rows)
+        else:
+            _write_csv(df, archivo, index, chunk_rows)
+        archivo.seek(0)
+        return archivo.read()
@@ -0,0 +1,138 @@
+# graficos_sentimiento.py
+import pandas as pd
+
+from submuestreo import submuestrear
+from tendencias import SentimentRollups
+
+
+def plot_sentiment_distribution(df, count_duplicates=False):
+    """Graficar la distribución del sentimiento.
+
+    Con ``count_duplicates`` cada artículo cuenta tantas veces como noticias
+    casi duplicadas representa (columna ``group_size``).
+    """
+    import plotly.express as px
+
+    if count_duplicates and 'group_size' in df.columns:
+        sentiment_counts = df.groupby('sentiment')['group_size'].sum().reset_index()
+    else:
+        sentiment_counts = df['sentiment'].value_counts().reset_index()
+    sentiment_counts.columns = ['Sentimiento', 'Cantidad']
+    
+    fig = px.pie(
+        sentiment_counts, 
+        values='Cantidad', 
+        names='Sentimiento', 
+        title='Distribución del Sentimiento'
+    )
+    return fig
+
+
+def plot_sentiment_over_time(df, frequency="día"):
+    """Graficar sentimiento a lo largo del tiempo si hay datos disponibles."""
+    if 'date' not in df.columns or df['date'].isna().all():
+        return None
+    return plot_sentiment_trend(SentimentRollups.from_dataframe(df).frame(frequency))
+
+
+def plot_sentiment_trend(trend):
+    """Graficar los conteos ya agregados por cubeta de ``SentimentRollups.frame``.
+
+    Solo recibe una fila por cubeta, así que su coste no depende del número
+    de artículos analizados.
+    """
+    if trend is None or trend.empty:
+        return None
+    import plotly.express as px
+
+    trend = submuestrear(trend[['Positivo', 'Neutro', 'Negativo']]).reset_index()
+    
+    trend_long = pd.melt(
+        trend, 
+        id_vars=['date'], 
+        value_vars=['Positivo', 'Neutro', 'Negativo'],
+        var_name='Sentimiento',
+        value_name='Cantidad'
+    )
+    
+    fig = px.line(
+        trend_long, 
+        x='date', 
+        y='Cantidad', 
+        color='Sentimiento',
+        title='Tendencias del Sentimiento en el Tiempo'
+    )
+    return fig
+
+
+def plot_polarity_subjectivity(df):
+    """Crear un diagrama de dispersión de polaridad vs subjetividad.
+
+    Con más de 1000 artículos plotly express ya lo dibuja con WebGL
+    (``render_mode="auto"``).
+    """
+    import plotly.express as px
+
+    fig = px.scatter(
+        df, 
+        x='polarity', 
+        y='subjectivity', 
+        color='sentiment',
+        hover_data=['title'],
+        title='Polaridad vs Subjetividad'
+    )
+    
+    fig.update_layout(
+        xaxis_title="Polaridad (Negativo ⟷ Positivo)",
+        yaxis_title="Subjetividad (Hecho ⟷ Opinión)"
+    )
+    
+    return fig
+
+
+def plot_lagged_correlations(correlaciones):
+    """Barras de la correlación polaridad-rendimiento por rezago y ticker."""
+    import plotly.express as px
+
+    datos = correlaciones.reset_index().melt(
+        id_vars='rezago', var_name='Ticker', value_name='Correlación'
+    )
+    fig = px.bar(
+        datos,
+        x='rezago',
+        y='Correlación',
+        color='Ticker',
+        barmode='group',
+        title='Correlación entre la polaridad de t − k y el rendimiento de t'
+    )
+    fig.update_layout(xaxis_title="Rezago k (sesiones)", yaxis_range=[-1, 1])
+    return fig
+
+
+def plot_rolling_correlation(correlacion, ventana):
+    """Línea de la correlación móvil polaridad-rendimiento de cada ticker (submuestreada)."""
+    import plotly.express as px
+
+    fig = px.line(
+        submuestrear(correlacion),
+        title=f'Correlación móvil ({ventana} sesiones)'
+    )
+    fig.update_layout(xaxis_title="Fecha", yaxis_title="Correlación", yaxis_range=[-1, 1],
+                      legend_title_text="Ticker")
+    return fig
+
+
+def plot_correlation_matrix(matriz):
+    """Mapa de calor de la matriz de correlación de los rendimientos."""
+    import plotly.express as px
+
+    fig = px.imshow(
+        matriz,
+        text_auto='.2f',
+        zmin=-1,
+        zmax=1,
+        color_continuous_scale='RdBu',
+        title='Correlación de los rendimientos diarios'
+    )
+    fig.update_layout(xaxis_title="", yaxis_title="", coloraxis_colorbar_title="Correlación")
+    return fig
@@ -0,0 +1,129 @@
+# indicadores.py
+import numpy as np
+import pandas as pd
+
+# Sesiones bursátiles por año, para anualizar rendimientos y volatilidades
+SESIONES_ANIO = 252
+
+
+def calcular_rendimiento_diario(datos: pd.DataFrame):
+    """Añadir la columna ``Daily Return`` y devolver también la volatilidad diaria."""
+    datos = datos.assign(**{"Daily Return": datos["Close"].pct_change()})
+    volatilidad = datos["Daily Return"].std()
+    return datos, volatilidad
+
+
+# ------------------------ CARTERA ------------------------
+# Todas las funciones trabajan sobre la matriz 2-D (sesiones, tickers) de una
+# vez. Los NaN (un ticker que aún no cotizaba) se excluyen par a par, como en
+# ``DataFrame.corr``.
+
+def cierres_cartera(precios: dict) -> pd.DataFrame:
+    """Cierres de varios tickers en columnas, sobre la unión de sus sesiones."""
+    cierres = pd.DataFrame({ticker: datos["Close"] for ticker, datos in precios.items() if not datos.empty})
+    return cierres.sort_index()
+
+
+def rendimientos_cartera(cierres: pd.DataFrame, pesos=None) -> pd.DataFrame:
+    """Rendimientos diarios de cada ticker más la columna ``Cartera``.
+
+    La cartera se rebalancea cada sesión a ``pesos`` (por defecto iguales)
+    entre los tickers que cotizan ese día.
+    """
+    rendimientos = cierres.pct_change(fill_method=None).iloc[1:]
+    r = rendimientos.to_numpy(float)
+    w = np.ones(r.shape[1]) if pesos is None else np.asarray(pesos, dtype=float)
+    validos = ~np.isnan(r)
+    suma_pesos = validos @ w
+    with np.errstate(invalid="ignore", divide="ignore"):
+        cartera = np.where(validos, r, 0.0) @ w / suma_pesos
+    return rendimientos.assign(Cartera=cartera)
+
+
+def volatilidad_movil(rendimientos: pd.DataFrame, ventana=21, anualizar=True) -> pd.DataFrame:
+    """Desviación típica móvil de los rendimientos en ``ventana`` sesiones.
+
+    Las sumas por ventana salen de diferencias de sumas acumuladas, para
+    todas las columnas a la vez; hacen falta ``ventana`` datos válidos.
+    """
+    r = rendimientos.to_numpy(float)
+    validos = ~np.isnan(r)
+    r0 = np.where(validos, r, 0.0)
+
+    def movil(a):
+        acumulado = np.cumsum(np.vstack([np.zeros((1, a.shape[1])), a]), axis=0)
+        return acumulado[ventana:] - acumulado[:-ventana]
+
+    n, s1, s2 = movil(validos.astype(float)), movil(r0), movil(r0 * r0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        varianza = (s2 - s1 * s1 / n) / (n - 1)
+    volatilidad = np.full(r.shape, np.nan)
+    volatilidad[ventana - 1:] = np.where(n == ventana, np.sqrt(np.maximum(varianza, 0.0)), np.nan)
+    if anualizar:
+        volatilidad *= np.sqrt(SESIONES_ANIO)
+    return pd.DataFrame(volatilidad, index=rendimientos.index, columns=rendimientos.columns)
+
+
+def valor_acumulado(rendimientos: pd.DataFrame) -> pd.DataFrame:
+    """Valor de 1 invertido al inicio en cada columna (NaN antes de su primer dato)."""
+    r = rendimientos.to_numpy(float)
+    valor = np.cumprod(1.0 + np.nan_to_num(r), axis=0)
+    valor[np.cumsum(~np.isnan(r), axis=0) == 0] = np.nan
+    return pd.DataFrame(valor, index=rendimientos.index, columns=rendimientos.columns)
+
+
+def caidas(rendimientos: pd.DataFrame) -> pd.DataFrame:
+    """Caída desde el máximo previo del valor acumulado de cada columna (0 en los máximos)."""
+    valor = valor_acumulado(rendimientos).to_numpy()
+    maximo = np.fmax.accumulate(np.fmax(valor, 1.0), axis=0)
+    return pd.DataFrame(valor / maximo - 1.0, index=rendimientos.index, columns=rendimientos.columns)
+
+
+def _sumas_pares(x, y):
+    """Número de pares válidos y sumas de x, y, x², y², xy para cada par de columnas."""
+    vx, vy = ~np.isnan(x), ~np.isnan(y)
+    x0, y0 = np.where(vx, x, 0.0), np.where(vy, y, 0.0)
+    mx, my = vx.astype(float), vy.astype(float)
+    return mx.T @ my, x0.T @ my, mx.T @ y0, (x0 * x0).T @ my, mx.T @ (y0 * y0), x0.T @ y0
+
+
+def matriz_correlacion(rendimientos: pd.DataFrame, min_observaciones=2) -> pd.DataFrame:
+    """Correlación de Pearson de todos los pares de columnas con productos de matrices."""
+    r = rendimientos.to_numpy(float)
+    n, sx, sy, sxx, syy, sxy = _sumas_pares(r, r)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        c = (n * sxy - sx * sy) / np.sqrt((n * sxx - sx * sx) * (n * syy - sy * sy))
+    c = np.where(n >= min_observaciones, np.clip(c, -1.0, 1.0), np.nan)
+    return pd.DataFrame(c, index=rendimientos.columns, columns=rendimientos.columns)
+
+
+def betas(rendimientos: pd.DataFrame, referencia: pd.Series, min_observaciones=2) -> pd.Series:
+    """Beta de cada columna frente a ``referencia``: cov(r, r_ref) / var(r_ref) en sesiones comunes."""
+    r = rendimientos.to_numpy(float)
+    m = referencia.reindex(rendimientos.index).to_numpy(float)[:, None]
+    n, sx, sm, _, smm, sxm = (a[:, 0] for a in _sumas_pares(r, m))
+    with np.errstate(invalid="ignore", divide="ignore"):
+        beta = (n * sxm - sx * sm) / (n * smm - sm * sm)
+    return pd.Series(np.where(n >= min_observaciones, beta, np.nan), index=rendimientos.columns)
+
+
+def metricas_riesgo(rendimientos: pd.DataFrame, referencia: pd.Series = None) -> pd.DataFrame:
+    """Tabla por columna con rendimiento y volatilidad anualizados, máxima caída y beta."""
+    r = rendimientos.to_numpy(float)
+    validos = ~np.isnan(r)
+    n = validos.sum(axis=0)
+    r0 = np.where(validos, r, 0.0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        anual = np.where(n > 0, np.exp(np.log1p(r0).sum(axis=0) * SESIONES_ANIO / n) - 1.0, np.nan)
+        media = r0.sum(axis=0) / n
+        varianza = (((r0 - media) * validos) ** 2).sum(axis=0) / (n - 1)
+    volatilidad = np.where(n > 1, np.sqrt(varianza), np.nan)
+    metricas = pd.DataFrame({
+        "Rendimiento anualizado": anual,
+        "Volatilidad diaria": volatilidad,
+        "Volatilidad anualizada": volatilidad * np.sqrt(SESIONES_ANIO),
+        "Máxima caída": caidas(rendimientos).min().to_numpy(),
+    }, index=rendimientos.columns)
+    if referencia is not None:
+        metricas["Beta"] = betas(rendimientos, referencia)
+    return metricas
@@ -0,0 +1,229 @@
+# instrumentacion.py
+import json
+import os
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from functools import wraps
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Variables de entorno:
+#   INSTRUMENTACION_MEMORIA=1  mide la memoria pico por etapa con tracemalloc
+#   INSTRUMENTACION_JSONL=ruta añade cada etapa medida como una línea JSON
+#   METRICAS_PUERTO=9108       sirve /metrics en formato de texto de Prometheus
+#   METRICAS_HOST=0.0.0.0      interfaz del servidor de métricas (por defecto solo local)
+#   PRECARGA=1                 importa en segundo plano las dependencias pesadas
+RUTA_JSONL = os.environ.get("INSTRUMENTACION_JSONL")
+PREFIJO = "analizador"
+
+
+class Registro:
+    """Agregados por etapa de todo el proceso: llamadas, tiempo y memoria pico."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._etapas = {}
+        # Etapas abiertas con tracemalloc activo, de todos los hilos
+        self._marcos = []
+
+    def registrar(self, nombre, segundos, pico_bytes=None):
+        with self._lock:
+            etapa = self._etapas.setdefault(nombre, {
+                "llamadas": 0, "segundos_total": 0.0, "segundos_max": 0.0,
+                "segundos_ultimo": 0.0, "memoria_pico_bytes": None
+            })
+            etapa["llamadas"] += 1
+            etapa["segundos_total"] += segundos
+            etapa["segundos_max"] = max(etapa["segundos_max"], segundos)
+            etapa["segundos_ultimo"] = segundos
+            if pico_bytes is not None:
+                etapa["memoria_pico_bytes"] = max(etapa["memoria_pico_bytes"] or 0, pico_bytes)
+        if RUTA_JSONL:
+            evento = {"ts": time.time(), "etapa": nombre, "segundos": segundos,
+                      "memoria_pico_bytes": pico_bytes}
+            with self._lock, open(RUTA_JSONL, "a", encoding="utf-8") as f:
+                f.write(json.dumps(evento) + "\n")
+
+    def instantanea(self):
+        """Copia de los agregados: ``{etapa: {llamadas, segundos_total, ...}}``."""
+        with self._lock:
+            return {nombre: dict(valores) for nombre, valores in self._etapas.items()}
+
+    def reiniciar(self):
+        with self._lock:
+            self._etapas.clear()
+
+    @contextmanager
+    def span(self, nombre):
+        """Medir el bloque como la etapa ``nombre``.
+
+        Con tracemalloc activo también se mide la memoria pico del bloque,
+        incluidas las etapas anidadas del mismo hilo. tracemalloc tiene un
+        único pico para todo el proceso, así que una etapa que se solapa con
+        otra de otro hilo (varias sesiones a la vez) no registra memoria en
+        esa llamada: solo el tiempo.
+        """
+        if not tracemalloc.is_tracing():
+            inicio = time.perf_counter()
+            try:
+                yield
+            finally:
+                self.registrar(nombre, time.perf_counter() - inicio)
+            return
+
+        hilo = threading.get_ident()
+        with self._lock:
+            actual, pico = tracemalloc.get_traced_memory()
+            concurrente = any(m["hilo"] != hilo for m in self._marcos)
+            for m in self._marcos:
+                m["max"] = max(m["max"], pico)
+                m["fiable"] = m["fiable"] and not concurrente
+            tracemalloc.reset_peak()
+            marco = {"hilo": hilo, "base": actual, "max": actual, "fiable": not concurrente}
+            self._marcos.append(marco)
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            segundos = time.perf_counter() - inicio
+            with self._lock:
+                # Si tracemalloc se detuvo durante la etapa, el pico es 0
+                pico = tracemalloc.get_traced_memory()[1]
+                for m in self._marcos:
+                    m["max"] = max(m["max"], pico)
+                self._marcos = [m for m in self._marcos if m is not marco]
+            pico_bytes = max(marco["max"] - marco["base"], 0) if marco["fiable"] else None
+            self.registrar(nombre, segundos, pico_bytes)
+
+    def a_prometheus(self):
+        """Agregados en el formato de texto de exposición de Prometheus."""
+        etapas = self.instantanea()
+        metricas = [
+            ("llamadas_total", "counter", "Número de ejecuciones de la etapa", "llamadas"),
+            ("segundos_total", "counter", "Tiempo total de la etapa en segundos", "segundos_total"),
+            ("segundos_max", "gauge", "Duración máxima observada de la etapa", "segundos_max"),
+            ("memoria_pico_bytes", "gauge", "Memoria pico asignada durante la etapa", "memoria_pico_bytes"),
+        ]
+        lineas = []
+        for sufijo, tipo, ayuda, campo in metricas:
+            nombre = f"{PREFIJO}_etapa_{sufijo}"
+            valores = [(e, v[campo]) for e, v in sorted(etapas.items()) if v[campo] is not None]
+            if not valores:
+                continue
+            lineas.append(f"# HELP {nombre} {ayuda}")
+            lineas.append(f"# TYPE {nombre} {tipo}")
+            for etapa, valor in valores:
+                etiqueta = etapa.replace("\\", "\\\\").replace('"', '\\"')
+                lineas.append(f'{nombre}{{etapa="{etiqueta}"}} {valor}')
+        return "\n".join(lineas) + "\n"
+
+    def a_json_lines(self):
+        """Agregados como JSON lines, una etapa por línea."""
+        ts = time.time()
+        return "".join(
+            json.dumps({"ts": ts, "etapa": etapa, **valores}) + "\n"
+            for etapa, valores in sorted(self.instantanea().items())
+        )
+
+
+# Registro por defecto, compartido por todas las sesiones del proceso
+registro = Registro()
+span = registro.span
+
+
+def medido(nombre):
+    """Decorador que mide cada llamada a la función como la etapa ``nombre``."""
+    def decorador(funcion):
+        @wraps(funcion)
+        def envoltura(*args, **kwargs):
+            with registro.span(nombre):
+                return funcion(*args, **kwargs)
+        return envoltura
+    return decorador
+
+
+def activar_memoria(activa=True):
+    """Activar o desactivar la medición de memoria pico con tracemalloc."""
+    if activa and not tracemalloc.is_tracing():
+        tracemalloc.start()
+    elif not activa and tracemalloc.is_tracing():
+        tracemalloc.stop()
+
+
+_servidor = None
+
+
+def iniciar_servidor_metricas(puerto, host="127.0.0.1"):
+    """Servir ``/metrics`` (Prometheus) y ``/metrics.jsonl`` en un hilo en segundo plano.
+
+    Por defecto solo escucha en la interfaz local; para exponer las métricas
+    hay que indicar ``host`` explícitamente.
+    """
+    global _servidor
+    if _servidor is not None:
+        return _servidor
+
+    class Manejador(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path == "/metrics":
+                cuerpo, tipo = registro.a_prometheus(), "text/plain; version=0.0.4"
+            elif self.path == "/metrics.jsonl":
+                cuerpo, tipo = registro.a_json_lines(), "application/x-ndjson"
+            else:
+                self.send_error(404)
+                return
+            datos = cuerpo.encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", f"{tipo}; charset=utf-8")
+            self.send_header("Content-Length", str(len(datos)))
+            self.end_headers()
+            self.wfile.write(datos)
+
+        def log_message(self, *args):
+            pass
+
+    _servidor = ThreadingHTTPServer((host, int(puerto)), Manejador)
+    threading.Thread(target=_servidor.serve_forever, name="metricas", daemon=True).start()
+    return _servidor
+
+
+def configurar_desde_entorno():
+    """Aplicar las variables de entorno de instrumentación (idempotente)."""
+    if os.environ.get("INSTRUMENTACION_MEMORIA") == "1":
+        activar_memoria()
+    puerto = os.environ.get("METRICAS_PUERTO")
+    if puerto:
+        try:
+            iniciar_servidor_metricas(puerto, os.environ.get("METRICAS_HOST", "127.0.0.1"))
+        except OSError:
+            # Otro proceso ya sirve las métricas en ese puerto
+            pass
+    if os.environ.get("PRECARGA") == "1":
+        from precarga import iniciar_precarga
+
+        iniciar_precarga()
+
+
+def panel_depuracion():
+    """Mostrar en Streamlit los agregados por etapa y los botones de exportación."""
+    import pandas as pd
+    import streamlit as st
+
+    etapas = registro.instantanea()
+    if not etapas:
+        st.caption("Aún no hay etapas medidas.")
+        return
+    tabla = pd.DataFrame.from_dict(etapas, orient="index").sort_values("segundos_total", ascending=False)
+    tabla["ms_ultimo"] = tabla.pop("segundos_ultimo") * 1e3
+    tabla["ms_medio"] = tabla["segundos_total"] / tabla["llamadas"] * 1e3
+    tabla["ms_max"] = tabla.pop("segundos_max") * 1e3
+    tabla["memoria_pico_mb"] = tabla.pop("memoria_pico_bytes").astype(float) / 2**20
+    st.dataframe(tabla.drop(columns="segundos_total").round(2), use_container_width=True)
+    # tracemalloc es global al proceso: solo se activa con INSTRUMENTACION_MEMORIA,
+    # nunca desde una sesión mientras otras tienen etapas abiertas
+    if not tracemalloc.is_tracing():
+        st.caption("Memoria pico desactivada (INSTRUMENTACION_MEMORIA=1 para medirla).")
+    col1, col2 = st.columns(2)
+    col1.download_button("Prometheus", registro.a_prometheus, "metricas.prom", "text/plain")
+    col2.download_button("JSON lines", registro.a_json_lines, "metricas.jsonl", "application/x-ndjson")
@@ -0,0 +1,173 @@
+# lote_sentimiento.py
+"""Análisis de sentimiento por lotes, sin Streamlit.
+
+Reparte una lista de temas entre un pool de procesos, guarda los artículos
+analizados de cada tema en Parquet particionado por fecha y tema, y lleva un
+registro de control para que un lote interrumpido continúe donde se detuvo.
+
+Uso:
+    python lote_sentimiento.py --temas temas.txt --salida datos/lotes --procesos 4
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import date
+from urllib.parse import quote
+
+import feedparser
+
+from cache_sentimiento import RUTA_CACHE, SentimentCache
+from modelo_sentimiento import ModeloSentimiento
+from noticias import URL_GOOGLE_NEWS, create_sentiment_dataframe, fetch_news, score_articles
+
+ARCHIVO_CONTROL = "_control.jsonl"
+
+# Almacén de resultados y modelo de cada proceso trabajador (se abren en el inicializador)
+_cache = None
+_scorer = None
+
+
+def leer_temas(ruta):
+    """Leer un tema por línea, ignorando líneas vacías, comentarios y repetidos."""
+    with open(ruta, encoding="utf-8") as f:
+        temas = (linea.strip() for linea in f)
+        return list(dict.fromkeys(t for t in temas if t and not t.startswith("#")))
+
+
+def directorio_particion(salida, fecha, tema):
+    """Ruta de la partición estilo Hive ``fecha=AAAA-MM-DD/tema=<tema codificado>``."""
+    return os.path.join(salida, f"fecha={fecha}", f"tema={quote(tema, safe='')}")
+
+
+def leer_control(ruta):
+    """Estado más reciente de cada tema según el registro de control."""
+    estados = {}
+    if os.path.exists(ruta):
+        with open(ruta, encoding="utf-8") as f:
+            for linea in f:
+                try:
+                    registro = json.loads(linea)
+                except json.JSONDecodeError:
+                    # Línea a medias de un lote interrumpido
+                    continue
+                estados[registro["tema"]] = registro
+    return estados
+
+
+def _iniciar_trabajador(ruta_cache, ruta_modelo=None):
+    global _cache, _scorer
+    if ruta_cache:
+        _cache = SentimentCache(ruta_cache)
+    if ruta_modelo:
+        _scorer = ModeloSentimiento.cargar(ruta_modelo)
+
+
+def _parse_estricto(url):
+    """Como ``feedparser.parse``, pero un fallo de red o un XML ilegible sin entradas es un error."""
+    feed = feedparser.parse(url)
+    if not feed.entries and feed.get("bozo"):
+        raise feed.get("bozo_exception") or IOError(f"Feed ilegible: {url}")
+    return feed
+
+
+def procesar_tema(tema, salida, fecha, max_articulos, url_plantilla):
+    """Obtener, analizar y guardar los artículos de un tema; devuelve cuántos se guardaron."""
+    articulos = fetch_news(tema, max_articulos, url_plantilla, parse=_parse_estricto)
+    if not articulos:
+        return 0
+    # La fecha y el tema quedan en la ruta de la partición, no en el archivo
+    df = create_sentiment_dataframe(
+        score_articles(articulos, mode="lexicon", cache=_cache, scorer=_scorer)
+    )
+
+    directorio = directorio_particion(salida, fecha, tema)
+    os.makedirs(directorio, exist_ok=True)
+    ruta = os.path.join(directorio, "part-0.parquet")
+    # Escritura atómica: una interrupción nunca deja un Parquet a medias
+    df.to_parquet(ruta + ".tmp", index=False)
+    os.replace(ruta + ".tmp", ruta)
+    return len(df)
+
+
+def ejecutar_lote(temas, salida, fecha=None, procesos=None, max_articulos=100,
+                  url_plantilla=URL_GOOGLE_NEWS, ruta_cache=RUTA_CACHE, reintentar_fallidos=True,
+                  informar=print, ruta_modelo=None):
+    """Procesar los temas pendientes del lote de ``fecha``; devuelve el resumen del lote."""
+    fecha = fecha or date.today().isoformat()
+    os.makedirs(os.path.join(salida, f"fecha={fecha}"), exist_ok=True)
+    ruta_control = os.path.join(salida, f"fecha={fecha}", ARCHIVO_CONTROL)
+    estados = leer_control(ruta_control)
+
+    terminados = {"ok"} if reintentar_fallidos else {"ok", "error"}
+    pendientes = [t for t in temas if estados.get(t, {}).get("estado") not in terminados]
+    resumen = {"fecha": fecha, "total": len(temas), "omitidos": len(temas) - len(pendientes),
+               "ok": 0, "error": 0, "articulos": 0}
+    if not pendientes:
+        return resumen
+
+    with open(ruta_control, "a", encoding="utf-8") as control, ProcessPoolExecutor(
+        max_workers=procesos, initializer=_iniciar_trabajador, initargs=(ruta_cache, ruta_modelo)
+    ) as executor:
+        futuros = {
+            executor.submit(procesar_tema, tema, salida, fecha, max_articulos, url_plantilla): tema
+            for tema in pendientes
+        }
+        try:
+            for futuro in as_completed(futuros):
+                tema = futuros[futuro]
+                registro = {"tema": tema, "ts": time.time()}
+                try:
+                    registro.update(estado="ok", articulos=futuro.result())
+                    resumen["articulos"] += registro["articulos"]
+                except Exception as e:
+                    registro.update(estado="error", error=f"{type(e).__name__}: {e}")
+                resumen[registro["estado"]] += 1
+                # El registro se escribe solo cuando el Parquet ya está en su sitio
+                control.write(json.dumps(registro, ensure_ascii=False) + "\n")
+                control.flush()
+                informar(f"[{resumen['ok'] + resumen['error']}/{len(pendientes)}] "
+                         f"{tema}: {registro['estado']} ({registro.get('articulos', registro.get('error'))})")
+        except KeyboardInterrupt:
+            executor.shutdown(wait=False, cancel_futures=True)
+            raise
+    return resumen
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--temas", required=True, help="Archivo de texto con un tema por línea")
+    parser.add_argument("--salida", required=True, help="Directorio raíz del Parquet particionado")
+    parser.add_argument("--fecha", default=None,
+                        help="Partición del lote (AAAA-MM-DD); por defecto hoy. Repetirla reanuda el lote")
+    parser.add_argument("--procesos", type=int, default=os.cpu_count())
+    parser.add_argument("--max-articulos", type=int, default=100)
+    parser.add_argument("--url-plantilla", default=URL_GOOGLE_NEWS,
+                        help="Plantilla del feed con {topic}, p. ej. un servidor local de pruebas")
+    parser.add_argument("--cache", default=RUTA_CACHE,
+                        help="Almacén SQLite de resultados compartido; vacío para desactivarlo")
+    parser.add_argument("--modelo", default=None,
+                        help="Modelo entrenado con modelo_sentimiento.py; por defecto el léxico de TextBlob")
+    parser.add_argument("--no-reintentar", action="store_true",
+                        help="No volver a intentar los temas que fallaron en una ejecución anterior")
+    args = parser.parse_args(argv)
+
+    temas = leer_temas(args.temas)
+    try:
+        resumen = ejecutar_lote(
+            temas, args.salida, args.fecha, args.procesos, args.max_articulos,
+            args.url_plantilla, args.cache or None, not args.no_reintentar,
+            ruta_modelo=args.modelo
+        )
+    except KeyboardInterrupt:
+        print("Lote interrumpido; vuelve a ejecutarlo con la misma --fecha para continuar.",
+              file=sys.stderr)
+        return 130
+    print(json.dumps(resumen, ensure_ascii=False))
+    return 1 if resumen["error"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
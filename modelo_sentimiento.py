@@ -0,0 +1,178 @@
+# modelo_sentimiento.py
+"""Modelo de sentimiento entrenado: hashing + TF-IDF + Naive Bayes multinomial.
+
+Entrenamiento sin conexión a partir de un CSV etiquetado local:
+    python modelo_sentimiento.py etiquetado.csv --salida modelos/sentimiento_nb.npz
+
+El CSV necesita una columna de texto y otra de etiqueta (positivo, neutro,
+negativo; o 1, 0, -1). El modelo se guarda como arreglos NumPy, sin pickle.
+"""
+import argparse
+import hashlib
+import io
+import json
+import os
+import sys
+
+import numpy as np
+
+# Ruta por defecto del modelo entrenado
+RUTA_MODELO = os.environ.get(
+    "MODELO_SENTIMIENTO",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "modelos", "sentimiento_nb.npz")
+)
+
+# El vocabulario se reparte en un número fijo de columnas: la memoria del
+# modelo no depende del tamaño del corpus (2^18 x 3 clases en float32 = 3 MB)
+N_CARACTERISTICAS = 2**18
+CLASES = ("Negativo", "Neutro", "Positivo")
+_ETIQUETAS = {
+    "negativo": "Negativo", "negative": "Negativo", "neg": "Negativo", "-1": "Negativo",
+    "neutro": "Neutro", "neutral": "Neutro", "neu": "Neutro", "0": "Neutro",
+    "positivo": "Positivo", "positive": "Positivo", "pos": "Positivo", "1": "Positivo",
+}
+
+
+def _vectorizador(n_features=N_CARACTERISTICAS, ngram_range=(1, 2)):
+    """Conteos de unigramas y bigramas sin estado: nada que ajustar ni guardar."""
+    from sklearn.feature_extraction.text import HashingVectorizer
+
+    return HashingVectorizer(
+        n_features=n_features,
+        ngram_range=tuple(ngram_range),
+        strip_accents="unicode",
+        alternate_sign=False,
+        norm=None,
+        dtype=np.float32,
+    )
+
+
+class ModeloSentimiento:
+    """Puntuador con un modelo lineal entrenado, para ``analyze_batch(scorer=...)``.
+
+    La idf del TF-IDF se incorpora a los pesos del Naive Bayes, de modo que
+    un lote completo se puntúa con un solo producto de la matriz dispersa de
+    conteos ``(textos, características)`` por los pesos ``(características,
+    clases)``, más la norma L2 de cada fila. La polaridad es
+    ``P(Positivo) - P(Negativo)`` y la subjetividad ``1 - P(Neutro)``.
+    """
+
+    name = "modelo"
+
+    def __init__(self, pesos, idf2, prior, clases, parametros, version):
+        self.pesos = pesos
+        self.idf2 = idf2
+        self.prior = prior
+        self.clases = list(clases)
+        self.parametros = parametros
+        self.version = version
+        self._vectorizer = _vectorizador(**parametros)
+
+    @classmethod
+    def cargar(cls, ruta=RUTA_MODELO):
+        with open(ruta, "rb") as f:
+            contenido = f.read()
+        datos = np.load(io.BytesIO(contenido), allow_pickle=False)
+        version = f"nb-{hashlib.sha1(contenido).hexdigest()[:12]}"
+        return cls(
+            datos["pesos"], datos["idf2"], datos["prior"], datos["clases"].tolist(),
+            json.loads(str(datos["parametros"])), version
+        )
+
+    def guardar(self, ruta):
+        os.makedirs(os.path.dirname(os.path.abspath(ruta)), exist_ok=True)
+        with open(ruta, "wb") as f:
+            np.savez_compressed(
+                f, pesos=self.pesos, idf2=self.idf2, prior=self.prior,
+                clases=np.array(self.clases), parametros=json.dumps(self.parametros)
+            )
+
+    def predict_proba(self, texts):
+        """Probabilidad de cada clase para todos los textos, en una sola pasada."""
+        conteos = self._vectorizer.transform(texts)
+        normas = np.sqrt(conteos.multiply(conteos) @ self.idf2)
+        normas[normas == 0] = 1.0
+        log_verosimilitud = (conteos @ self.pesos) / normas[:, None] + self.prior
+        log_verosimilitud -= log_verosimilitud.max(axis=1, keepdims=True)
+        probabilidades = np.exp(log_verosimilitud)
+        return probabilidades / probabilidades.sum(axis=1, keepdims=True)
+
+    def score(self, texts):
+        """Polaridad y subjetividad de cada texto, como ``analisis_sentimiento._score_texts``."""
+        if not len(texts):
+            return np.zeros(0), np.zeros(0)
+        p = self.predict_proba(texts).astype(np.float64)
+        columna = {clase: i for i, clase in enumerate(self.clases)}
+        negativo = p[:, columna["Negativo"]] if "Negativo" in columna else 0.0
+        positivo = p[:, columna["Positivo"]] if "Positivo" in columna else 0.0
+        neutro = p[:, columna["Neutro"]] if "Neutro" in columna else np.zeros(len(texts))
+        return positivo - negativo, 1.0 - neutro
+
+
+def entrenar(textos, etiquetas, alpha=0.1, n_features=N_CARACTERISTICAS, ngram_range=(1, 2)):
+    """Ajustar TF-IDF + ``MultinomialNB`` y devolver el ``ModeloSentimiento`` equivalente."""
+    from sklearn.feature_extraction.text import TfidfTransformer
+    from sklearn.naive_bayes import MultinomialNB
+
+    parametros = {"n_features": n_features, "ngram_range": list(ngram_range)}
+    conteos = _vectorizador(**parametros).transform(textos)
+    tfidf = TfidfTransformer(norm="l2", sublinear_tf=False)
+    nb = MultinomialNB(alpha=alpha).fit(tfidf.fit_transform(conteos), etiquetas)
+
+    idf = tfidf.idf_.astype(np.float64)
+    pesos = (nb.feature_log_prob_.T * idf[:, None]).astype(np.float32)
+    return ModeloSentimiento(
+        pesos, (idf ** 2).astype(np.float32), nb.class_log_prior_.astype(np.float64),
+        nb.classes_.tolist(), parametros, version="nb-sin-guardar"
+    )
+
+
+def leer_etiquetado(ruta, columna_texto="text", columna_etiqueta="label"):
+    """Textos y etiquetas normalizadas (Negativo/Neutro/Positivo) de un CSV local."""
+    import pandas as pd
+
+    datos = pd.read_csv(ruta, usecols=[columna_texto, columna_etiqueta]).dropna()
+    etiquetas = datos[columna_etiqueta].astype(str).str.strip().str.lower().map(_ETIQUETAS)
+    desconocidas = datos.loc[etiquetas.isna(), columna_etiqueta].unique()
+    if len(desconocidas):
+        raise ValueError(f"Etiquetas desconocidas en {ruta}: {list(desconocidas)[:10]}")
+    return datos[columna_texto].astype(str).tolist(), etiquetas.tolist()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("datos", help="CSV etiquetado local")
+    parser.add_argument("--salida", default=RUTA_MODELO)
+    parser.add_argument("--columna-texto", default="text")
+    parser.add_argument("--columna-etiqueta", default="label")
+    parser.add_argument("--alpha", type=float, default=0.1, help="Suavizado de Laplace del Naive Bayes")
+    parser.add_argument("--prueba", type=float, default=0.2,
+                        help="Proporción reservada para medir la exactitud (0 para usar todo)")
+    parser.add_argument("--semilla", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    textos, etiquetas = leer_etiquetado(args.datos, args.columna_texto, args.columna_etiqueta)
+    print(f"{len(textos)} textos: " + ", ".join(
+        f"{c} {etiquetas.count(c)}" for c in CLASES
+    ), file=sys.stderr)
+
+    if args.prueba > 0:
+        orden = np.random.default_rng(args.semilla).permutation(len(textos))
+        corte = int(len(textos) * (1 - args.prueba))
+        entrenamiento, prueba = orden[:corte], orden[corte:]
+        modelo = entrenar([textos[i] for i in entrenamiento], [etiquetas[i] for i in entrenamiento],
+                          alpha=args.alpha)
+        probabilidades = modelo.predict_proba([textos[i] for i in prueba])
+        predichas = np.array(modelo.clases)[probabilidades.argmax(axis=1)]
+        exactitud = float(np.mean(predichas == np.array([etiquetas[i] for i in prueba])))
+        print(f"Exactitud en {len(prueba)} textos reservados: {exactitud:.3f}", file=sys.stderr)
+
+    modelo = entrenar(textos, etiquetas, alpha=args.alpha)
+    modelo.guardar(args.salida)
+    print(f"Modelo guardado en {args.salida} ({ModeloSentimiento.cargar(args.salida).version})",
+          file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
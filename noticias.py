@@ -0,0 +1,233 @@
+# noticias.py
+import html
+import re
+from concurrent.futures import ThreadPoolExecutor
+from html.entities import html5
+from itertools import islice
+from urllib.parse import quote
+
+import pandas as pd
+
+from analisis_sentimiento import analyze_batch
+from instrumentacion import span
+from tendencias import parse_published
+
+# Plantilla de búsqueda de Google News; se puede sustituir por un servidor local
+URL_GOOGLE_NEWS = "https://news.google.com/rss/search?q={topic}"
+
+# Descargas simultáneas por defecto al buscar varios temas
+MAX_CONCURRENCIA = 8
+
+# Tamaño del primer bloque puntuado (pequeño para mostrar resultados pronto) y máximo
+PRIMER_BLOQUE = 20
+MAX_BLOQUE = 200
+
+# Ruta rápida para quitar etiquetas: etiquetas simples sin "<" ni ">" internos
+# y entidades bien formadas. Cualquier otra cosa pasa por BeautifulSoup.
+_RE_ETIQUETA = re.compile(r"</?[A-Za-z][^<>]*>")
+_RE_ENTIDAD = re.compile(r"&(#\d+|#[xX][0-9a-fA-F]+|[A-Za-z][A-Za-z0-9]*);")
+_RE_MARCADO_ESPECIAL = re.compile(r"<(?:!|\?|script|style|template|textarea)", re.IGNORECASE)
+# Tramo de texto entre etiquetas (o en un extremo) hecho solo de espacios
+# ASCII: BeautifulSoup lo reduce a un salto de línea si lo contiene o a un espacio
+_ESPACIOS_ASCII = " \t\n\r\f"
+_RE_ESPACIOS_ENTRE_ETIQUETAS = re.compile(r">[ \t\n\r\f]+<")
+_RE_ESPACIOS_INICIO = re.compile(r"^[ \t\n\r\f]+(?=<|$)")
+_RE_ESPACIOS_FIN = re.compile(r"(?<=>)[ \t\n\r\f]+$")
+# Entidades que son un espacio ASCII (&#32;, &Tab;...)
+_ENTIDADES_ESPACIO = {f"#{ord(c)}" for c in _ESPACIOS_ASCII} | {"Tab", "NewLine"}
+
+
+def build_feed_url(topic, url_template=URL_GOOGLE_NEWS):
+    """Construir la URL del feed RSS para un tema."""
+    return url_template.format(topic=quote(topic))
+
+
+def _entidades_seguras(text):
+    """Comprobar que todo "&" del texto abre una entidad completa y conocida."""
+    if "&" not in text:
+        return True
+    validas = 0
+    for m in _RE_ENTIDAD.finditer(text):
+        nombre = m.group(1)
+        if not nombre.startswith("#") and nombre + ";" not in html5:
+            return False
+        # Una entidad de espacio ("&#32;") podría formar un tramo solo de espacios
+        if nombre in _ENTIDADES_ESPACIO or nombre[:2] in ("#x", "#X") or nombre.startswith("#0"):
+            return False
+        validas += 1
+    return validas == text.count("&")
+
+
+def _colapsar(m):
+    return "\n" if "\n" in m.group() else " "
+
+
+def _colapsar_espacios(text):
+    """Reducir los tramos solo de espacios como BeautifulSoup, con las etiquetas aún en su sitio."""
+    if ">" in text:
+        text = _RE_ESPACIOS_ENTRE_ETIQUETAS.sub(lambda m: ">" + _colapsar(m) + "<", text)
+    if text[0] in _ESPACIOS_ASCII:
+        text = _RE_ESPACIOS_INICIO.sub(_colapsar, text)
+    if text and text[-1] in _ESPACIOS_ASCII:
+        text = _RE_ESPACIOS_FIN.sub(_colapsar, text)
+    return text
+
+
+def remove_html_tags(text):
+    """Eliminar etiquetas HTML de una cadena.
+
+    Usa expresiones regulares para el marcado simple de los resúmenes de
+    Google News y recurre a BeautifulSoup solo si el marcado es irregular.
+    """
+    if not text:
+        return ""
+    if not _RE_MARCADO_ESPECIAL.search(text) and _entidades_seguras(text):
+        sin_etiquetas = _RE_ETIQUETA.sub("", _colapsar_espacios(text))
+        if "<" not in sin_etiquetas and ">" not in sin_etiquetas:
+            return html.unescape(sin_etiquetas)
+    from bs4 import BeautifulSoup
+
+    return BeautifulSoup(text, "html.parser").get_text()
+
+
+# ------------------------ ETAPAS DEL FLUJO ------------------------
+def iter_feed_entries(topic, max_articles=100, url_template=URL_GOOGLE_NEWS, parse=None):
+    """Etapa de obtención: descargar el feed y producir sus entradas una a una."""
+    if parse is None:
+        import feedparser
+        parse = feedparser.parse
+    feed = parse(build_feed_url(topic, url_template))
+    yield from islice(feed.entries, max_articles)
+
+
+def entry_to_raw(entry):
+    """Extraer de una entrada del feed los campos que usa la aplicación, sin procesar."""
+    return {
+        'title': entry.title if 'title' in entry else '',
+        'summary': entry.summary if 'summary' in entry else '',
+        'link': entry.link if 'link' in entry else '',
+        'published': entry.published if 'published' in entry else ''
+    }
+
+
+def iter_articles(entries):
+    """Etapa de limpieza: quitar el HTML del resumen y descartar entradas sin título."""
+    for entry in entries:
+        # Las entradas de feedparser (FeedParserDict) traen muchos más campos
+        raw = entry if type(entry) is dict else entry_to_raw(entry)
+        if raw['title']:
+            yield {**raw, 'summary': remove_html_tags(raw['summary'])}
+
+
+def iter_chunks(items, first=PRIMER_BLOQUE, maximum=MAX_BLOQUE):
+    """Agrupar en bloques que crecen al doble hasta ``maximum``."""
+    items = iter(items)
+    size = first
+    while True:
+        chunk = list(islice(items, size))
+        if not chunk:
+            return
+        yield chunk
+        size = min(size * 2, maximum)
+
+
+def score_articles(articles, **kwargs):
+    """Etapa de puntuación: analizar un bloque de artículos con ``analyze_batch``."""
+    texts = [article['title'] + " " + article['summary'] for article in articles]
+    results = analyze_batch(texts, **kwargs)
+    return [
+        {
+            **article,
+            'sentiment': results['sentiment'][i],
+            'polarity': float(results['polarity'][i]),
+            'subjectivity': float(results['subjectivity'][i])
+        }
+        for i, article in enumerate(articles)
+    ]
+
+
+def stream_scored_articles(entries, first=PRIMER_BLOQUE, maximum=MAX_BLOQUE, **kwargs):
+    """Encadenar limpieza y puntuación, produciendo bloques de artículos analizados."""
+    for chunk in iter_chunks(entries, first, maximum):
+        with span("noticias.limpieza"):
+            articles = list(iter_articles(chunk))
+        if articles:
+            with span("noticias.puntuacion"):
+                scored = score_articles(articles, **kwargs)
+            yield scored
+
+
+def fetch_news(topic, max_articles=100, url_template=URL_GOOGLE_NEWS, parse=None):
+    """Obtener artículos de noticias basados en el tema proporcionado."""
+    return list(iter_articles(iter_feed_entries(topic, max_articles, url_template, parse)))
+
+
+def create_sentiment_dataframe(articles):
+    """Crear un DataFrame de pandas a partir de los artículos analizados."""
+    df = pd.DataFrame(articles)
+    
+    if 'published' in df.columns:
+        df['date'] = pd.Series(parse_published(df['published']), index=df.index).dt.date
+    
+    return df
+
+
+# ------------------------ VARIOS TEMAS ------------------------
+def _fetch_topic_entries(http, topic, max_articles, url_template, timeout):
+    """Descargar con el pool de conexiones y parsear el feed de un tema."""
+    import feedparser
+
+    response = http.request("GET", build_feed_url(topic, url_template), timeout=timeout)
+    if response.status != 200:
+        raise IOError(f"HTTP {response.status} al obtener el tema {topic!r}")
+    feed = feedparser.parse(response.data)
+    return [{**entry_to_raw(entry), 'topic': topic} for entry in feed.entries[:max_articles]]
+
+
+def fetch_entries_many(topics, max_articles=100, url_template=URL_GOOGLE_NEWS,
+                       max_concurrency=MAX_CONCURRENCIA, timeout=15, http=None, on_error=None):
+    """Obtener en paralelo las entradas de varios temas, sin enlaces repetidos.
+
+    Las descargas comparten un pool de conexiones HTTP limitado a
+    ``max_concurrency`` peticiones simultáneas. Las entradas se combinan en el
+    orden de los temas y cada enlace aparece una sola vez, asociado al primer
+    tema que lo devolvió. Los temas que fallan se omiten y se notifican a
+    ``on_error(tema, excepcion)``.
+    """
+    import urllib3
+
+    topics = list(dict.fromkeys(t.strip() for t in topics if t and t.strip()))
+    if not topics:
+        return []
+    max_concurrency = max(1, min(max_concurrency, len(topics)))
+    if http is None:
+        http = urllib3.PoolManager(maxsize=max_concurrency, block=True,
+                                   retries=urllib3.Retry(total=2, backoff_factor=0.5))
+
+    with ThreadPoolExecutor(max_workers=max_concurrency) as executor:
+        futures = [
+            executor.submit(_fetch_topic_entries, http, topic, max_articles, url_template, timeout)
+            for topic in topics
+        ]
+
+    merged, seen = [], set()
+    for topic, future in zip(topics, futures):
+        try:
+            entries = future.result()
+        except Exception as e:
+            if on_error is not None:
+                on_error(topic, e)
+            continue
+        for entry in entries:
+            key = entry['link'] or entry['title']
+            if key not in seen:
+                seen.add(key)
+                merged.append(entry)
+    return merged
+
+
+def fetch_news_many(topics, max_articles=100, url_template=URL_GOOGLE_NEWS,
+                    max_concurrency=MAX_CONCURRENCIA, **kwargs):
+    """Obtener artículos limpios de varios temas a la vez (ver ``fetch_entries_many``)."""
+    entries = fetch_entries_many(topics, max_articles, url_template, max_concurrency, **kwargs)
+    return list(iter_articles(entries))
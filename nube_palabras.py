@@ -0,0 +1,157 @@
+# nube_palabras.py
+import hashlib
+import io
+import re
+import sys
+from collections import Counter, defaultdict
+
+# Mismo tokenizador y filtros que WordCloud.process_text
+_RE_PALABRA = re.compile(r"\w[\w']*")
+
+# Puntuación mínima para que dos palabras seguidas cuenten como colocación
+# (``collocation_threshold`` de WordCloud por defecto)
+UMBRAL_COLOCACION = 30
+
+# Dimensiones de la nube en pantalla y escala de la exportación en alta resolución
+ANCHO, ALTO = 800, 400
+MAX_PALABRAS = 100
+ESCALA_EXPORTACION = 3
+
+
+def _stopwords():
+    from wordcloud import STOPWORDS
+
+    return {w.lower() for w in STOPWORDS}
+
+
+def _fusionar(variantes):
+    """Conteos por forma más común y forma de cada clave, como ``wordcloud.tokenization.process_tokens``.
+
+    Los plurales ("acciones" si también está "accione", "stocks" si está
+    "stock") se suman al singular y su clave apunta a la forma del singular.
+    """
+    fusionadas = {clave: Counter(formas) for clave, formas in variantes.items()}
+    plurales = {}
+    for clave in list(fusionadas):
+        if clave.endswith('s') and not clave.endswith('ss') and clave[:-1] in fusionadas:
+            singular = fusionadas[clave[:-1]]
+            for forma, conteo in fusionadas.pop(clave).items():
+                singular[forma[:-1]] += conteo
+            plurales[clave] = clave[:-1]
+    conteos, formas = {}, {}
+    for clave, variantes_clave in fusionadas.items():
+        forma = variantes_clave.most_common(1)[0][0]
+        conteos[forma] = sum(variantes_clave.values())
+        formas[clave] = forma
+    for plural, singular in plurales.items():
+        formas[plural] = formas[singular]
+    return conteos, formas
+
+
+class TokenFrequencies:
+    """Frecuencias de palabras actualizadas a medida que llegan artículos.
+
+    Da la misma tabla que ``WordCloud().process_text`` sobre todos los
+    textos unidos con espacios (sufijo "'s", números, palabras vacías,
+    plurales, forma de mayúsculas más común y colocaciones de dos palabras),
+    pero a partir de conteos acumulados de palabras y de pares de palabras
+    seguidas, de modo que la nube no vuelve a tokenizar todo el texto en
+    cada recarga.
+    """
+
+    def __init__(self):
+        self._variants = defaultdict(Counter)  # minúsculas -> {forma original: conteo}
+        self._bigrams = defaultdict(Counter)   # "palabra1 palabra2" en minúsculas -> {forma original: conteo}
+        self._previous = None                  # última palabra: los pares cruzan de un texto al siguiente
+        self._stopwords = _stopwords()
+        self._frequencies = None
+
+    def add_text(self, text):
+        previous = self._previous
+        for word in _RE_PALABRA.findall(text or ""):
+            if word.lower().endswith("'s"):
+                word = word[:-2]
+            if word.isdigit():
+                continue
+            lower = word.lower()
+            if lower in self._stopwords:
+                # Un par con una palabra vacía no es colocación
+                previous = None
+                continue
+            self._variants[lower][word] += 1
+            if previous is not None:
+                self._bigrams[f"{previous.lower()} {lower}"][f"{previous} {word}"] += 1
+            previous = word
+        self._previous = previous
+        self._frequencies = None
+
+    def add_articles(self, articles):
+        for article in articles:
+            self.add_text(article['title'] + " " + article['summary'])
+
+    def frequencies(self):
+        """Conteos por palabra (o colocación), con los plurales fusionados en el singular."""
+        if self._frequencies is not None:
+            return self._frequencies
+        from wordcloud.tokenization import score
+
+        unigrams, forms = _fusionar(self._variants)
+        bigrams, _ = _fusionar(self._bigrams)
+        n_words = sum(unigrams.values())
+        counts = dict(unigrams)
+        for bigram, count in bigrams.items():
+            word1, word2 = (forms[word.lower()] for word in bigram.split(" "))
+            if score(count, unigrams[word1], unigrams[word2], n_words) > UMBRAL_COLOCACION:
+                # Como WordCloud: las palabras de la colocación se descuentan de sus conteos
+                counts[word1] -= count
+                counts[word2] -= count
+                counts[bigram] = count
+        self._frequencies = {word: count for word, count in counts.items() if count > 0}
+        return self._frequencies
+
+    def fingerprint(self):
+        """Huella de la tabla de frecuencias; cambia solo si cambian los conteos."""
+        digest = hashlib.sha1()
+        for word, count in sorted(self.frequencies().items()):
+            digest.update(f"{word}\0{count}\n".encode("utf-8"))
+        return digest.hexdigest()
+
+    def nbytes(self):
+        """Tamaño aproximado en memoria de los conteos (para el presupuesto de la sesión)."""
+        total = 0
+        for table in (self._variants, self._bigrams):
+            total += sys.getsizeof(table)
+            for lower, variants in table.items():
+                total += sys.getsizeof(lower) + sys.getsizeof(variants)
+                total += sum(sys.getsizeof(word) for word in variants)
+        return total
+
+    def __bool__(self):
+        return bool(self._variants)
+
+
+def build_word_cloud(frequencies, scale=1):
+    """Generar una nube de palabras a partir de una tabla de frecuencias."""
+    if not frequencies:
+        return None
+    from wordcloud import WordCloud
+
+    return WordCloud(
+        width=ANCHO,
+        height=ALTO,
+        background_color='white',
+        max_words=MAX_PALABRAS,
+        scale=scale,
+        # Disposición fija: la nube en pantalla y la exportada coinciden
+        random_state=0
+    ).generate_from_frequencies(frequencies)
+
+
+def word_cloud_png(frequencies, scale=ESCALA_EXPORTACION):
+    """PNG de la nube de palabras en alta resolución, para descargar."""
+    wordcloud = build_word_cloud(frequencies, scale=scale)
+    if wordcloud is None:
+        return None
+    buf = io.BytesIO()
+    wordcloud.to_image().save(buf, format='PNG')
+    return buf.getvalue()
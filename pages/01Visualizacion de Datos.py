@@ -1,10 +1,26 @@
 import streamlit as st
 import pandas as pd
-import yfinance as yf
 import numpy as np
 
+from almacen_precios import AlmacenPrecios
+from exportacion import EXPORT_FORMATS, dataframe_fingerprint, export_dataframe
+from graficos_sentimiento import plot_correlation_matrix
+from indicadores import (
+    caidas,
+    calcular_rendimiento_diario,
+    cierres_cartera,
+    matriz_correlacion,
+    metricas_riesgo,
+    rendimientos_cartera,
+    valor_acumulado,
+    volatilidad_movil
+)
+from instrumentacion import configurar_desde_entorno, panel_depuracion, span
+from submuestreo import submuestrear
+
 # ------------------------ CONFIGURACIÓN DE PÁGINA ------------------------
 st.set_page_config(page_title="Javeriana Cali - App Financiera", layout="centered")
+configurar_desde_entorno()
 
 # ------------------------ ENCABEZADO INSTITUCIONAL ------------------------
 #st.image("https://upload.wikimedia.org/wikipedia/commons/thumb/f/f7/Logo_PUJ.svg/2560px-Logo_PUJ.svg.png", width=250)
@@ -22,19 +38,96 @@ opciones_empresas = {
     "Meta / Facebook (META)": "META"
 }
 
+# Referencia para la beta de la cartera (None: la propia cartera de pesos iguales)
+opciones_referencia = {
+    "Cartera (pesos iguales)": None,
+    "S&P 500 (^GSPC)": "^GSPC"
+}
+
 # ------------------------ SIDEBAR: PARÁMETROS ------------------------
 st.sidebar.header("Parámetros de descarga")
-empresa_nombre = st.sidebar.selectbox("Selecciona una empresa", list(opciones_empresas.keys()))
-ticker = opciones_empresas[empresa_nombre]
+modo = st.sidebar.radio("Modo", ["Una empresa", "Cartera"], horizontal=True)
+if modo == "Una empresa":
+    empresa_nombre = st.sidebar.selectbox("Selecciona una empresa", list(opciones_empresas.keys()))
+    ticker = opciones_empresas[empresa_nombre]
+else:
+    empresa_nombre = "la cartera"
+    empresas_cartera = st.sidebar.multiselect(
+        "Empresas de la cartera", list(opciones_empresas.keys()), default=list(opciones_empresas.keys())
+    )
+    referencia_nombre = st.sidebar.selectbox("Referencia para la beta", list(opciones_referencia.keys()))
+    ventana_volatilidad = st.sidebar.slider("Ventana de la volatilidad móvil (sesiones)", 5, 126, 21)
 
 fecha_inicio = st.sidebar.date_input("Fecha de inicio", pd.to_datetime("2020-01-01"))
 fecha_fin = st.sidebar.date_input("Fecha de fin", pd.to_datetime("today"))
 
 # ------------------------ FUNCIÓN PARA DESCARGAR DATOS ------------------------
+@st.cache_resource
+def obtener_almacen():
+    # Almacén local compartido: solo se descargan los rangos de fechas que falten
+    return AlmacenPrecios()
+
 def obtener_datos_empresa(ticker: str, fecha_inicio: str, fecha_fin: str):
-    data = yf.download(ticker, start=fecha_inicio, end=fecha_fin)
+    data = obtener_almacen().obtener(ticker, fecha_inicio, fecha_fin)
     return data
 
+@st.cache_data(max_entries=8)
+def exportar_datos(huella: str, formato: str, _datos):
+    # Solo se genera al pulsar la descarga, y una vez por datos y formato
+    with span("precios.exportacion"):
+        return export_dataframe(_datos, formato, index=True)
+
+# ------------------------ MODO CARTERA ------------------------
+def mostrar_cartera(tickers, referencia, fecha_inicio: str, fecha_fin: str, ventana: int):
+    """Descargar todos los tickers de una vez y mostrar sus métricas de riesgo conjuntas."""
+    if not tickers:
+        st.info("Selecciona al menos una empresa.")
+        return
+    with span("cartera.descarga"):
+        # Una sola descarga para todos los tickers (y la referencia) que falten
+        precios = obtener_almacen().obtener_varios(tickers + [referencia] * bool(referencia),
+                                                   fecha_inicio, fecha_fin)
+        cierres = cierres_cartera({t: precios[t] for t in tickers})
+    if cierres.empty:
+        st.warning("No se encontraron datos para el período seleccionado.")
+        return
+
+    with span("cartera.indicadores"):
+        rendimientos = rendimientos_cartera(cierres)
+        if referencia and not precios[referencia].empty:
+            rendimiento_referencia = precios[referencia]["Close"].pct_change(fill_method=None)
+        else:
+            rendimiento_referencia = rendimientos["Cartera"]
+        metricas = metricas_riesgo(rendimientos, rendimiento_referencia)
+        volatilidad = volatilidad_movil(rendimientos, ventana)
+        caida = caidas(rendimientos)
+        correlacion = matriz_correlacion(rendimientos.drop(columns="Cartera"))
+    if referencia and precios[referencia].empty:
+        st.caption("No hay precios de la referencia: la beta se calcula frente a la cartera.")
+
+    st.subheader("📈 Valor de 100 invertidos")
+    st.caption("La cartera reparte el capital a partes iguales y se rebalancea cada sesión.")
+    with span("cartera.graficos"):
+        st.line_chart(submuestrear(100 * valor_acumulado(rendimientos)))
+
+    st.subheader("📊 Métricas de riesgo")
+    porcentaje = st.column_config.NumberColumn(format="percent")
+    st.dataframe(metricas, column_config={
+        "Rendimiento anualizado": porcentaje,
+        "Volatilidad diaria": porcentaje,
+        "Volatilidad anualizada": porcentaje,
+        "Máxima caída": porcentaje,
+        "Beta": st.column_config.NumberColumn(format="%.2f"),
+    })
+
+    with span("cartera.graficos"):
+        st.subheader(f"🌪️ Volatilidad anualizada ({ventana} sesiones)")
+        st.line_chart(submuestrear(volatilidad.dropna(how="all")))
+        st.subheader("📉 Caída desde el máximo")
+        st.line_chart(submuestrear(caida))
+        if len(correlacion) > 1:
+            st.plotly_chart(plot_correlation_matrix(correlacion), use_container_width=True)
+
 # ------------------------ VALIDACIÓN Y DESCARGA ------------------------
 st.markdown(f"### Visualización de Precios Históricos de **{empresa_nombre}**")
 
@@ -56,18 +149,31 @@ Permite consultar, visualizar y descargar los precios históricos de acciones de
 
 if fecha_inicio >= fecha_fin:
     st.error("La fecha de inicio debe ser anterior a la fecha de fin.")
+elif modo == "Cartera":
+    st.write(f"### Precios desde **{fecha_inicio}** hasta **{fecha_fin}**")
+    mostrar_cartera([opciones_empresas[e] for e in empresas_cartera], opciones_referencia[referencia_nombre],
+                    str(fecha_inicio), str(fecha_fin), ventana_volatilidad)
 else:
     st.write(f"### Precios desde **{fecha_inicio}** hasta **{fecha_fin}**")
-    datos = obtener_datos_empresa(ticker, str(fecha_inicio), str(fecha_fin))
+    with span("precios.descarga"):
+        datos = obtener_datos_empresa(ticker, str(fecha_inicio), str(fecha_fin))
 
     if datos.empty:
         st.warning("No se encontraron datos para el período seleccionado.")
     else:
         st.subheader("📉 Precio de cierre")
-        st.line_chart(datos["Close"])
-
-        datos["Daily Return"] = datos["Close"].pct_change()
-        volatilidad = datos["Daily Return"].std()
+        with span("precios.grafico"):
+            # El gráfico recibe solo los puntos que se distinguen en pantalla;
+            # la tabla y el CSV siguen usando todos los datos
+            st.line_chart(submuestrear(datos["Close"]))
+
+        with span("precios.indicadores"):
+            datos, volatilidad = calcular_rendimiento_diario(datos)
+            maxima_caida = caidas(datos[["Daily Return"]]).iloc[:, 0].min()
+
+        col4, col5 = st.columns(2)
+        col4.metric("📈 Volatilidad Diaria", f"{volatilidad*100:.2f}%")
+        col5.metric("📉 Máxima Caída", f"{maxima_caida*100:.2f}%")
         
         #media=datos['Close'].mean()
         
@@ -93,17 +199,24 @@ else:
         
 
         st.subheader("📊 Tabla de datos")
-        st.dataframe(datos)
+        with span("precios.tabla"):
+            st.dataframe(datos)
 
 
         
 
         
 
-        csv = datos.to_csv().encode("utf-8")
+        formato = st.radio("Formato de descarga", list(EXPORT_FORMATS), horizontal=True)
+        extension, mime = EXPORT_FORMATS[formato]
         st.download_button(
-            label="📥 Descargar como CSV",
-            data=csv,
-            file_name=f"{ticker}_{fecha_inicio}_a_{fecha_fin}.csv",
-            mime="text/csv"
+            label=f"📥 Descargar como {formato}",
+            data=lambda: exportar_datos(dataframe_fingerprint(datos), formato, datos),
+            file_name=f"{ticker}_{fecha_inicio}_a_{fecha_fin}.{extension}",
+            mime=mime
         )
+
+# ------------------------ PANEL DE DEPURACIÓN ------------------------
+if st.sidebar.checkbox("Mostrar panel de depuración"):
+    with st.sidebar:
+        panel_depuracion()
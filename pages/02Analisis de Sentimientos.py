@@ -1,16 +1,27 @@
+import os
 import streamlit as st
-import feedparser
-from textblob import TextBlob
-from wordcloud import WordCloud
-import matplotlib.pyplot as plt
-import plotly.graph_objects as go
-from bs4 import BeautifulSoup
-from urllib.parse import quote
 import pandas as pd
-from concurrent.futures import ThreadPoolExecutor
 import time
-import plotly.express as px
-import io
+from analisis_sentimiento import TEXTBLOB
+from cache_sentimiento import SentimentCache
+from duplicados import collapse_near_duplicates
+from exportacion import EXPORT_FORMATS, dataframe_fingerprint, export_dataframe
+from instrumentacion import configurar_desde_entorno, panel_depuracion, span
+from modelo_sentimiento import RUTA_MODELO, ModeloSentimiento
+from graficos_sentimiento import (
+    plot_polarity_subjectivity,
+    plot_sentiment_distribution,
+    plot_sentiment_trend
+)
+from nube_palabras import TokenFrequencies, build_word_cloud, word_cloud_png
+from resultados_sesion import SessionResults, result_key
+from tendencias import FRECUENCIAS, SentimentRollups
+from noticias import (
+    entry_to_raw,
+    fetch_entries_many,
+    iter_feed_entries,
+    stream_scored_articles
+)
 
 # Configuración de la página
 st.set_page_config(
@@ -21,164 +32,119 @@ st.set_page_config(
 
 
 
+configurar_desde_entorno()
+
 # Inicializar variables de estado de sesión si no existen
-if 'articles' not in st.session_state:
-    st.session_state.articles = []
+if 'results' not in st.session_state:
+    # Única copia de los artículos analizados: columnar y con presupuesto de memoria
+    st.session_state.results = SessionResults()
 if 'last_topic' not in st.session_state:
     st.session_state.last_topic = ""
-if 'sentiment_df' not in st.session_state:
-    st.session_state.sentiment_df = None
 if 'progress' not in st.session_state:
     st.session_state.progress = 0
 
 # Cache para mejorar rendimiento
 @st.cache_data(ttl=3600)  # Cache por 1 hora
-def fetch_news(topic, max_articles=100):
-    """Obtener artículos de noticias basados en el tema proporcionado."""
-    encoded_topic = quote(topic)
-    url = f"https://news.google.com/rss/search?q={encoded_topic}"
-    
+def fetch_feed(topic, max_articles=100):
+    """Obtener las entradas del feed de noticias del tema, aún sin limpiar ni analizar."""
     try:
-        feed = feedparser.parse(url)
-        if not feed.entries:
-            return []
-            
-        articles = []
-        for entry in feed.entries[:max_articles]:
-            title = entry.title if 'title' in entry else ''
-            summary = remove_html_tags(entry.summary) if 'summary' in entry else ''
-            link = entry.link if 'link' in entry else ''
-            published = entry.published if 'published' in entry else ''
-            
-            if title:
-                articles.append({
-                    'title': title,
-                    'summary': summary,
-                    'link': link,
-                    'published': published
-                })
-        return articles
+        return [entry_to_raw(entry) for entry in iter_feed_entries(topic, max_articles)]
     except Exception as e:
         st.error(f"Error al obtener noticias: {e}")
         return []
 
-def remove_html_tags(text):
-    """Eliminar etiquetas HTML de una cadena usando BeautifulSoup."""
-    if text:
-        return BeautifulSoup(text, "html.parser").get_text()
-    return ""
+class PartialFeedError(Exception):
+    """Algunos temas fallaron; ``entries`` guarda las entradas de los demás."""
 
-def analyze_sentiment(text):
-    """Analizar el sentimiento del texto proporcionado."""
-    analysis = TextBlob(text)
-    polarity = analysis.sentiment.polarity
-    subjectivity = analysis.sentiment.subjectivity
-    
-    if polarity > 0.1:
-        sentiment = 'Positivo'
-    elif polarity < -0.1:
-        sentiment = 'Negativo'
-    else:
-        sentiment = 'Neutro'
-        
-    return {
-        'sentiment': sentiment,
-        'polarity': polarity,
-        'subjectivity': subjectivity
-    }
+    def __init__(self, entries, failed):
+        super().__init__("; ".join(failed))
+        self.entries = entries
 
-def process_article(article, idx, total):
-    """Procesar un artículo individual para análisis de sentimiento."""
-    full_text = article['title'] + " " + article['summary']
-    sentiment_data = analyze_sentiment(full_text)
-    article.update(sentiment_data)
-    
-    # Actualizar progreso
-    st.session_state.progress = (idx + 1) / total
-    
-    return article
+@st.cache_data(ttl=3600, show_spinner=False)  # Cache por 1 hora
+def fetch_feed_many_cached(topics, max_articles=100):
+    failed = []
+    entries = fetch_entries_many(
+        topics, max_articles, on_error=lambda topic, e: failed.append(f"{topic} ({e})")
+    )
+    if failed:
+        # Las excepciones no se guardan en la caché: se reintenta en la siguiente búsqueda
+        raise PartialFeedError(entries, failed)
+    return entries
 
-def create_sentiment_dataframe(articles):
-    """Crear un DataFrame de pandas a partir de los artículos analizados."""
-    df = pd.DataFrame(articles)
-    
-    if 'published' in df.columns:
-        df['date'] = pd.to_datetime(df['published'], errors='coerce').dt.date
-    
-    return df
+def fetch_feed_many(topics, max_articles=100):
+    """Obtener en paralelo las entradas de una lista de temas, sin enlaces repetidos.
 
-def generate_word_cloud(text):
-    """Generar una nube de palabras a partir del texto proporcionado."""
-    if not text.strip():
-        return None
-        
-    wordcloud = WordCloud(
-        width=800, 
-        height=400, 
-        background_color='white',
-        max_words=100
-    ).generate(text)
-    
-    return wordcloud
+    Solo se guarda en caché un resultado sin temas fallidos.
+    """
+    try:
+        return fetch_feed_many_cached(topics, max_articles)
+    except PartialFeedError as e:
+        st.warning(f"No se pudieron obtener algunos temas: {e}")
+        return e.entries
 
-def plot_sentiment_distribution(df):
-    """Graficar la distribución del sentimiento."""
-    sentiment_counts = df['sentiment'].value_counts().reset_index()
-    sentiment_counts.columns = ['Sentimiento', 'Cantidad']
-    
-    fig = px.pie(
-        sentiment_counts, 
-        values='Cantidad', 
-        names='Sentimiento', 
-        title='Distribución del Sentimiento'
-    )
-    return fig
+@st.cache_resource
+def get_sentiment_cache():
+    """Almacén persistente de resultados, compartido por todas las sesiones."""
+    return SentimentCache()
 
-def plot_sentiment_over_time(df):
-    """Graficar sentimiento a lo largo del tiempo si hay datos disponibles."""
-    if 'date' not in df.columns or df['date'].isna().all():
-        return None
-        
-    sentiment_by_date = pd.crosstab(df['date'], df['sentiment'])
-    sentiment_by_date = sentiment_by_date.reset_index()
-    
-    sentiment_by_date_long = pd.melt(
-        sentiment_by_date, 
-        id_vars=['date'], 
-        value_vars=['Positivo', 'Neutro', 'Negativo'],
-        var_name='Sentimiento',
-        value_name='Cantidad'
-    )
-    
-    fig = px.line(
-        sentiment_by_date_long, 
-        x='date', 
-        y='Cantidad', 
-        color='Sentimiento',
-        title='Tendencias del Sentimiento en el Tiempo'
-    )
-    return fig
+@st.cache_resource(max_entries=1)
+def get_trained_model(path, modified):
+    """Modelo entrenado, cargado una vez por proceso (y de nuevo si cambia el archivo).
 
-def plot_polarity_subjectivity(df):
-    """Crear un diagrama de dispersión de polaridad vs subjetividad."""
-    fig = px.scatter(
-        df, 
-        x='polarity', 
-        y='subjectivity', 
-        color='sentiment',
-        hover_data=['title'],
-        title='Polaridad vs Subjetividad'
-    )
-    
-    fig.update_layout(
-        xaxis_title="Polaridad (Negativo ⟷ Positivo)",
-        yaxis_title="Subjetividad (Hecho ⟷ Opinión)"
-    )
-    
-    return fig
+    Solo se conserva el último: al reentrenar, el modelo anterior se libera.
+    """
+    return ModeloSentimiento.cargar(path)
+
+def process_articles(entries, progress_bar, live_table, word_freqs, rollups, scorer=None):
+    """Limpiar y analizar las entradas por bloques, mostrando cada bloque al terminar."""
+    processed = []
+    for chunk in stream_scored_articles(entries, cache=get_sentiment_cache(), scorer=scorer):
+        processed.extend(chunk)
+        word_freqs.add_articles(chunk)
+        rollups.add_articles(chunk)
+        st.session_state.progress = min(len(processed) / len(entries), 1.0)
+        progress_bar.progress(st.session_state.progress)
+        live_table.dataframe(
+            pd.DataFrame(processed, columns=['title', 'sentiment', 'polarity']),
+            use_container_width=True,
+            hide_index=True
+        )
+    return processed
+
+@st.cache_data(max_entries=32)
+def render_word_cloud(fingerprint, _frequencies):
+    """Imagen de la nube de palabras, cacheada por la huella de las frecuencias."""
+    wordcloud = build_word_cloud(_frequencies)
+    return None if wordcloud is None else wordcloud.to_array()
+
+@st.cache_data(max_entries=8)
+def export_word_cloud_png(fingerprint, _frequencies):
+    """PNG en alta resolución de la nube; solo se genera al pulsar la descarga."""
+    return word_cloud_png(_frequencies)
+
+@st.cache_data(max_entries=8)
+def export_data(fingerprint, fmt, _df):
+    """Archivo de los artículos en ``fmt``; solo se genera al pulsar la descarga."""
+    with span("exportacion.archivo"):
+        return export_dataframe(_df, fmt)
+
+def filter_articles(df, labels=None, polarity_range=None, query=""):
+    """Filtrar los artículos con máscaras vectorizadas sobre el DataFrame."""
+    mask = pd.Series(True, index=df.index)
+    if labels is not None:
+        mask &= df['sentiment'].isin(labels)
+    if polarity_range is not None:
+        mask &= df['polarity'].between(*polarity_range)
+    query = query.strip()
+    if query:
+        mask &= (
+            df['title'].str.contains(query, case=False, regex=False, na=False)
+            | df['summary'].str.contains(query, case=False, regex=False, na=False)
+        )
+    return df[mask]
 
 def display_article_list(df):
-    """Mostrar la lista de artículos con su sentimiento."""
+    """Mostrar la lista de artículos con su sentimiento, filtrada y paginada."""
     st.subheader("Artículos de Noticias")
     
     sentiment_badges = {
@@ -187,12 +153,52 @@ def display_article_list(df):
         'Negativo': '🔴 Negativo'
     }
     
-    for i, row in df.iterrows():
-        with st.expander(f"{row['title']} [{sentiment_badges[row['sentiment']]}]"):
-            st.markdown(f"**Resumen:** {row['summary']}")
-            st.markdown(f"**Polaridad:** {row['polarity']:.2f} | **Subjetividad:** {row['subjectivity']:.2f}")
-            if row['link']:
-                st.markdown(f"[Leer artículo completo]({row['link']})")
+    filter_col1, filter_col2, filter_col3 = st.columns([2, 2, 3])
+    with filter_col1:
+        labels = st.multiselect(
+            "Sentimiento:", list(sentiment_badges), default=list(sentiment_badges),
+            key='articles_labels'
+        )
+    with filter_col2:
+        polarity_range = st.slider(
+            "Polaridad:", min_value=-1.0, max_value=1.0, value=(-1.0, 1.0), step=0.05,
+            key='articles_polarity'
+        )
+    with filter_col3:
+        query = st.text_input("Buscar en título o resumen:", key='articles_query')
+    
+    filtered = filter_articles(df, labels, polarity_range, query)
+    if filtered.empty:
+        st.info("Ningún artículo coincide con los filtros.")
+        return
+    
+    size_col, page_col, count_col = st.columns([1, 1, 2])
+    with size_col:
+        page_size = st.selectbox("Artículos por página:", [10, 20, 50, 100], index=1,
+                                 key='articles_page_size')
+    total_pages = (len(filtered) - 1) // page_size + 1
+    # El valor inicial se fija solo en el estado de sesión; al estrechar los
+    # filtros la página guardada puede quedar fuera de rango
+    if 'articles_page' not in st.session_state:
+        st.session_state.articles_page = 1
+    elif st.session_state.articles_page > total_pages:
+        st.session_state.articles_page = total_pages
+    with page_col:
+        page = st.number_input("Página:", min_value=1, max_value=total_pages, key='articles_page')
+    with count_col:
+        st.caption(f"{len(filtered)} de {len(df)} artículos · página {page} de {total_pages}")
+    
+    # Solo se construyen los elementos de la página visible
+    start = (page - 1) * page_size
+    for row in filtered.iloc[start:start + page_size].itertuples(index=False):
+        with st.expander(f"{row.title} [{sentiment_badges[row.sentiment]}]"):
+            st.markdown(f"**Resumen:** {row.summary}")
+            st.markdown(f"**Polaridad:** {row.polarity:.2f} | **Subjetividad:** {row.subjectivity:.2f}")
+            group_size = getattr(row, 'group_size', 1)
+            if group_size > 1:
+                st.caption(f"Publicada también por otros {group_size - 1} medios.")
+            if row.link:
+                st.markdown(f"[Leer artículo completo]({row.link})")
 
 def main():
     """Función principal para la app de Streamlit."""
@@ -201,7 +207,18 @@ def main():
     with st.sidebar:
         st.title("Configuración")
         
-        topic = st.text_input("Buscar Tema:", value="tecnología")
+        search_mode = st.radio("Modo de búsqueda:", ["Un tema", "Lista de temas"], horizontal=True)
+        if search_mode == "Un tema":
+            topic = st.text_input("Buscar Tema:", value="tecnología")
+            topics = None
+        else:
+            topics_text = st.text_area(
+                "Temas (uno por línea):",
+                value="tecnología\neconomía\npetróleo",
+                help="Se buscan en paralelo y se eliminan los artículos repetidos"
+            )
+            topics = tuple(dict.fromkeys(t.strip() for t in topics_text.splitlines() if t.strip()))
+            topic = ", ".join(topics)
         max_articles = st.slider("Máximo de Artículos:", min_value=10, max_value=1000, value=100)
         
         with st.expander("Opciones Avanzadas"):
@@ -212,6 +229,20 @@ def main():
                 value=0.1,
                 help="Umbral para clasificar sentimiento como positivo/negativo"
             )
+            scorer = TEXTBLOB
+            if os.path.exists(RUTA_MODELO):
+                backend = st.radio(
+                    "Modelo de sentimiento:",
+                    ["TextBlob (inglés)", "Modelo entrenado"],
+                    help="El modelo entrenado se genera con modelo_sentimiento.py a partir de un CSV etiquetado"
+                )
+                if backend == "Modelo entrenado":
+                    scorer = get_trained_model(RUTA_MODELO, os.path.getmtime(RUTA_MODELO))
+            group_duplicates = st.checkbox(
+                "Agrupar noticias casi duplicadas",
+                value=True,
+                help="La misma noticia publicada por varios medios se analiza una sola vez"
+            )
         
         st.markdown("---")
         st.subheader("Acerca de")
@@ -229,6 +260,9 @@ def main():
         
         st.markdown("---")
         st.caption("© 2025 Analizador de Noticias - Universidad Javeriana Cali")
+        
+        show_debug = st.checkbox("Mostrar panel de depuración")
+        debug_container = st.container()
     
     col1, col2 = st.columns([2, 1])
     
@@ -237,36 +271,58 @@ def main():
         
         analyze_button = st.button("Analizar Noticias", use_container_width=True)
         
-        if analyze_button or (topic and topic != st.session_state.last_topic):
-            with st.spinner("Obteniendo artículos de noticias..."):
-                articles = fetch_news(topic, max_articles)
+        # Cada combinación de modelo, máximo de artículos y agrupación guarda su propio resultado
+        analysis_key = result_key(topic, scorer.name, max_articles, group_duplicates)
+        
+        # Volver a un tema ya analizado reutiliza su resultado guardado
+        if (not analyze_button and topic and analysis_key != st.session_state.last_topic
+                and st.session_state.results.get(analysis_key) is not None):
+            st.session_state.last_topic = analysis_key
+        
+        if analyze_button or (topic and analysis_key != st.session_state.last_topic):
+            with st.spinner("Obteniendo artículos de noticias..."), span("noticias.obtencion"):
+                if topics is None:
+                    entries = fetch_feed(topic, max_articles)
+                else:
+                    entries = fetch_feed_many(topics, max_articles)
                 
-            if not articles:
-                st.warning("No se encontraron artículos. Intenta con otro tema.")
-            else:
+            if entries and group_duplicates:
+                with span("noticias.duplicados"):
+                    entries = collapse_near_duplicates(entries)
+            
+            if entries:
                 st.session_state.progress = 0
                 progress_bar = st.progress(0)
+                live_table = st.empty()
                 
-                total_articles = len(articles)
-                with ThreadPoolExecutor(max_workers=min(8, total_articles)) as executor:
-                    processed_articles = list(executor.map(
-                        lambda x: process_article(x[1], x[0], total_articles),
-                        enumerate(articles)
-                    ))
+                word_freqs = TokenFrequencies()
+                rollups = SentimentRollups()
+                processed_articles = process_articles(entries, progress_bar, live_table, word_freqs,
+                                                      rollups, scorer)
                 
                 progress_bar.progress(1.0)
                 time.sleep(0.5)
                 progress_bar.empty()
-                
-                st.session_state.articles = processed_articles
-                st.session_state.last_topic = topic
-                st.session_state.sentiment_df = create_sentiment_dataframe(processed_articles)
+                live_table.empty()
+            
+            if not entries or not processed_articles:
+                st.warning("No se encontraron artículos. Intenta con otro tema.")
+            else:
+                with span("noticias.dataframe"):
+                    st.session_state.results.put(analysis_key, processed_articles, word_freqs, rollups)
+                st.session_state.last_topic = analysis_key
                 
                 st.success(f"¡{len(processed_articles)} artículos analizados!")
+                total_entries = sum(a.get('group_size', 1) for a in processed_articles)
+                if total_entries > len(processed_articles):
+                    st.caption(f"{total_entries} noticias agrupadas en {len(processed_articles)} "
+                               "artículos distintos.")
+    
+    result = st.session_state.results.current
     
     with col2:
-        if st.session_state.sentiment_df is not None and not st.session_state.sentiment_df.empty:
-            df = st.session_state.sentiment_df
+        if result is not None and not result.df.empty:
+            df = result.df
             total = len(df)
             positive = sum(df['sentiment'] == 'Positivo')
             negative = sum(df['sentiment'] == 'Negativo')
@@ -278,41 +334,41 @@ def main():
             #metrics_col2.metric("Neutro", f"{neutral} ({neutral/total*100:.1f}%)")
             #metrics_col3.metric("Negativo", f"{negative} ({negative/total*100:.1f}%)")
             st.image("Image/Escudo_Javeriana.jpg",  width=100)
-    if st.session_state.sentiment_df is not None and not st.session_state.sentiment_df.empty:
-        df = st.session_state.sentiment_df
+    if result is not None and not result.df.empty:
+        df = result.df
         
         tab1, tab2, tab3, tab4 = st.tabs(["Artículos", "Análisis de Sentimiento", "Nube de Palabras", "Tendencias"])
         
-        with tab1:
+        with tab1, span("vista.articulos"):
             display_article_list(df)
         
         with tab2:
+            count_duplicates = False
+            if 'group_size' in df.columns and (df['group_size'] > 1).any():
+                count_duplicates = st.toggle(
+                    "Contar también las noticias repetidas",
+                    help="Cada artículo cuenta tantas veces como medios publicaron la noticia"
+                )
             pie_col, scatter_col = st.columns(2)
-            with pie_col:
-                fig_pie = plot_sentiment_distribution(df)
+            with pie_col, span("graficos.distribucion"):
+                fig_pie = plot_sentiment_distribution(df, count_duplicates)
                 st.plotly_chart(fig_pie, use_container_width=True)
-            with scatter_col:
+            with scatter_col, span("graficos.dispersion"):
                 fig_scatter = plot_polarity_subjectivity(df)
                 st.plotly_chart(fig_scatter, use_container_width=True)
         
-        with tab3:
-            all_text = " ".join([article['title'] + " " + article['summary'] for article in st.session_state.articles])
-            wordcloud = generate_word_cloud(all_text)
+        with tab3, span("nube.render"):
+            word_freqs = result.word_freqs
+            fingerprint = word_freqs.fingerprint()
+            image = render_word_cloud(fingerprint, word_freqs.frequencies())
             
-            if wordcloud:
+            if image is not None:
                 st.subheader("Nube de Palabras")
-                fig, ax = plt.subplots(figsize=(10, 5))
-                ax.imshow(wordcloud, interpolation='bilinear')
-                ax.axis('off')
-                st.pyplot(fig)
-                
-                buf = io.BytesIO()
-                fig.savefig(buf, format='png', dpi=300, bbox_inches='tight')
-                buf.seek(0)
+                st.image(image, use_container_width=True)
                 
                 st.download_button(
                     label="Descargar Nube de Palabras",
-                    data=buf,
+                    data=lambda: export_word_cloud_png(fingerprint, word_freqs.frequencies()),
                     file_name=f"nube_{topic}_{time.strftime('%Y%m%d')}.png",
                     mime="image/png"
                 )
@@ -320,22 +376,36 @@ def main():
                 st.warning("No hay suficiente texto para generar una nube de palabras.")
         
         with tab4:
-            fig_trend = plot_sentiment_over_time(df)
-            if fig_trend:
-                st.plotly_chart(fig_trend, use_container_width=True)
-            else:
-                st.info("Análisis temporal no disponible para estos artículos.")
+            frequency = st.radio("Agrupar por:", list(FRECUENCIAS), index=1, horizontal=True,
+                                 format_func=str.capitalize)
+            with span("graficos.tendencias"):
+                fig_trend = plot_sentiment_trend(result.rollups.frame(frequency))
+                if fig_trend:
+                    st.plotly_chart(fig_trend, use_container_width=True)
+                else:
+                    st.info("Análisis temporal no disponible para estos artículos.")
             
             st.subheader("Exportar Datos")
-            csv = df.to_csv(index=False).encode('utf-8')
+            export_format = st.radio("Formato:", list(EXPORT_FORMATS), horizontal=True,
+                                     key='export-format')
+            extension, mime = EXPORT_FORMATS[export_format]
             st.download_button(
-                "Descargar Datos en CSV",
-                csv,
-                f"sentimiento_noticias_{topic}_{time.strftime('%Y%m%d')}.csv",
-                "text/csv",
-                key='download-csv'
+                f"Descargar Datos en {export_format}",
+                lambda: export_data(dataframe_fingerprint(df), export_format, df),
+                f"sentimiento_noticias_{topic}_{time.strftime('%Y%m%d')}.{extension}",
+                mime,
+                key='download-data'
             )
+    
+    if show_debug:
+        with debug_container:
+            results = st.session_state.results
+            st.caption(f"Memoria de la sesión: {results.nbytes / 2**20:.2f} de "
+                       f"{results.budget_bytes / 2**20:.0f} MB · análisis guardados: "
+                       f"{', '.join(results.keys()) or 'ninguno'}")
+            panel_depuracion()
 
 # Ejecutar la app
 if __name__ == "__main__":
-    main()
+    with span("pagina.sentimiento"):
+        main()
@@ -0,0 +1,138 @@
+import os
+
+import streamlit as st
+import pandas as pd
+
+from almacen_precios import AlmacenPrecios
+from correlacion import (
+    alinear_sentimiento_precios,
+    correlacion_movil,
+    correlaciones_rezagadas,
+    polaridad_diaria,
+    rendimientos_diarios
+)
+from graficos_sentimiento import plot_lagged_correlations, plot_rolling_correlation
+from instrumentacion import configurar_desde_entorno, panel_depuracion, span
+
+# ------------------------ CONFIGURACIÓN DE PÁGINA ------------------------
+st.set_page_config(page_title="Sentimiento vs Precios", page_icon="📈", layout="wide")
+configurar_desde_entorno()
+
+st.title("📈 Sentimiento de Noticias vs Rendimiento de Acciones")
+st.markdown("""
+Alinea la polaridad diaria de las noticias con los rendimientos diarios de una o varias
+acciones y calcula la correlación para distintos rezagos: con rezago *k* se compara la
+polaridad de hace *k* sesiones con el rendimiento de hoy.
+
+---
+""")
+
+opciones_empresas = {
+    "Tesla (TSLA)": "TSLA",
+    "Apple (AAPL)": "AAPL",
+    "Microsoft (MSFT)": "MSFT",
+    "Google / Alphabet (GOOGL)": "GOOGL",
+    "Amazon (AMZN)": "AMZN",
+    "NVIDIA (NVDA)": "NVDA",
+    "Meta / Facebook (META)": "META"
+}
+
+# ------------------------ FUENTES DE DATOS ------------------------
+@st.cache_resource
+def obtener_almacen():
+    return AlmacenPrecios()
+
+@st.cache_data(ttl=3600)
+def leer_lotes(directorio, temas=None):
+    """Artículos guardados por ``lote_sentimiento.py`` (Parquet particionado por fecha y tema)."""
+    filtros = [("tema", "in", list(temas))] if temas else None
+    return pd.read_parquet(directorio, columns=["date", "polarity", "tema"], filters=filtros)
+
+def obtener_cierres(tickers, fecha_inicio, fecha_fin):
+    """Precios de cierre de cada ticker, una columna por ticker (una sola descarga para todos)."""
+    precios = obtener_almacen().obtener_varios(tickers, fecha_inicio, fecha_fin)
+    return pd.DataFrame({ticker: datos["Close"] for ticker, datos in precios.items()})
+
+# ------------------------ SIDEBAR: PARÁMETROS ------------------------
+st.sidebar.header("Parámetros")
+fuente = st.sidebar.radio("Sentimiento:", ["Sesión actual", "Lotes guardados"])
+if fuente == "Sesión actual":
+    resultado = st.session_state["results"].current if "results" in st.session_state else None
+    articulos = None if resultado is None else resultado.df
+    if articulos is None or articulos.empty:
+        st.info("Analiza primero un tema en la página de Análisis de Sentimientos, "
+                "o usa los lotes guardados por lote_sentimiento.py.")
+        st.stop()
+else:
+    directorio = st.sidebar.text_input("Directorio de lotes:", value=os.path.join("datos", "lotes"))
+    if not os.path.isdir(directorio):
+        st.warning(f"No existe el directorio {directorio!r}.")
+        st.stop()
+    temas = st.sidebar.text_input("Temas (separados por comas, vacío para todos):")
+    temas = tuple(t.strip() for t in temas.split(",") if t.strip())
+    with span("correlacion.lectura_lotes"):
+        articulos = leer_lotes(directorio, temas or None)
+    if articulos.empty:
+        st.warning("No hay artículos guardados para esos temas.")
+        st.stop()
+
+empresas = st.sidebar.multiselect("Empresas:", list(opciones_empresas), default=["Tesla (TSLA)"])
+tickers = [opciones_empresas[e] for e in empresas]
+max_rezago = st.sidebar.slider("Rezago máximo (sesiones):", 0, 20, 5)
+ventana = st.sidebar.slider("Ventana de la correlación móvil (sesiones):", 10, 250, 60)
+# Un slider necesita un rango no vacío: sin rezagos, la correlación móvil es del mismo día
+rezago_movil = st.sidebar.slider("Rezago de la correlación móvil:", 0, max_rezago, 0) if max_rezago > 0 else 0
+
+if not tickers:
+    st.info("Selecciona al menos una empresa.")
+    st.stop()
+
+# ------------------------ ALINEACIÓN ------------------------
+with span("correlacion.polaridad_diaria"):
+    polaridad = polaridad_diaria(articulos)
+if polaridad.empty:
+    st.warning("Los artículos no tienen fechas de publicación válidas.")
+    st.stop()
+
+# Sesiones extra antes del primer día con noticias para poder calcular los rezagos
+fecha_inicio = (polaridad.index.min() - pd.tseries.offsets.BDay(max_rezago + 1)).date()
+fecha_fin = (polaridad.index.max() + pd.Timedelta(days=7)).date()
+with span("correlacion.precios"):
+    cierres = obtener_cierres(tuple(tickers), str(fecha_inicio), str(fecha_fin))
+if cierres.dropna(how="all").empty:
+    st.warning("No se encontraron precios para el período de las noticias.")
+    st.stop()
+
+with span("correlacion.alineacion"):
+    alineado = alinear_sentimiento_precios(polaridad, rendimientos_diarios(cierres))
+sesiones = int(alineado["polaridad"].notna().sum())
+
+col1, col2, col3 = st.columns(3)
+col1.metric("Días con noticias", len(polaridad))
+col2.metric("Sesiones con noticias", sesiones)
+col3.metric("Artículos", int(alineado["articulos"].sum()))
+
+# ------------------------ CORRELACIONES ------------------------
+with span("correlacion.rezagos"):
+    correlaciones = correlaciones_rezagadas(alineado, tickers, max_rezago)
+if correlaciones.isna().all().all():
+    st.info("Hacen falta más sesiones con noticias para estimar correlaciones.")
+else:
+    st.plotly_chart(plot_lagged_correlations(correlaciones), use_container_width=True)
+    st.dataframe(correlaciones.round(3), use_container_width=True)
+
+if sesiones >= ventana:
+    with span("correlacion.movil"):
+        movil = correlacion_movil(alineado, tickers, ventana, rezago_movil)
+    st.plotly_chart(plot_rolling_correlation(movil, ventana), use_container_width=True)
+else:
+    st.caption(f"La correlación móvil necesita al menos {ventana} sesiones con noticias "
+               f"(hay {sesiones}).")
+
+with st.expander("Datos alineados"):
+    st.dataframe(alineado, use_container_width=True)
+
+# ------------------------ PANEL DE DEPURACIÓN ------------------------
+if st.sidebar.checkbox("Mostrar panel de depuración"):
+    with st.sidebar:
+        panel_depuracion()
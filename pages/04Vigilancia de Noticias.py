@@ -0,0 +1,99 @@
+import time
+
+import pandas as pd
+import streamlit as st
+
+from cache_sentimiento import SentimentCache
+from instrumentacion import configurar_desde_entorno, panel_depuracion, span
+from vigilancia_noticias import VigilanteNoticias
+
+# ------------------------ CONFIGURACIÓN DE PÁGINA ------------------------
+st.set_page_config(page_title="Vigilancia de Noticias", page_icon="📡", layout="wide")
+configurar_desde_entorno()
+
+# Segundos entre dos lecturas del estado del vigilante (no consultan la red)
+REFRESCO_PANEL = 10
+
+st.title("📡 Vigilancia de Noticias")
+st.markdown("""
+Consulta periódicamente los temas de la lista de vigilancia y analiza solo las noticias
+nuevas de cada uno. Si el feed no cambió desde la última consulta, el servidor responde
+sin volver a enviarlo.
+
+---
+""")
+
+sentiment_badges = {
+    'Positivo': '🟢 Positivo',
+    'Neutro': '🔵 Neutro',
+    'Negativo': '🔴 Negativo'
+}
+
+# Vigilante compartido por todas las sesiones: consulta en segundo plano y la
+# página solo lee su última instantánea
+@st.cache_resource
+def obtener_vigilante():
+    return VigilanteNoticias(cache=SentimentCache()).iniciar()
+
+# ------------------------ SIDEBAR: LISTA DE VIGILANCIA ------------------------
+vigilante = obtener_vigilante()
+st.sidebar.header("Lista de vigilancia")
+temas = st.sidebar.text_area(
+    "Temas (uno por línea):", value="\n".join(vigilante.temas),
+    help="La lista es común para todas las sesiones de la aplicación"
+)
+if st.sidebar.button("Guardar lista", use_container_width=True):
+    vigilante.vigilar(temas.splitlines())
+if st.sidebar.button("Consultar ahora", use_container_width=True):
+    vigilante.consultar_ahora()
+st.sidebar.caption(f"Consulta automática cada {vigilante.intervalo / 60:.0f} min.")
+
+def resumen(estados):
+    """Una fila por tema con los artículos nuevos y el tráfico ahorrado."""
+    filas = []
+    for estado in estados.values():
+        nuevos = pd.Series([a['sentiment'] for a in estado.nuevos], dtype=object)
+        filas.append({
+            "Tema": estado.tema,
+            "Nuevos": len(estado.nuevos),
+            "Nuevos positivos": int((nuevos == 'Positivo').sum()),
+            "Nuevos negativos": int((nuevos == 'Negativo').sum()),
+            "Artículos": len(estado.articulos),
+            "Consultas": estado.consultas,
+            "Sin cambios (304)": estado.sin_cambios,
+            "KB descargados": round(estado.bytes_descargados / 1024, 1),
+            "Última consulta": "—" if estado.edad is None else f"hace {estado.edad:.0f} s",
+            "Error": estado.error or "",
+        })
+    return pd.DataFrame(filas)
+
+# ------------------------ PANEL ------------------------
+@st.fragment(run_every=REFRESCO_PANEL)
+def panel():
+    estados = vigilante.instantanea()
+    if not estados:
+        st.info("Añade temas a la lista de vigilancia en la barra lateral.")
+        return
+    with span("vigilancia.panel"):
+        st.dataframe(resumen(estados), use_container_width=True, hide_index=True)
+        for estado in estados.values():
+            if not estado.articulos:
+                continue
+            st.subheader(f"{estado.tema} · {len(estado.nuevos)} nuevos en la última consulta")
+            # Los nuevos de la última consulta van primero en ``articulos``
+            for i, articulo in enumerate(estado.articulos[:10]):
+                nuevo = "🆕 " if i < len(estado.nuevos) else ""
+                with st.expander(f"{nuevo}{articulo['title']} [{sentiment_badges[articulo['sentiment']]}]"):
+                    st.markdown(f"**Resumen:** {articulo['summary']}")
+                    st.markdown(f"**Polaridad:** {articulo['polarity']:.2f} | "
+                                f"**Publicado:** {articulo['published'] or 'n/d'}")
+                    if articulo['link']:
+                        st.markdown(f"[Leer artículo completo]({articulo['link']})")
+    st.caption(f"Actualizado a las {time.strftime('%H:%M:%S')}")
+
+panel()
+
+# ------------------------ PANEL DE DEPURACIÓN ------------------------
+if st.sidebar.checkbox("Mostrar panel de depuración"):
+    with st.sidebar:
+        panel_depuracion()
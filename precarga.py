@@ -0,0 +1,134 @@
+# precarga.py
+"""Precarga de dependencias pesadas e informe del tiempo de importación.
+
+Las páginas importan sus dependencias pesadas (TextBlob, Plotly, WordCloud,
+yfinance...) solo en los caminos que las usan. Con ``PRECARGA=1`` la primera
+ejecución de una página del proceso las importa en un hilo en segundo plano,
+junto con el léxico de TextBlob y el modelo entrenado, para que la primera
+sesión no pague ese coste.
+
+Informe del tiempo de importación de cada página (en un proceso limpio):
+    python precarga.py [--top 8]
+"""
+import argparse
+import ast
+import glob
+import importlib
+import os
+import subprocess
+import sys
+import threading
+import time
+
+from instrumentacion import span
+
+# Módulos que se importan en segundo plano, en orden de uso habitual
+MODULOS_PESADOS = ("plotly.express", "feedparser", "bs4", "urllib3", "wordcloud", "yfinance")
+
+DIRECTORIO = os.path.dirname(os.path.abspath(__file__))
+PAGINAS = [os.path.join(DIRECTORIO, "Aplicacion.py")] + sorted(glob.glob(os.path.join(DIRECTORIO, "pages", "*.py")))
+
+_hilo = None
+_lock = threading.Lock()
+
+
+def precargar(modulos=MODULOS_PESADOS, lexico=True, modelo=True) -> dict:
+    """Importar ``modulos`` y preparar el léxico y el modelo; devuelve segundos por paso.
+
+    Un paso que falla (dependencia opcional sin instalar, modelo corrupto)
+    se omite sin interrumpir los demás.
+    """
+    tiempos = {}
+
+    def paso(nombre, funcion):
+        inicio = time.perf_counter()
+        try:
+            with span(f"precarga.{nombre}"):
+                funcion()
+        except Exception:
+            return
+        tiempos[nombre] = time.perf_counter() - inicio
+
+    for modulo in modulos:
+        paso(modulo, lambda: importlib.import_module(modulo))
+    if lexico:
+        from analisis_sentimiento import preload_lexicon
+
+        paso("lexico", preload_lexicon)
+    if modelo:
+        from modelo_sentimiento import RUTA_MODELO, ModeloSentimiento
+
+        if os.path.exists(RUTA_MODELO):
+            paso("modelo", lambda: ModeloSentimiento.cargar(RUTA_MODELO))
+    return tiempos
+
+
+def iniciar_precarga(**kwargs):
+    """Lanzar ``precargar`` en un hilo en segundo plano (una sola vez por proceso)."""
+    global _hilo
+    with _lock:
+        if _hilo is None:
+            _hilo = threading.Thread(target=precargar, kwargs=kwargs, name="precarga", daemon=True)
+            _hilo.start()
+    return _hilo
+
+
+# ------------------------ INFORME DE IMPORTACIÓN ------------------------
+# Separa en la salida de ``-X importtime`` el arranque del intérprete del código medido
+_MARCA = "--- inicio ---"
+
+def importaciones(ruta) -> str:
+    """Sentencias ``import`` de primer nivel de un script, como código ejecutable."""
+    with open(ruta, encoding="utf-8") as f:
+        arbol = ast.parse(f.read(), filename=ruta)
+    return "\n".join(ast.unparse(nodo) for nodo in arbol.body
+                     if isinstance(nodo, (ast.Import, ast.ImportFrom)))
+
+
+def tiempo_importacion(codigo) -> dict:
+    """Tiempo acumulado (segundos) de cada paquete de primer nivel al ejecutar ``codigo``.
+
+    Se ejecuta en un proceso nuevo con ``-X importtime``, así que mide un
+    arranque en frío; la clave ``None`` es el total. Lo que el intérprete ya
+    importa al arrancar (``site``, ``encodings``...) no cuenta.
+    """
+    salida = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import sys; sys.stderr.write('{_MARCA}\\n')\n{codigo}"],
+        capture_output=True, text=True, cwd=DIRECTORIO, check=True
+    ).stderr
+    paquetes = {}
+    for linea in salida.partition(_MARCA)[2].splitlines():
+        if not linea.startswith("import time:"):
+            continue
+        partes = linea.split("|")
+        if len(partes) != 3 or not partes[1].strip().isdigit():
+            continue
+        nombre = partes[2][1:].rstrip()
+        # Solo los módulos importados desde el nivel superior (sin sangría)
+        if nombre.startswith(" ") or "." in nombre:
+            continue
+        paquetes[nombre] = paquetes.get(nombre, 0) + int(partes[1]) / 1e6
+    paquetes[None] = sum(paquetes.values())
+    return paquetes
+
+
+def informe(paginas=PAGINAS, top=8):
+    """Tiempo de importación en frío de cada página y sus paquetes más pesados."""
+    for ruta in paginas:
+        tiempos = tiempo_importacion(importaciones(ruta))
+        total = tiempos.pop(None)
+        pesados = sorted(tiempos.items(), key=lambda t: t[1], reverse=True)[:top]
+        print(f"{os.path.basename(ruta):<36} {total * 1e3:8.0f} ms")
+        for paquete, segundos in pesados:
+            print(f"    {paquete:<32} {segundos * 1e3:8.0f} ms")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Tiempo de importación en frío de cada página")
+    parser.add_argument("--top", type=int, default=8, help="paquetes que se muestran por página")
+    args = parser.parse_args(argv)
+    informe(top=args.top)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+# resultados_sesion.py
+import os
+from collections import OrderedDict
+from dataclasses import dataclass
+
+import pandas as pd
+import pyarrow as pa
+
+from tendencias import parse_published
+
+# Memoria máxima de los resultados guardados por sesión; al superarla se
+# descartan los análisis usados hace más tiempo (nunca el actual)
+MEMORIA_SESION_MB = float(os.environ.get("MEMORIA_SESION_MB", 16))
+
+SENTIMIENTOS = pd.CategoricalDtype(['Positivo', 'Neutro', 'Negativo'])
+_TEXTO = pd.StringDtype("pyarrow")
+_ENLACES = pd.ArrowDtype(pa.list_(pa.string()))
+
+
+def compact_articles(articles) -> pd.DataFrame:
+    """DataFrame columnar y compacto de los artículos analizados.
+
+    Textos en cadenas de Arrow (un único búfer por columna en lugar de un
+    objeto de Python por celda), sentimiento y tema como categorías, y
+    polaridad y subjetividad en float32. Es la única copia de los artículos
+    que guarda la sesión.
+    """
+    df = pd.DataFrame(articles)
+    if df.empty:
+        return df
+    columns = {}
+    for column in ('title', 'summary', 'link', 'published'):
+        if column in df.columns:
+            columns[column] = df[column].astype(_TEXTO)
+    if 'topic' in df.columns:
+        columns['topic'] = df['topic'].astype('category')
+    columns['sentiment'] = df['sentiment'].astype(SENTIMIENTOS)
+    columns['polarity'] = df['polarity'].astype('float32')
+    columns['subjectivity'] = df['subjectivity'].astype('float32')
+    if 'group_size' in df.columns:
+        columns['group_size'] = df['group_size'].astype('int32')
+        columns['group_links'] = pd.Series(
+            pa.array(df['group_links'], type=_ENLACES.pyarrow_dtype), dtype=_ENLACES, index=df.index
+        )
+    if 'published' in df.columns:
+        fechas = parse_published(df['published']).astype('datetime64[D]')
+        columns['date'] = pd.Series(fechas.astype('datetime64[s]'), index=df.index)
+    return pd.DataFrame(columns, index=pd.RangeIndex(len(df)))
+
+
+def result_key(topic, scorer="textblob", max_articles=100, group_duplicates=True) -> str:
+    """Clave de un análisis guardado: el tema y todo lo que cambia su resultado.
+
+    Buscar el mismo tema con otro número máximo de artículos, otro modelo o
+    sin agrupar duplicados es otro análisis, no el ya guardado.
+    """
+    key = f"{topic} · {max_articles} art."
+    if not group_duplicates:
+        key += " · sin agrupar"
+    if scorer != "textblob":
+        key += f" [{scorer}]"
+    return key
+
+
+@dataclass(frozen=True)
+class Result:
+    """Un análisis guardado: los artículos, sus frecuencias de palabras, sus tendencias y su tamaño."""
+    key: str
+    df: pd.DataFrame
+    word_freqs: object
+    rollups: object
+    nbytes: int
+
+
+class SessionResults:
+    """Resultados de análisis de una sesión, con un presupuesto de memoria.
+
+    Guarda los análisis por tema en orden de uso; al añadir uno nuevo se
+    descartan los más antiguos hasta volver al presupuesto. El resultado
+    actual se conserva siempre, aunque por sí solo lo supere. Las pestañas
+    leen ``current.df`` directamente, sin copiarlo.
+    """
+
+    def __init__(self, budget_mb=MEMORIA_SESION_MB):
+        self.budget_bytes = int(budget_mb * 2**20)
+        self._results = OrderedDict()
+
+    def put(self, key, articles, word_freqs, rollups):
+        """Guardar los artículos analizados de ``key`` y hacerlo el resultado actual."""
+        df = compact_articles(articles)
+        nbytes = int(df.memory_usage(deep=True).sum()) + word_freqs.nbytes() + rollups.nbytes()
+        self._results.pop(key, None)
+        self._results[key] = Result(key, df, word_freqs, rollups, nbytes)
+        evicted = []
+        while self.nbytes > self.budget_bytes and len(self._results) > 1:
+            evicted.append(self._results.popitem(last=False)[0])
+        return evicted
+
+    def get(self, key):
+        """Resultado guardado de ``key`` (que pasa a ser el actual) o ``None``."""
+        if key not in self._results:
+            return None
+        self._results.move_to_end(key)
+        return self._results[key]
+
+    @property
+    def current(self):
+        return next(reversed(self._results.values()), None)
+
+    @property
+    def nbytes(self):
+        return sum(result.nbytes for result in self._results.values())
+
+    def keys(self):
+        return list(self._results)
+
+    def __len__(self):
+        return len(self._results)
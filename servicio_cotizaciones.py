@@ -0,0 +1,109 @@
+# servicio_cotizaciones.py
+import math
+import threading
+import time
+from dataclasses import dataclass, field
+
+# Segundos entre refrescos de las cotizaciones de la cinta superior
+TTL_COTIZACIONES = 60
+
+
+def descargar_cotizaciones(simbolos):
+    """Último precio de cierre de cada símbolo en Yahoo Finance."""
+    import yfinance as yf
+
+    precios = yf.download(list(simbolos), period="1d", progress=False)['Close'].iloc[-1]
+    return {s: float(precios[s]) for s in simbolos
+            if s in precios and not math.isnan(precios[s])}
+
+
+@dataclass(frozen=True)
+class Instantanea:
+    """Últimos valores conocidos; ``error`` guarda el fallo del último refresco."""
+    precios: dict = field(default_factory=dict)
+    actualizado: float | None = None
+    error: str | None = None
+
+    @property
+    def edad(self):
+        """Segundos desde la última descarga correcta (``None`` si nunca la hubo)."""
+        return None if self.actualizado is None else time.time() - self.actualizado
+
+
+class ServicioCotizaciones:
+    """Servicio de cotizaciones compartido por todo el proceso.
+
+    Un hilo en segundo plano refresca los precios cada ``ttl`` segundos. Las
+    peticiones concurrentes comparten una sola descarga en curso y, si una
+    descarga falla, se conservan los últimos valores conocidos. Las páginas
+    solo leen la instantánea, sin bloquearse en la red.
+    """
+
+    def __init__(self, simbolos, ttl=TTL_COTIZACIONES, descargador=descargar_cotizaciones):
+        self.simbolos = list(simbolos)
+        self.ttl = ttl
+        self.descargador = descargador
+        self._instantanea = Instantanea()
+        self._lock = threading.Lock()
+        self._en_curso = None  # threading.Event de la descarga en curso
+        self._primera_carga = threading.Event()
+        self._detener = threading.Event()
+        self._hilo = None
+
+    def instantanea(self) -> Instantanea:
+        """Devolver los últimos valores conocidos sin esperar a la red."""
+        return self._instantanea
+
+    def refrescar(self) -> Instantanea:
+        """Descargar las cotizaciones; si ya hay una descarga en curso, esperar a esa."""
+        with self._lock:
+            en_curso = self._en_curso
+            if en_curso is None:
+                en_curso = self._en_curso = threading.Event()
+                propia = True
+            else:
+                propia = False
+        if not propia:
+            en_curso.wait()
+            return self._instantanea
+
+        anterior = self._instantanea
+        try:
+            nuevos = self.descargador(self.simbolos)
+            if not nuevos:
+                raise ValueError("La descarga no devolvió precios")
+            # Los símbolos que falten en esta descarga conservan su último valor
+            self._instantanea = Instantanea({**anterior.precios, **nuevos}, time.time())
+        except Exception as e:
+            self._instantanea = Instantanea(anterior.precios, anterior.actualizado, str(e))
+        finally:
+            with self._lock:
+                self._en_curso = None
+            self._primera_carga.set()
+            en_curso.set()
+        return self._instantanea
+
+    def esperar_primera_carga(self, timeout=None) -> Instantanea:
+        """Esperar como mucho ``timeout`` segundos a que termine la primera descarga."""
+        self._primera_carga.wait(timeout)
+        return self._instantanea
+
+    def iniciar(self):
+        """Arrancar el hilo de refresco (no hace nada si ya está en marcha)."""
+        with self._lock:
+            if self._hilo is not None and self._hilo.is_alive():
+                return self
+            self._detener.clear()
+            self._hilo = threading.Thread(
+                target=self._bucle, name="servicio-cotizaciones", daemon=True
+            )
+            self._hilo.start()
+        return self
+
+    def detener(self):
+        self._detener.set()
+
+    def _bucle(self):
+        while not self._detener.is_set():
+            self.refrescar()
+            self._detener.wait(self.ttl)
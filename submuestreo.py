@@ -0,0 +1,98 @@
+# submuestreo.py
+import numpy as np
+import pandas as pd
+
+# Puntos por serie que se envían al navegador: un par de puntos por píxel
+# del ancho habitual de un gráfico es indistinguible de la serie completa
+PUNTOS_GRAFICO = 1500
+
+
+def lttb(x, y, puntos):
+    """Índices elegidos por Largest-Triangle-Three-Buckets.
+
+    Conserva el primer y el último punto y, de cada cubeta intermedia, el que
+    forma el triángulo de mayor área con el punto elegido en la cubeta
+    anterior y la media de la siguiente; así se mantienen los picos y valles
+    que un muestreo regular perdería.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    n = len(x)
+    if puntos >= n or puntos < 3:
+        return np.arange(n)
+    # Con pocos puntos de más algunas cubetas quedarían vacías: se descartan
+    bordes = np.unique(np.linspace(1, n - 1, puntos - 1).astype(np.int64))
+    puntos = len(bordes) + 1
+    bordes = np.append(bordes, n)
+    # Media de cada cubeta (la última "cubeta siguiente" es el punto final)
+    sumas_x = np.add.reduceat(x, bordes[:-1])
+    sumas_y = np.add.reduceat(y, bordes[:-1])
+    tamanos = np.diff(bordes)
+    medias_x, medias_y = sumas_x / tamanos, sumas_y / tamanos
+
+    elegidos = np.empty(puntos, dtype=np.int64)
+    elegidos[0], elegidos[-1] = 0, n - 1
+    a = 0
+    for i in range(puntos - 2):
+        inicio, fin = bordes[i], bordes[i + 1]
+        siguiente_x, siguiente_y = medias_x[i + 1], medias_y[i + 1]
+        areas = np.abs(
+            (x[a] - siguiente_x) * (y[inicio:fin] - y[a])
+            - (x[a] - x[inicio:fin]) * (siguiente_y - y[a])
+        )
+        a = inicio + int(np.argmax(areas))
+        elegidos[i + 1] = a
+    return elegidos
+
+
+def min_max(y, puntos):
+    """Índices del mínimo y el máximo de cada cubeta (más rápido que LTTB, sin bucle).
+
+    Como LTTB, conserva el primer y el último punto; el resto se reparte en
+    ``(puntos - 2) // 2`` cubetas, así que devuelve ``puntos`` índices (uno
+    menos si ``puntos`` es impar). ``y`` no debe tener NaN.
+    """
+    y = np.asarray(y, dtype=np.float64)
+    n = len(y)
+    if puntos >= n or puntos < 2:
+        return np.arange(n)
+    cubetas = (puntos - 2) // 2
+    if cubetas == 0:
+        return np.array([0, n - 1])
+    # Cubetas del interior [1, n - 1); con puntos < n cada una tiene al menos dos valores
+    bordes = 1 + np.linspace(0, n - 2, cubetas + 1).astype(np.int64)
+    segmento = np.repeat(np.arange(cubetas), np.diff(bordes))
+    # Ordenado por cubeta y valor: el primero de cada cubeta es su mínimo y el último su máximo
+    orden = 1 + np.lexsort((y[1:-1], segmento))
+    minimos, maximos = orden[bordes[:-1] - 1], orden[bordes[1:] - 2]
+    return np.unique(np.concatenate([[0, n - 1], minimos, maximos]))
+
+
+def submuestrear(datos, puntos=PUNTOS_GRAFICO, metodo="lttb"):
+    """Filas de ``datos`` (Series o DataFrame indexado por fecha) que bastan para dibujarlo.
+
+    Cada columna se submuestrea por separado y se devuelven las filas de la
+    unión de sus puntos elegidos, sin modificar ``datos``: la tabla y la
+    exportación siguen usando la serie completa.
+    """
+    if len(datos) <= puntos:
+        return datos
+    marco = datos.to_frame() if isinstance(datos, pd.Series) else datos
+    if isinstance(marco.index, pd.DatetimeIndex):
+        x = marco.index.asi8.astype(np.float64)
+    else:
+        x = np.arange(len(marco), dtype=np.float64)
+
+    elegidos = []
+    for columna in marco.columns:
+        y = marco[columna].to_numpy(dtype=np.float64, na_value=np.nan)
+        validos = np.flatnonzero(~np.isnan(y))
+        if metodo == "lttb":
+            indices = lttb(x[validos], y[validos], puntos)
+        elif metodo == "minmax":
+            indices = min_max(y[validos], puntos)
+        else:
+            raise ValueError(f"Método de submuestreo desconocido: {metodo!r}")
+        elegidos.append(validos[indices])
+    filas = np.unique(np.concatenate(elegidos)) if elegidos else np.arange(0)
+    return datos.iloc[filas]
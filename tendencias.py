@@ -0,0 +1,165 @@
+# tendencias.py
+import sys
+
+import numpy as np
+import pandas as pd
+
+# Granularidades de las tendencias: nombre -> segundos por cubeta
+FRECUENCIAS = {"hora": 3600, "día": 86400, "semana": 7 * 86400}
+ETIQUETAS = ("Positivo", "Neutro", "Negativo")
+
+# Las semanas empiezan el lunes; el 1970-01-05 fue el primer lunes tras la época
+_DESFASE_SEMANA = 4 * 86400
+# Más cubetas que esto no se rellenan con ceros (rango enorme a escala horaria)
+_MAX_CUBETAS_RELLENO = 50_000
+
+# Formato fijo de las fechas de Google News: "Sat, 17 Oct 2026 23:59:00 GMT"
+_LONGITUD_RFC822 = 29
+_SEPARADORES = {3: ",", 4: " ", 7: " ", 11: " ", 16: " ", 19: ":", 22: ":", 25: " ", 26: "G", 27: "M", 28: "T"}
+_DIGITOS = [5, 6, 12, 13, 14, 15, 17, 18, 20, 21, 23, 24]
+_MESES = ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
+_CLAVES_MES = np.array([(ord(a) << 16) | (ord(b) << 8) | ord(c) for a, b, c in _MESES], dtype=np.int64)
+_ORDEN_MES = np.argsort(_CLAVES_MES)
+
+
+def parse_published(values):
+    """Fechas de publicación RFC-822 como ``datetime64[s]`` en UTC (NaT si no se entienden).
+
+    El formato fijo de Google News se decodifica por posiciones sobre una
+    matriz de códigos de carácter, sin analizar cada cadena por separado;
+    cualquier otro formato pasa por ``pd.to_datetime``.
+    """
+    valores = np.asarray(values, dtype=object)
+    n = len(valores)
+    resultado = np.full(n, np.datetime64("NaT"), dtype="datetime64[s]")
+    if n == 0:
+        return resultado
+    textos = [v if isinstance(v, str) else "" for v in valores]
+    longitudes = np.fromiter(map(len, textos), dtype=np.int64, count=n)
+    # Con ancho fijo U29 cada fila tiene siempre 29 códigos (rellenos con ceros o
+    # truncados); la longitud real de cada cadena se comprueba en ``valida``
+    codigos = np.array(textos, dtype=f"U{_LONGITUD_RFC822}").view(np.uint32).reshape(n, _LONGITUD_RFC822)
+
+    valida = longitudes == _LONGITUD_RFC822
+    for posicion, caracter in _SEPARADORES.items():
+        valida &= codigos[:, posicion] == ord(caracter)
+    digitos = codigos[:, _DIGITOS].astype(np.int64) - ord("0")
+    valida &= ((digitos >= 0) & (digitos <= 9)).all(axis=1)
+
+    clave_mes = (codigos[:, 8].astype(np.int64) << 16) | (codigos[:, 9].astype(np.int64) << 8) | codigos[:, 10]
+    mes = _ORDEN_MES[np.minimum(np.searchsorted(_CLAVES_MES, clave_mes, sorter=_ORDEN_MES), 11)]
+    valida &= _CLAVES_MES[mes] == clave_mes
+
+    dia = digitos[:, 0] * 10 + digitos[:, 1]
+    anio = digitos[:, 2] * 1000 + digitos[:, 3] * 100 + digitos[:, 4] * 10 + digitos[:, 5]
+    hora = digitos[:, 6] * 10 + digitos[:, 7]
+    minuto = digitos[:, 8] * 10 + digitos[:, 9]
+    segundo = digitos[:, 10] * 10 + digitos[:, 11]
+    inicio_mes = ((anio - 1970) * 12 + mes).astype("datetime64[M]")
+    dias_mes = ((inicio_mes + 1).astype("datetime64[D]") - inicio_mes.astype("datetime64[D]")).astype(np.int64)
+    valida &= (dia >= 1) & (dia <= dias_mes) & (hora < 24) & (minuto < 60) & (segundo < 60)
+
+    segundos = (hora * 3600 + minuto * 60 + segundo + (dia - 1) * 86400)[valida]
+    resultado[valida] = inicio_mes[valida].astype("datetime64[s]") + segundos.astype("timedelta64[s]")
+
+    resto = np.flatnonzero(~valida & (longitudes > 0))
+    if len(resto):
+        fechas = pd.to_datetime(pd.Series(valores[resto]), errors="coerce", utc=True, format="mixed")
+        resultado[resto] = fechas.dt.tz_localize(None).to_numpy(dtype="datetime64[s]")
+    return resultado
+
+
+class SentimentRollups:
+    """Conteos de sentimiento por hora, día y semana, actualizados por bloques.
+
+    Cada bloque de artículos nuevos suma sus conteos a las cubetas de cada
+    granularidad; los gráficos leen las cubetas ya agregadas sin volver a
+    agrupar la tabla de artículos.
+    """
+
+    def __init__(self):
+        # granularidad -> {inicio de la cubeta en segundos: [Positivo, Neutro, Negativo, suma de polaridad]}
+        self._cubetas = {frecuencia: {} for frecuencia in FRECUENCIAS}
+        self._marcos = {}
+
+    @classmethod
+    def from_dataframe(cls, df):
+        """Tendencias de una tabla de artículos ya analizados (con ``published`` o ``date``)."""
+        rollups = cls()
+        columna = 'published' if 'published' in df.columns else 'date'
+        if columna == 'published':
+            fechas = parse_published(df['published'])
+        else:
+            fechas = pd.to_datetime(df['date'], errors='coerce').to_numpy(dtype="datetime64[s]")
+        rollups.add(fechas, df['sentiment'], df['polarity'])
+        return rollups
+
+    def add_articles(self, articles):
+        """Sumar un bloque de artículos analizados (diccionarios del flujo de noticias)."""
+        fechas = parse_published([a.get('published', '') for a in articles])
+        self.add(fechas, [a['sentiment'] for a in articles], [a['polarity'] for a in articles])
+
+    def add(self, timestamps, sentiments, polarity):
+        """Sumar artículos dados como arreglos de fechas, etiquetas y polaridades."""
+        fechas = np.asarray(timestamps, dtype="datetime64[s]")
+        validas = ~np.isnat(fechas)
+        if not validas.any():
+            return
+        segundos = fechas[validas].astype(np.int64)
+        etiquetas = np.asarray(sentiments, dtype=object)[validas]
+        polaridad = np.asarray(polarity, dtype=np.float64)[validas]
+        codigos = np.select([etiquetas == e for e in ETIQUETAS], [0, 1, 2], default=-1)
+        con_etiqueta = codigos >= 0
+        segundos, codigos, polaridad = segundos[con_etiqueta], codigos[con_etiqueta], polaridad[con_etiqueta]
+
+        for frecuencia, paso in FRECUENCIAS.items():
+            desfase = _DESFASE_SEMANA if frecuencia == "semana" else 0
+            inicio = (segundos - desfase) // paso * paso + desfase
+            cubetas, inverso = np.unique(inicio, return_inverse=True)
+            sumas = np.zeros((len(cubetas), 4))
+            np.add.at(sumas, (inverso, codigos), 1)
+            np.add.at(sumas[:, 3], inverso, polaridad)
+            destino = self._cubetas[frecuencia]
+            for cubeta, fila in zip(cubetas.tolist(), sumas):
+                if cubeta in destino:
+                    destino[cubeta] += fila
+                else:
+                    destino[cubeta] = fila
+        self._marcos.clear()
+
+    def frame(self, frequency="día"):
+        """Conteos por cubeta (``Positivo``, ``Neutro``, ``Negativo``) y polaridad media.
+
+        Las cubetas sin artículos dentro del rango aparecen con cero.
+        """
+        if frequency in self._marcos:
+            return self._marcos[frequency]
+        cubetas = self._cubetas[frequency]
+        inicios = np.array(sorted(cubetas), dtype=np.int64)
+        valores = np.array([cubetas[i] for i in inicios.tolist()]).reshape(-1, 4)
+        paso = FRECUENCIAS[frequency]
+        if len(inicios) and (inicios[-1] - inicios[0]) // paso < _MAX_CUBETAS_RELLENO:
+            completo = np.arange(inicios[0], inicios[-1] + 1, paso)
+            relleno = np.zeros((len(completo), 4))
+            relleno[np.searchsorted(completo, inicios)] = valores
+            inicios, valores = completo, relleno
+        total = valores[:, :3].sum(axis=1)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            media = np.where(total > 0, valores[:, 3] / total, np.nan)
+        marco = pd.DataFrame(
+            valores[:, :3].astype(np.int64), columns=list(ETIQUETAS),
+            index=pd.DatetimeIndex(inicios.astype("datetime64[s]"), name='date')
+        )
+        marco['polaridad_media'] = media
+        self._marcos[frequency] = marco
+        return marco
+
+    def nbytes(self):
+        """Tamaño aproximado en memoria de las cubetas."""
+        return sum(
+            sys.getsizeof(cubetas) + sum(sys.getsizeof(k) + v.nbytes for k, v in cubetas.items())
+            for cubetas in self._cubetas.values()
+        )
+
+    def __bool__(self):
+        return any(self._cubetas.values())
@@ -0,0 +1,202 @@
+# tests/test_almacen_precios.py
+import os
+import threading
+
+import pandas as pd
+import pytest
+
+from almacen_precios import AlmacenPrecios, DescargadorFalso
+
+T = pd.Timestamp
+
+
+class DescargadorFallido(DescargadorFalso):
+    """Como ``DescargadorFalso``, pero devuelve una tabla vacía (como yfinance) mientras ``falla``."""
+
+    def __init__(self):
+        super().__init__()
+        self.falla = False
+
+    def __call__(self, ticker, fecha_inicio, fecha_fin):
+        datos = super().__call__(ticker, fecha_inicio, fecha_fin)
+        return datos.iloc[:0] if self.falla else datos
+
+
+class DescargadorFestivos(DescargadorFalso):
+    """Precios sintéticos sin sesión en los días de ``festivos``."""
+
+    def __init__(self, festivos):
+        super().__init__()
+        self.festivos = pd.DatetimeIndex(festivos)
+
+    def __call__(self, ticker, fecha_inicio, fecha_fin):
+        datos = super().__call__(ticker, fecha_inicio, fecha_fin)
+        return datos.loc[~datos.index.isin(self.festivos)]
+
+
+@pytest.fixture
+def falso():
+    return DescargadorFallido()
+
+
+@pytest.fixture
+def almacen(tmp_path, falso):
+    return AlmacenPrecios(str(tmp_path), descargador=falso)
+
+
+def test_descarga_solo_los_huecos(almacen, falso):
+    # 2025-03-03 es lunes: una semana de sesiones
+    datos = almacen.obtener("TSLA", "2025-03-03", "2025-03-08")
+    assert len(datos) == 5
+    almacen.obtener("TSLA", "2025-03-03", "2025-03-08")
+    assert len(falso.llamadas) == 1
+
+
+def test_ampliar_un_dia_descarga_solo_ese_dia(almacen, falso):
+    almacen.obtener("TSLA", "2025-03-03", "2025-03-07")
+    datos = almacen.obtener("TSLA", "2025-03-03", "2025-03-08")
+    assert falso.llamadas[-1] == ("TSLA", T("2025-03-07"), T("2025-03-08"))
+    assert datos.index[-1] == T("2025-03-07")
+    assert almacen.huecos("TSLA", "2025-03-03", "2025-03-08") == []
+
+
+def test_descarga_vacia_no_se_guarda(almacen, falso):
+    almacen.obtener("TSLA", "2025-03-03", "2025-03-06")
+    falso.falla = True
+    datos = almacen.obtener("TSLA", "2025-03-03", "2025-03-08")
+    assert datos.index[-1] == T("2025-03-05")
+    # El día hábil que no llegó se vuelve a pedir en la siguiente consulta
+    assert almacen.huecos("TSLA", "2025-03-03", "2025-03-08") == [(T("2025-03-06"), T("2025-03-08"))]
+    falso.falla = False
+    datos = almacen.obtener("TSLA", "2025-03-03", "2025-03-08")
+    assert falso.llamadas[-1] == ("TSLA", T("2025-03-06"), T("2025-03-08"))
+    assert len(datos) == 5
+
+
+def test_descarga_vacia_entre_datos_no_se_guarda(almacen, falso):
+    almacen.obtener("TSLA", "2025-03-03", "2025-03-05")
+    almacen.obtener("TSLA", "2025-03-11", "2025-03-14")
+    falso.falla = True
+    # Cuatro días hábiles sin datos entre dos tramos guardados no son festivos
+    almacen.obtener("TSLA", "2025-03-03", "2025-03-14")
+    assert almacen.huecos("TSLA", "2025-03-03", "2025-03-14") == [(T("2025-03-05"), T("2025-03-11"))]
+
+
+def test_fin_de_semana_queda_cubierto(almacen, falso):
+    almacen.obtener("TSLA", "2025-03-03", "2025-03-08")
+    # Sábado y domingo: la descarga vuelve vacía y el hueco se da por cubierto
+    almacen.obtener("TSLA", "2025-03-03", "2025-03-10")
+    assert falso.llamadas[-1] == ("TSLA", T("2025-03-08"), T("2025-03-10"))
+    assert almacen.huecos("TSLA", "2025-03-03", "2025-03-10") == []
+    almacen.obtener("TSLA", "2025-03-03", "2025-03-10")
+    assert len(falso.llamadas) == 2
+
+
+def test_festivo_entre_datos_queda_cubierto(tmp_path):
+    falso = DescargadorFestivos(["2025-01-01"])
+    almacen = AlmacenPrecios(str(tmp_path), descargador=falso)
+    almacen.obtener("TSLA", "2024-12-30", "2025-01-01")
+    almacen.obtener("TSLA", "2025-01-02", "2025-01-04")
+    almacen.obtener("TSLA", "2024-12-30", "2025-01-04")
+    assert falso.llamadas[-1] == ("TSLA", T("2025-01-01"), T("2025-01-02"))
+    assert almacen.huecos("TSLA", "2024-12-30", "2025-01-04") == []
+
+
+def test_persistente_entre_instancias(tmp_path, falso):
+    AlmacenPrecios(str(tmp_path), descargador=falso).obtener("TSLA", "2025-03-03", "2025-03-08")
+    otro = DescargadorFalso()
+    datos = AlmacenPrecios(str(tmp_path), descargador=otro).obtener("TSLA", "2025-03-04", "2025-03-06")
+    assert len(datos) == 2 and otro.llamadas == []
+
+
+class DescargadorVariosIncompleto:
+    """Descarga conjunta sintética que omite los tickers de ``omitidos``."""
+
+    def __init__(self, omitidos):
+        self.omitidos = set(omitidos)
+        self.falso = DescargadorFalso()
+        self.llamadas = []
+
+    def __call__(self, tickers, fecha_inicio, fecha_fin):
+        self.llamadas.append((list(tickers), T(fecha_inicio), T(fecha_fin)))
+        return {t: self.falso(t, fecha_inicio, fecha_fin) for t in tickers if t not in self.omitidos}
+
+
+def test_obtener_varios_una_sola_descarga(tmp_path):
+    individual, conjunto = DescargadorFalso(), DescargadorVariosIncompleto([])
+    almacen = AlmacenPrecios(str(tmp_path), descargador=individual, descargador_varios=conjunto)
+    precios = almacen.obtener_varios(["TSLA", "AAPL"], "2025-03-03", "2025-03-08")
+    assert conjunto.llamadas == [(["TSLA", "AAPL"], T("2025-03-03"), T("2025-03-08"))]
+    assert individual.llamadas == []
+    assert [len(precios[t]) for t in ("TSLA", "AAPL")] == [5, 5]
+    almacen.obtener_varios(["TSLA", "AAPL"], "2025-03-03", "2025-03-08")
+    assert len(conjunto.llamadas) == 1
+
+
+def test_ticker_ausente_de_la_descarga_conjunta(tmp_path):
+    individual, conjunto = DescargadorFallido(), DescargadorVariosIncompleto(["AAPL"])
+    almacen = AlmacenPrecios(str(tmp_path), descargador=individual, descargador_varios=conjunto)
+    precios = almacen.obtener_varios(["TSLA", "AAPL"], "2025-03-03", "2025-03-08")
+    # El ticker que faltó se pide por separado
+    assert individual.llamadas == [("AAPL", T("2025-03-03"), T("2025-03-08"))]
+    assert len(precios["AAPL"]) == 5
+
+    # Si tampoco llega por separado, su rango no queda marcado como cubierto
+    individual.falla = True
+    almacen.obtener_varios(["TSLA", "AAPL"], "2025-03-03", "2025-03-11")
+    assert almacen.huecos("TSLA", "2025-03-03", "2025-03-11") == []
+    assert almacen.huecos("AAPL", "2025-03-03", "2025-03-11") == [(T("2025-03-08"), T("2025-03-11"))]
+
+
+def test_obtener_varios_agrupa_por_hueco(tmp_path):
+    individual, conjunto = DescargadorFalso(), DescargadorVariosIncompleto([])
+    almacen = AlmacenPrecios(str(tmp_path), descargador=individual, descargador_varios=conjunto)
+    almacen.obtener_varios(["TSLA", "MSFT"], "2020-01-01", "2025-03-08")
+    almacen.obtener_varios(["AAPL"], "2025-03-03", "2025-03-08")
+    conjunto.llamadas.clear()
+
+    precios = almacen.obtener_varios(["TSLA", "AAPL", "MSFT"], "2020-01-01", "2025-03-11")
+    # La sesión nueva se pide una vez para los tres; los años que solo le
+    # faltan a AAPL, solo para AAPL
+    assert conjunto.llamadas == [
+        (["TSLA", "AAPL", "MSFT"], T("2025-03-08"), T("2025-03-11")),
+        (["AAPL"], T("2020-01-01"), T("2025-03-03")),
+    ]
+    assert individual.llamadas == []
+    esperado = DescargadorFalso()("AAPL", "2020-01-01", "2025-03-11")
+    pd.testing.assert_frame_equal(precios["AAPL"], esperado, check_freq=False, check_names=False)
+    assert all(almacen.huecos(t, "2020-01-01", "2025-03-11") == [] for t in precios)
+
+
+def test_escrituras_simultaneas_del_mismo_ticker(tmp_path):
+    # Dos almacenes sobre el mismo directorio no comparten el lock, como dos procesos
+    almacenes = [AlmacenPrecios(str(tmp_path), descargador=DescargadorFalso()) for _ in range(2)]
+    errores = []
+
+    def escribir(almacen, dias):
+        try:
+            for i in range(15):
+                almacen.obtener("TSLA", "2024-01-01", T("2024-02-01") + pd.Timedelta(days=dias + i))
+        except Exception as e:
+            errores.append(e)
+
+    hilos = [threading.Thread(target=escribir, args=(a, 10 * i)) for i, a in enumerate(almacenes)]
+    for hilo in hilos:
+        hilo.start()
+    for hilo in hilos:
+        hilo.join()
+    assert errores == []
+    assert sorted(os.listdir(tmp_path)) == ["TSLA.json", "TSLA.parquet"]
+    esperado = DescargadorFalso()("TSLA", "2024-01-01", "2024-02-01")
+    pd.testing.assert_frame_equal(almacenes[0].obtener("TSLA", "2024-01-01", "2024-02-01"), esperado,
+                                  check_freq=False, check_names=False)
+
+
+def test_escritura_fallida_no_deja_temporales(almacen, tmp_path, monkeypatch):
+    def falla(*args, **kwargs):
+        raise OSError("disco lleno")
+
+    monkeypatch.setattr(pd.DataFrame, "to_parquet", falla)
+    with pytest.raises(OSError):
+        almacen.obtener("TSLA", "2025-03-03", "2025-03-08")
+    assert os.listdir(tmp_path) == []
@@ -0,0 +1,103 @@
+# tests/test_analisis_sentimiento.py
+import random
+
+import numpy as np
+import pytest
+
+from analisis_sentimiento import analyze_batch, analyze_sentiment
+
+PALABRAS = [
+    "market", "shares", "strong", "weak", "good", "bad", "great", "terrible", "not",
+    "very", "isn't", "don't", "really", "mercado", "acciones", "empresa", "sube", "baja",
+    "well-off", "dim-witted", "far-out", "fine-looking", "broad-minded", "cast-iron",
+    ":)", ":-(", ":D", "<3", ";-)", "(!)", "( ! )", "!", "?", "...", "-", "--",
+]
+
+ESPECIALES = [
+    "", " ", "\n", "-", "good", "GOOD!!!", "not good", "isn't bad", "well-off", "Well-Off",
+    "dim-witted idea", "far-outer", "cast-iron:)", "love <3", "great :D", ":(", "ok (!)",
+    "nothing to see here", "mercado sube", "good\nbad", "n't", "good-bad", "—good—",
+    # Emoticones con espacios o tabuladores entre sus signos, que TextBlob vuelve a unir
+    "Option (B) or (C) : P values", "a :\t{ b", "x ; ] y", "* )", "< 3", "texto :", "- ) fin",
+]
+
+
+def _textos(n, semilla=0):
+    rng = random.Random(semilla)
+    return ESPECIALES + [
+        " ".join(rng.choice(PALABRAS) for _ in range(rng.randint(0, 12))) for _ in range(n)
+    ]
+
+
+def _referencia(textos, threshold=0.1):
+    resultados = [analyze_sentiment(t, threshold) for t in textos]
+    return (
+        np.array([r['polarity'] for r in resultados]),
+        np.array([r['subjectivity'] for r in resultados]),
+        [r['sentiment'] for r in resultados],
+    )
+
+
+@pytest.mark.parametrize("mode", ["lexicon", "serial", "auto"])
+def test_lote_igual_que_texto_a_texto(mode):
+    textos = _textos(1500)
+    polaridad, subjetividad, etiquetas = _referencia(textos)
+    resultado = analyze_batch(textos, mode=mode)
+    np.testing.assert_array_equal(resultado['polarity'], polaridad)
+    np.testing.assert_array_equal(resultado['subjectivity'], subjetividad)
+    assert list(resultado['sentiment']) == etiquetas
+
+
+def test_modo_procesos_igual_que_texto_a_texto():
+    textos = _textos(300, semilla=1)
+    polaridad, subjetividad, etiquetas = _referencia(textos)
+    resultado = analyze_batch(textos, mode="process", workers=2, chunk_size=64)
+    np.testing.assert_array_equal(resultado['polarity'], polaridad)
+    np.testing.assert_array_equal(resultado['subjectivity'], subjetividad)
+    assert list(resultado['sentiment']) == etiquetas
+
+
+def test_umbral_y_textos_vacios():
+    textos = ["", None, "good", "bad", "good"]
+    resultado = analyze_batch(textos, mode="lexicon", threshold=0.5)
+    polaridad, _, etiquetas = _referencia(["", "", "good", "bad", "good"], threshold=0.5)
+    np.testing.assert_array_equal(resultado['polarity'], polaridad)
+    assert list(resultado['sentiment']) == etiquetas
+    assert resultado['polarity'][0] == resultado['subjectivity'][0] == 0.0
+
+
+def test_lote_vacio():
+    resultado = analyze_batch([], mode="lexicon")
+    assert len(resultado['polarity']) == len(resultado['sentiment']) == 0
+
+
+def test_progreso_llega_al_total():
+    llamadas = []
+    analyze_batch(_textos(50), mode="lexicon", chunk_size=10,
+                  progress=lambda hechos, total: llamadas.append((hechos, total)))
+    assert llamadas and llamadas[-1][0] == llamadas[-1][1]
+
+
+def test_modo_desconocido():
+    with pytest.raises(ValueError):
+        analyze_batch(["good"], mode="gpu")
+
+
+class _Constante:
+    name = "constante"
+    version = "1"
+
+    def score(self, texts):
+        return np.full(len(texts), 0.5), np.full(len(texts), 0.25)
+
+
+def test_puntuador_propio():
+    resultado = analyze_batch(["a", "b", "a"], scorer=_Constante())
+    assert list(resultado['sentiment']) == ['Positivo'] * 3
+    np.testing.assert_array_equal(resultado['subjectivity'], [0.25] * 3)
+
+
+@pytest.mark.parametrize("mode", ["process", "serial"])
+def test_puntuador_propio_rechaza_modos_de_textblob(mode):
+    with pytest.raises(ValueError):
+        analyze_batch(["a"], mode=mode, scorer=_Constante())
@@ -0,0 +1,87 @@
+# tests/test_cache_sentimiento.py
+import itertools
+
+import numpy as np
+import pytest
+
+import cache_sentimiento
+from analisis_sentimiento import SCORER_VERSION, analyze_batch
+from cache_sentimiento import SentimentCache, content_key
+
+
+@pytest.fixture
+def reloj(monkeypatch):
+    """Reloj que avanza un segundo en cada lectura: el orden LRU no depende de empates."""
+    ticks = itertools.count(1)
+    monkeypatch.setattr(cache_sentimiento.time, "time", lambda: float(next(ticks)))
+
+
+@pytest.fixture
+def cache(tmp_path):
+    almacen = SentimentCache(str(tmp_path / "sentimiento.sqlite3"), max_entries=10)
+    yield almacen
+    almacen.close()
+
+
+def test_claves_versionadas():
+    assert content_key("good news", "v1") != content_key("good news", "v2")
+    # Solo la forma Unicode y los espacios se normalizan
+    assert content_key("good  news\n", "v1") == content_key("good news", "v1")
+    assert content_key("cafe\u0301", "v1") == content_key("caf\u00e9", "v1")
+    assert content_key("Good news", "v1") != content_key("good news", "v1")
+
+
+def test_aciertos_y_fallos(cache):
+    cache.put_many([("a", (0.5, 0.6)), ("b", (-0.2, 0.1))])
+    assert cache.get_many(["a", "b", "c"]) == {"a": (0.5, 0.6), "b": (-0.2, 0.1)}
+    stats = cache.stats()
+    assert (stats["entradas"], stats["aciertos"], stats["fallos"]) == (2, 2, 1)
+    assert stats["tasa_aciertos"] == pytest.approx(2 / 3)
+
+
+def test_desalojo_lru(cache, reloj):
+    cache.put_many([(f"k{i}", (0.0, 0.0)) for i in range(10)])
+    # Leer k0 lo convierte en la entrada usada más recientemente
+    cache.get_many(["k0"])
+    cache.put_many([("nueva", (1.0, 1.0))])
+    # 11 entradas con un máximo de 10: se desaloja 1 más un 10 % extra
+    guardadas = cache.get_many([f"k{i}" for i in range(10)] + ["nueva"])
+    assert set(guardadas) == {"k0", "nueva"} | {f"k{i}" for i in range(3, 10)}
+    assert cache.stats()["desalojos"] == 2
+
+
+def test_persistente_entre_instancias(tmp_path):
+    ruta = str(tmp_path / "sentimiento.sqlite3")
+    primera = SentimentCache(ruta)
+    primera.put_many([("a", (0.5, 0.6))])
+    primera.close()
+    segunda = SentimentCache(ruta)
+    assert segunda.get_many(["a"]) == {"a": (0.5, 0.6)}
+    segunda.close()
+
+
+def test_clear(cache):
+    cache.put_many([("a", (0.5, 0.6))])
+    cache.get_many(["a", "b"])
+    cache.clear()
+    assert cache.stats() == {"entradas": 0, "aciertos": 0, "fallos": 0, "desalojos": 0, "tasa_aciertos": 0.0}
+
+
+def test_analyze_batch_reutiliza_el_almacen(tmp_path):
+    cache = SentimentCache(str(tmp_path / "sentimiento.sqlite3"))
+    textos = ["good news", "bad news", "good news", "nothing"]
+    primero = analyze_batch(textos, mode="lexicon", cache=cache)
+    assert cache.stats()["entradas"] == 3
+    # La segunda vez todo sale del almacén con los mismos valores
+    segundo = analyze_batch(textos, mode="lexicon", cache=cache)
+    np.testing.assert_array_equal(primero["polarity"], segundo["polarity"])
+    assert cache.stats()["aciertos"] == 3
+    assert set(cache.get_many([content_key("good news", SCORER_VERSION)]))
+    cache.close()
+
+
+def test_modo_serial_no_usa_el_almacen(tmp_path):
+    cache = SentimentCache(str(tmp_path / "sentimiento.sqlite3"))
+    analyze_batch(["good news"], mode="serial", cache=cache)
+    assert cache.stats()["entradas"] == 0
+    cache.close()
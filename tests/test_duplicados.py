@@ -0,0 +1,60 @@
+# tests/test_duplicados.py
+import numpy as np
+
+from duplicados import collapse_near_duplicates, group_near_duplicates, minhash_signatures, normalize_title
+
+
+def test_normalize_title():
+    assert normalize_title("Apple Beats Estimates, Shares Rise - Reuters") == "apple beats estimates shares rise"
+    assert normalize_title("") == normalize_title(None) == ""
+
+
+def test_duplicados_exactos_y_casi_duplicados():
+    titulos = [
+        "apple reports record quarterly revenue driven by iphone sales in china",
+        "tesla recalls two million vehicles over autopilot safety concerns",
+        "apple reports record quarterly revenue driven by iphone sales in china",
+        "apple reports record quarterly revenue driven by strong iphone sales in china",
+    ]
+    grupos = group_near_duplicates(titulos)
+    assert grupos.tolist() == [0, 1, 0, 0]
+
+
+def test_titulos_distintos_separados():
+    titulos = [
+        "federal reserve holds interest rates steady",
+        "oil prices climb after opec output cut",
+        "microsoft unveils new surface laptops",
+        "federal reserve signals cuts later this year",
+    ]
+    assert group_near_duplicates(titulos).tolist() == [0, 1, 2, 3]
+
+
+def test_titulos_vacios_y_cortos():
+    titulos = ["", "nvidia", "", "nvidia", "amd", "   "]
+    firmas = minhash_signatures(titulos)
+    assert (firmas[[0, 2, 5]] == -1).all() and (firmas[[1, 3, 4]] >= 0).all()
+    # Los vacíos no se agrupan entre sí; una palabra igual sí
+    assert group_near_duplicates(titulos).tolist() == [0, 1, 2, 1, 4, 5]
+    assert group_near_duplicates([]).tolist() == []
+
+
+def test_firmas_deterministas():
+    titulos = ["stocks rally as inflation cools", "bond yields fall"]
+    np.testing.assert_array_equal(minhash_signatures(titulos), minhash_signatures(titulos))
+    np.testing.assert_array_equal(minhash_signatures(titulos)[1], minhash_signatures(titulos[1:])[0])
+
+
+def test_collapse_lleva_los_enlaces_del_grupo():
+    entradas = [
+        {'title': "Amazon to cut 10,000 jobs in cost review - Reuters", 'link': "a"},
+        {'title': "Bitcoin jumps above $40,000", 'link': "b"},
+        {'title': "Amazon to cut 10,000 jobs in cost review - Bloomberg", 'link': "c"},
+        {'title': "Amazon to cut 10,000 jobs in cost review", 'link': "d"},
+    ]
+    colapsadas = collapse_near_duplicates(entradas)
+    assert [e['link'] for e in colapsadas] == ["a", "b"]
+    assert colapsadas[0]['group_size'] == 3 and colapsadas[0]['group_links'] == ["c", "d"]
+    assert colapsadas[1]['group_size'] == 1 and colapsadas[1]['group_links'] == []
+    assert colapsadas[0]['title'] == entradas[0]['title']
+    assert collapse_near_duplicates([]) == []
@@ -0,0 +1,90 @@
+# tests/test_exportacion.py
+import gzip
+import io
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import exportacion
+from exportacion import dataframe_fingerprint, export_dataframe
+
+
+@pytest.fixture
+def articulos():
+    n = 25
+    return pd.DataFrame({
+        "title": [f"Título {i}, con comas y \"comillas\"" for i in range(n)],
+        "polarity": np.linspace(-1, 1, n),
+        "sentiment": pd.Categorical(["Positivo", "Neutro", "Negativo", "Neutro", "Positivo"] * 5),
+        "group_links": [[f"https://a.com/{i}", f"https://b.com/{i}?q=1"] if i % 3 else [] for i in range(n)],
+    })
+
+
+@pytest.mark.parametrize("chunk_rows", [7, 1000])
+def test_csv_ida_y_vuelta(articulos, chunk_rows):
+    leido = pd.read_csv(io.BytesIO(export_dataframe(articulos, "CSV", chunk_rows=chunk_rows)))
+    assert list(leido.columns) == list(articulos.columns)
+    assert leido["title"].tolist() == articulos["title"].tolist()
+    np.testing.assert_allclose(leido["polarity"], articulos["polarity"])
+    # Las listas se escriben separadas por espacios, no como su repr
+    enlaces = leido["group_links"].fillna("").str.split().tolist()
+    assert enlaces == [list(v) for v in articulos["group_links"]]
+
+
+def test_listas_de_arrow_en_csv(articulos):
+    # Leídas de Parquet, las listas llegan como arreglos de NumPy
+    desde_parquet = pd.read_parquet(io.BytesIO(export_dataframe(articulos, "Parquet")))
+    assert isinstance(desde_parquet["group_links"].iloc[1], np.ndarray)
+    assert export_dataframe(desde_parquet, "CSV") == export_dataframe(articulos, "CSV")
+
+
+def test_gzip_ida_y_vuelta(articulos):
+    comprimido = export_dataframe(articulos, "CSV comprimido (gzip)", chunk_rows=10)
+    assert gzip.decompress(comprimido) == export_dataframe(articulos, "CSV")
+    # mtime=0: misma entrada, mismos bytes
+    assert comprimido == export_dataframe(articulos, "CSV comprimido (gzip)", chunk_rows=10)
+
+
+@pytest.mark.parametrize("chunk_rows", [7, 1000])
+def test_parquet_ida_y_vuelta(articulos, chunk_rows):
+    leido = pd.read_parquet(io.BytesIO(export_dataframe(articulos, "Parquet", chunk_rows=chunk_rows)))
+    assert leido["title"].tolist() == articulos["title"].tolist()
+    np.testing.assert_array_equal(leido["polarity"], articulos["polarity"])
+    assert leido["sentiment"].astype(str).tolist() == articulos["sentiment"].astype(str).tolist()
+    assert [list(v) for v in leido["group_links"]] == [list(v) for v in articulos["group_links"]]
+
+
+def test_parquet_con_indice():
+    precios = pd.DataFrame({"Close": [1.0, 2.0, 3.0]},
+                           index=pd.date_range("2025-03-03", periods=3, name="Date"))
+    pd.testing.assert_frame_equal(
+        pd.read_parquet(io.BytesIO(export_dataframe(precios, "Parquet", index=True))), precios, check_freq=False
+    )
+    leido = pd.read_csv(io.BytesIO(export_dataframe(precios, "CSV", index=True)), index_col="Date", parse_dates=True)
+    np.testing.assert_array_equal(leido["Close"], precios["Close"])
+
+
+def test_archivo_grande_pasa_por_disco(articulos, monkeypatch):
+    monkeypatch.setattr(exportacion, "MAX_BYTES_MEMORIA", 64)
+    assert export_dataframe(articulos, "CSV", chunk_rows=5) == export_dataframe(articulos, "CSV")
+
+
+def test_tabla_vacia_y_formato_desconocido(articulos):
+    vacio = pd.read_csv(io.BytesIO(export_dataframe(articulos.iloc[:0], "CSV")))
+    assert list(vacio.columns) == list(articulos.columns) and vacio.empty
+    assert pd.read_parquet(io.BytesIO(export_dataframe(articulos.iloc[:0], "Parquet"))).empty
+    with pytest.raises(ValueError):
+        export_dataframe(articulos, "XLSX")
+
+
+def test_huella_estable(articulos):
+    huella = dataframe_fingerprint(articulos)
+    assert dataframe_fingerprint(articulos) == huella
+    assert dataframe_fingerprint(articulos.copy(deep=True)) == huella
+
+    cambiado = articulos.copy()
+    cambiado.loc[3, "polarity"] += 1e-9
+    assert dataframe_fingerprint(cambiado) != huella
+    assert dataframe_fingerprint(articulos.rename(columns={"title": "titulo"})) != huella
+    assert dataframe_fingerprint(articulos.iloc[::-1]) != huella
@@ -0,0 +1,105 @@
+# tests/test_indicadores.py
+import numpy as np
+import pandas as pd
+import pytest
+
+from indicadores import (
+    SESIONES_ANIO,
+    betas,
+    caidas,
+    matriz_correlacion,
+    metricas_riesgo,
+    rendimientos_cartera,
+    valor_acumulado,
+    volatilidad_movil
+)
+
+
+@pytest.fixture
+def rendimientos():
+    """Rendimientos de cuatro tickers con huecos: uno que empieza tarde y NaN sueltos."""
+    rng = np.random.default_rng(7)
+    n = 400
+    mercado = rng.normal(0.0004, 0.01, n)
+    datos = pd.DataFrame({
+        "TSLA": 1.8 * mercado + rng.normal(0, 0.02, n),
+        "AAPL": 1.1 * mercado + rng.normal(0, 0.008, n),
+        "MSFT": 0.9 * mercado + rng.normal(0, 0.007, n),
+        "NUEVA": rng.normal(0, 0.03, n),
+    }, index=pd.bdate_range("2023-01-02", periods=n))
+    datos.iloc[:250, 3] = np.nan
+    datos.iloc[rng.choice(n, 30, replace=False), 0] = np.nan
+    datos.iloc[rng.choice(n, 10, replace=False), 1] = np.nan
+    datos["Mercado"] = mercado
+    return datos
+
+
+@pytest.mark.parametrize("ventana", [5, 21, 60])
+def test_volatilidad_movil_como_pandas(rendimientos, ventana):
+    esperado = rendimientos.rolling(ventana, min_periods=ventana).std()
+    pd.testing.assert_frame_equal(volatilidad_movil(rendimientos, ventana, anualizar=False), esperado,
+                                  rtol=1e-9, atol=1e-15)
+    pd.testing.assert_frame_equal(volatilidad_movil(rendimientos, ventana),
+                                  esperado * np.sqrt(SESIONES_ANIO), rtol=1e-9, atol=1e-15)
+
+
+@pytest.mark.parametrize("min_observaciones", [2, 100, 200])
+def test_matriz_correlacion_como_pandas(rendimientos, min_observaciones):
+    esperado = rendimientos.corr(min_periods=min_observaciones)
+    obtenido = matriz_correlacion(rendimientos, min_observaciones)
+    pd.testing.assert_frame_equal(obtenido, esperado, rtol=1e-9, atol=1e-12)
+    # NUEVA solo tiene 150 sesiones: sin correlaciones con min_observaciones=200
+    assert obtenido["NUEVA"].isna().all() == (min_observaciones > 150)
+
+
+@pytest.mark.parametrize("min_observaciones", [2, 200])
+def test_betas_como_cov_entre_var(rendimientos, min_observaciones):
+    referencia = rendimientos["Mercado"]
+    obtenido = betas(rendimientos, referencia, min_observaciones)
+    for columna in rendimientos:
+        comunes = rendimientos[[columna]].assign(ref=referencia).dropna()
+        if len(comunes) < min_observaciones:
+            assert np.isnan(obtenido[columna])
+            continue
+        esperado = comunes[columna].cov(comunes["ref"]) / comunes["ref"].var()
+        assert obtenido[columna] == pytest.approx(esperado, rel=1e-9)
+    assert obtenido["Mercado"] == pytest.approx(1.0)
+    assert obtenido["TSLA"] > obtenido["AAPL"] > obtenido["MSFT"]
+
+
+def test_betas_referencia_con_otro_indice(rendimientos):
+    # La referencia se alinea por fecha y los días que le faltan no cuentan
+    referencia = rendimientos["Mercado"].iloc[::2]
+    obtenido = betas(rendimientos[["AAPL"]], referencia)
+    comunes = rendimientos[["AAPL"]].assign(ref=referencia).dropna()
+    assert obtenido["AAPL"] == pytest.approx(comunes["AAPL"].cov(comunes["ref"]) / comunes["ref"].var())
+
+
+def test_valor_acumulado_y_caidas(rendimientos):
+    valor = valor_acumulado(rendimientos)
+    for columna in rendimientos:
+        serie = rendimientos[columna]
+        esperado = (1 + serie.fillna(0)).cumprod().where(serie.notna().cumsum() > 0)
+        np.testing.assert_allclose(valor[columna], esperado, rtol=1e-12)
+        maximo = np.maximum(esperado.cummax(), 1.0)
+        np.testing.assert_allclose(caidas(rendimientos)[columna], esperado / maximo - 1.0, rtol=1e-12)
+    assert (caidas(rendimientos).fillna(0) <= 0).all().all()
+    assert caidas(rendimientos)["NUEVA"].iloc[:250].isna().all()
+
+
+def test_caida_con_perdida_desde_el_inicio():
+    r = pd.DataFrame({"A": [-0.1, -0.1, 0.05]})
+    np.testing.assert_allclose(caidas(r)["A"], [0.9 - 1, 0.81 - 1, 0.81 * 1.05 - 1])
+
+
+def test_cartera_y_metricas(rendimientos):
+    cierres = (1 + rendimientos.drop(columns="Mercado").fillna(0)).cumprod() * 100
+    cierres.iloc[:250, 3] = np.nan
+    cartera = rendimientos_cartera(cierres)
+    esperada = cartera.drop(columns="Cartera").mean(axis=1, skipna=True)
+    np.testing.assert_allclose(cartera["Cartera"], esperada, rtol=1e-12)
+
+    metricas = metricas_riesgo(rendimientos, rendimientos["Mercado"])
+    np.testing.assert_allclose(metricas["Volatilidad diaria"], rendimientos.std(), rtol=1e-9)
+    np.testing.assert_allclose(metricas["Máxima caída"], caidas(rendimientos).min(), rtol=1e-12)
+    np.testing.assert_allclose(metricas["Beta"], betas(rendimientos, rendimientos["Mercado"]))
@@ -0,0 +1,133 @@
+# tests/test_instrumentacion.py
+import json
+import threading
+import tracemalloc
+
+import pytest
+
+import instrumentacion
+from instrumentacion import Registro
+
+MB = 2**20
+
+
+@pytest.fixture
+def memoria():
+    ya_activa = tracemalloc.is_tracing()
+    tracemalloc.start()
+    yield
+    if not ya_activa:
+        tracemalloc.stop()
+
+
+def _reservar(n):
+    bloque = bytearray(n)
+    del bloque
+
+
+def test_span_registra_llamadas_y_tiempo():
+    registro = Registro()
+    for _ in range(3):
+        with registro.span("etapa"):
+            pass
+    etapa = registro.instantanea()["etapa"]
+    assert etapa["llamadas"] == 3 and etapa["segundos_total"] >= etapa["segundos_max"] >= 0
+    assert etapa["memoria_pico_bytes"] is None
+    registro.reiniciar()
+    assert registro.instantanea() == {}
+
+
+def test_span_registra_aunque_falle():
+    registro = Registro()
+    with pytest.raises(ZeroDivisionError):
+        with registro.span("falla"):
+            1 / 0
+    assert registro.instantanea()["falla"]["llamadas"] == 1
+
+
+def test_spans_anidados_memoria(memoria):
+    registro = Registro()
+    with registro.span("externa"):
+        _reservar(2 * MB)
+        with registro.span("interna"):
+            _reservar(8 * MB)
+        _reservar(1 * MB)
+    etapas = registro.instantanea()
+    interna, externa = etapas["interna"]["memoria_pico_bytes"], etapas["externa"]["memoria_pico_bytes"]
+    assert 8 * MB <= interna < 9 * MB
+    # El pico de la interna cuenta para la externa aunque ocurriera antes de su final
+    assert externa >= interna
+
+
+def test_spans_concurrentes_sin_memoria(memoria):
+    registro = Registro()
+    dentro, salir = threading.Barrier(2), threading.Event()
+
+    def sesion(nombre):
+        with registro.span(nombre):
+            _reservar(MB)
+            dentro.wait()
+            salir.wait()
+
+    hilos = [threading.Thread(target=sesion, args=(f"sesion{i}",)) for i in range(2)]
+    for hilo in hilos:
+        hilo.start()
+    salir.set()
+    for hilo in hilos:
+        hilo.join()
+    etapas = registro.instantanea()
+    assert [etapas[f"sesion{i}"]["llamadas"] for i in range(2)] == [1, 1]
+    assert [etapas[f"sesion{i}"]["memoria_pico_bytes"] for i in range(2)] == [None, None]
+
+    # Sin solapamiento vuelve a medirse
+    with registro.span("sesion0"):
+        _reservar(MB)
+    assert registro.instantanea()["sesion0"]["memoria_pico_bytes"] >= MB
+
+
+def test_prometheus():
+    registro = Registro()
+    registro.registrar("noticias.descarga", 0.5)
+    registro.registrar("noticias.descarga", 1.5, pico_bytes=2048)
+    registro.registrar('raro "etapa"\\x', 0.25)
+    texto = registro.a_prometheus()
+    lineas = texto.splitlines()
+    assert texto.endswith("\n")
+    assert "# TYPE analizador_etapa_llamadas_total counter" in lineas
+    assert 'analizador_etapa_llamadas_total{etapa="noticias.descarga"} 2' in lineas
+    assert 'analizador_etapa_segundos_total{etapa="noticias.descarga"} 2.0' in lineas
+    assert 'analizador_etapa_segundos_max{etapa="noticias.descarga"} 1.5' in lineas
+    assert 'analizador_etapa_memoria_pico_bytes{etapa="noticias.descarga"} 2048' in lineas
+    assert 'analizador_etapa_llamadas_total{etapa="raro \\"etapa\\"\\\\x"} 1' in lineas
+    # Sin memoria medida, la etapa no aparece en esa métrica
+    assert not any(l.startswith('analizador_etapa_memoria_pico_bytes{etapa="raro') for l in lineas)
+    assert Registro().a_prometheus() == "\n"
+
+
+def test_json_lines(tmp_path, monkeypatch):
+    ruta = tmp_path / "eventos.jsonl"
+    monkeypatch.setattr(instrumentacion, "RUTA_JSONL", str(ruta))
+    registro = Registro()
+    with registro.span("a"):
+        pass
+    registro.registrar("b", 2.0, pico_bytes=10)
+
+    eventos = [json.loads(l) for l in ruta.read_text(encoding="utf-8").splitlines()]
+    assert [e["etapa"] for e in eventos] == ["a", "b"]
+    assert eventos[1]["segundos"] == 2.0 and eventos[1]["memoria_pico_bytes"] == 10
+
+    agregados = [json.loads(l) for l in registro.a_json_lines().splitlines()]
+    assert [a["etapa"] for a in agregados] == ["a", "b"]
+    assert agregados[1]["llamadas"] == 1 and agregados[1]["memoria_pico_bytes"] == 10
+
+
+def test_medido(monkeypatch):
+    registro = Registro()
+    monkeypatch.setattr(instrumentacion, "registro", registro)
+
+    @instrumentacion.medido("suma")
+    def suma(a, b):
+        return a + b
+
+    assert suma(2, 3) == 5 and suma.__name__ == "suma"
+    assert registro.instantanea()["suma"]["llamadas"] == 1
@@ -0,0 +1,99 @@
+# tests/test_lote_sentimiento.py
+import json
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import pandas as pd
+import pytest
+
+from lote_sentimiento import ARCHIVO_CONTROL, directorio_particion, ejecutar_lote, leer_control, leer_temas
+
+FEED_GRABADO = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                            "benchmarks", "fixtures", "google_news_tecnologia.xml")
+FECHA = "2025-03-03"
+
+
+class _Feeds(BaseHTTPRequestHandler):
+    """Sirve el feed grabado; los temas de ``server.fallidos`` responden 500."""
+
+    def do_GET(self):
+        tema = parse_qs(urlsplit(self.path).query)["q"][0]
+        self.server.peticiones.append(tema)
+        if tema in self.server.fallidos:
+            self.send_error(500)
+            return
+        with open(FEED_GRABADO, "rb") as f:
+            cuerpo = f.read()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/rss+xml")
+        self.send_header("Content-Length", str(len(cuerpo)))
+        self.end_headers()
+        self.wfile.write(cuerpo)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def servidor():
+    servidor = ThreadingHTTPServer(("127.0.0.1", 0), _Feeds)
+    servidor.daemon_threads = True
+    servidor.peticiones = []
+    servidor.fallidos = set()
+    hilo = threading.Thread(target=servidor.serve_forever, daemon=True)
+    hilo.start()
+    yield servidor
+    servidor.shutdown()
+    servidor.server_close()
+
+
+def _lote(servidor, salida, temas):
+    plantilla = f"http://127.0.0.1:{servidor.server_address[1]}/rss/search?q={{topic}}"
+    return ejecutar_lote(temas, str(salida), FECHA, procesos=1, max_articulos=20,
+                         url_plantilla=plantilla, ruta_cache=None, informar=lambda _: None)
+
+
+def test_reanuda_solo_los_temas_fallidos(servidor, tmp_path):
+    temas = ["tecnología", "bolsa", "energía solar"]
+    servidor.fallidos = {"bolsa"}
+    resumen = _lote(servidor, tmp_path, temas)
+    assert (resumen["ok"], resumen["error"], resumen["articulos"]) == (2, 1, 40)
+    estados = leer_control(os.path.join(tmp_path, f"fecha={FECHA}", ARCHIVO_CONTROL))
+    assert {t: e["estado"] for t, e in estados.items()} == {"tecnología": "ok", "bolsa": "error",
+                                                             "energía solar": "ok"}
+    assert not os.path.exists(directorio_particion(tmp_path, FECHA, "bolsa"))
+
+    # La segunda ejecución solo vuelve a pedir el tema que falló
+    servidor.fallidos = set()
+    servidor.peticiones.clear()
+    resumen = _lote(servidor, tmp_path, temas)
+    assert servidor.peticiones == ["bolsa"]
+    assert (resumen["omitidos"], resumen["ok"], resumen["error"]) == (2, 1, 0)
+
+    # Una tercera no tiene nada pendiente
+    servidor.peticiones.clear()
+    assert _lote(servidor, tmp_path, temas)["omitidos"] == 3 and servidor.peticiones == []
+
+    # Las particiones fecha=/tema= se leen de vuelta como columnas
+    df = pd.read_parquet(tmp_path)
+    assert len(df) == 60
+    # pyarrow decodifica el tema codificado en la ruta
+    assert sorted(df["tema"].astype(str).unique()) == sorted(temas)
+    assert set(df["fecha"].astype(str)) == {FECHA}
+    assert {"title", "sentiment", "polarity"} <= set(df.columns)
+
+
+def test_control_ignora_lineas_a_medias(tmp_path):
+    ruta = tmp_path / ARCHIVO_CONTROL
+    ruta.write_text(json.dumps({"tema": "a", "estado": "error"}) + "\n"
+                    + json.dumps({"tema": "a", "estado": "ok"}) + "\n{\"tema\": \"b\", \"est",
+                    encoding="utf-8")
+    assert leer_control(ruta) == {"a": {"tema": "a", "estado": "ok"}}
+
+
+def test_leer_temas(tmp_path):
+    ruta = tmp_path / "temas.txt"
+    ruta.write_text("tecnología\n\n# comentario\nbolsa\n tecnología \n", encoding="utf-8")
+    assert leer_temas(ruta) == ["tecnología", "bolsa"]
@@ -0,0 +1,72 @@
+# tests/test_modelo_sentimiento.py
+import numpy as np
+import pandas as pd
+import pytest
+
+from analisis_sentimiento import analyze_batch
+from modelo_sentimiento import ModeloSentimiento, entrenar, leer_etiquetado, main
+
+TEXTOS = [
+    "great earnings beat, shares soar", "strong growth and record profit", "excellent results, stock rallies",
+    "terrible loss, shares plunge", "weak sales and massive layoffs", "awful guidance, stock collapses",
+    "company holds annual meeting", "board schedules quarterly call", "firm publishes annual report",
+]
+ETIQUETAS = ["Positivo"] * 3 + ["Negativo"] * 3 + ["Neutro"] * 3
+NUEVOS = ["record profit and strong growth", "shares plunge after weak sales", "annual meeting scheduled"]
+
+
+@pytest.fixture(scope="module")
+def modelo():
+    return entrenar(TEXTOS, ETIQUETAS, n_features=2**12)
+
+
+def test_predicciones(modelo):
+    probabilidades = modelo.predict_proba(NUEVOS)
+    np.testing.assert_allclose(probabilidades.sum(axis=1), 1.0)
+    assert list(np.array(modelo.clases)[probabilidades.argmax(axis=1)]) == ["Positivo", "Negativo", "Neutro"]
+
+    polaridad, subjetividad = modelo.score(NUEVOS)
+    assert polaridad[0] > 0 > polaridad[1] and abs(polaridad[2]) < polaridad[0]
+    assert subjetividad[2] < subjetividad[0]
+    assert [len(x) for x in modelo.score([])] == [0, 0]
+
+
+def test_guardar_y_cargar(modelo, tmp_path):
+    ruta = tmp_path / "modelo.npz"
+    modelo.guardar(ruta)
+    cargado = ModeloSentimiento.cargar(ruta)
+    assert cargado.clases == modelo.clases and cargado.parametros == modelo.parametros
+    for original, leido in zip(modelo.score(NUEVOS + TEXTOS), cargado.score(NUEVOS + TEXTOS)):
+        np.testing.assert_array_equal(original, leido)
+    # La versión depende del contenido del archivo
+    assert cargado.version == ModeloSentimiento.cargar(ruta).version != modelo.version
+
+
+def test_analyze_batch_con_el_modelo(modelo):
+    resultado = analyze_batch(NUEVOS, scorer=modelo, mode="lexicon", threshold=0.1)
+    polaridad, _ = modelo.score(NUEVOS)
+    np.testing.assert_array_equal(resultado['polarity'], polaridad)
+    assert list(resultado['sentiment'][:2]) == ["Positivo", "Negativo"]
+
+
+@pytest.mark.parametrize("mode", ["process", "serial"])
+def test_analyze_batch_rechaza_modos_de_textblob(modelo, mode):
+    with pytest.raises(ValueError):
+        analyze_batch(NUEVOS, scorer=modelo, mode=mode)
+
+
+def test_leer_etiquetado(tmp_path):
+    ruta = tmp_path / "etiquetado.csv"
+    pd.DataFrame({"text": ["a", "b", "c"], "label": ["positive", "-1", " Neutro "]}).to_csv(ruta, index=False)
+    assert leer_etiquetado(ruta) == (["a", "b", "c"], ["Positivo", "Negativo", "Neutro"])
+
+    pd.DataFrame({"text": ["a"], "label": ["quizá"]}).to_csv(ruta, index=False)
+    with pytest.raises(ValueError):
+        leer_etiquetado(ruta)
+
+
+def test_main_entrena_y_guarda(tmp_path):
+    datos, salida = tmp_path / "etiquetado.csv", tmp_path / "modelos" / "nb.npz"
+    pd.DataFrame({"text": TEXTOS * 2, "label": ETIQUETAS * 2}).to_csv(datos, index=False)
+    assert main([str(datos), "--salida", str(salida), "--prueba", "0.25"]) == 0
+    assert ModeloSentimiento.cargar(salida).clases == ["Negativo", "Neutro", "Positivo"]
@@ -0,0 +1,138 @@
+# tests/test_noticias.py
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import feedparser
+import pytest
+
+from noticias import (
+    MAX_BLOQUE,
+    PRIMER_BLOQUE,
+    entry_to_raw,
+    fetch_entries_many,
+    iter_chunks,
+    remove_html_tags
+)
+
+FEED_GRABADO = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                            "benchmarks", "fixtures", "google_news_tecnologia.xml")
+ESPERA_LENTO = 3.0
+
+
+class _Feeds(BaseHTTPRequestHandler):
+    """Sirve el feed grabado; los temas ``falla`` y ``lento`` responden 500 o tarde."""
+
+    def do_GET(self):
+        tema = parse_qs(urlsplit(self.path).query)["q"][0]
+        self.server.peticiones.append(tema)
+        if tema == "falla":
+            self.send_error(500)
+            return
+        if tema == "lento":
+            time.sleep(ESPERA_LENTO)
+        with open(FEED_GRABADO, "rb") as f:
+            cuerpo = f.read()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/rss+xml")
+        self.send_header("Content-Length", str(len(cuerpo)))
+        self.end_headers()
+        try:
+            self.wfile.write(cuerpo)
+        except ConnectionError:
+            # El cliente ya abandonó la petición lenta por timeout
+            pass
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def servidor():
+    servidor = ThreadingHTTPServer(("127.0.0.1", 0), _Feeds)
+    servidor.daemon_threads = True
+    servidor.block_on_close = False
+    servidor.peticiones = []
+    hilo = threading.Thread(target=servidor.serve_forever, daemon=True)
+    hilo.start()
+    yield servidor
+    servidor.shutdown()
+    servidor.server_close()
+
+
+def _plantilla(servidor):
+    return f"http://127.0.0.1:{servidor.server_address[1]}/rss/search?q={{topic}}"
+
+
+def _esperadas(tema, max_articles=100):
+    feed = feedparser.parse(FEED_GRABADO)
+    return [{**entry_to_raw(entry), 'topic': tema} for entry in feed.entries[:max_articles]]
+
+
+def test_igual_que_feedparser(servidor):
+    entradas = fetch_entries_many(["tecnología"], url_template=_plantilla(servidor))
+    assert entradas == _esperadas("tecnología")
+    assert servidor.peticiones == ["tecnología"]
+
+
+def test_enlaces_repetidos_se_asignan_al_primer_tema(servidor):
+    entradas = fetch_entries_many(["tecnología", "economía"], max_articles=10,
+                                  url_template=_plantilla(servidor))
+    assert entradas == _esperadas("tecnología", 10)
+    assert sorted(servidor.peticiones) == ["economía", "tecnología"]
+
+
+def test_fallos_aislados_y_timeout(servidor):
+    errores = {}
+    inicio = time.perf_counter()
+    entradas = fetch_entries_many(
+        ["falla", "tecnología", "lento"], url_template=_plantilla(servidor), timeout=0.2,
+        on_error=lambda tema, e: errores.setdefault(tema, e)
+    )
+    transcurrido = time.perf_counter() - inicio
+    assert entradas == _esperadas("tecnología")
+    assert set(errores) == {"falla", "lento"}
+    assert "HTTP 500" in str(errores["falla"])
+    # Con reintentos incluidos, sin esperar a la respuesta lenta
+    assert transcurrido < ESPERA_LENTO
+
+
+def test_sin_temas():
+    assert fetch_entries_many(["", "  "]) == []
+
+
+HTML = [
+    # Marcado de los resúmenes de Google News (ruta rápida)
+    '<a href="https://news.google.com/x?oc=5" target="_blank">Título &amp; más</a>&nbsp;&nbsp;'
+    '<font color="#6f6f6f">El Tiempo</font>',
+    "Texto plano", "", " ", "  \n ", "a  b", "&lt;b&gt; no es etiqueta", "&#169; 2025 &copy; &#x27;x&#x27;",
+    # Etiquetas anidadas y tramos solo de espacios entre ellas
+    "<div><p>uno <b>dos <i>tres</i></b></p>\n<p>cuatro</p></div>", "<p> </p>", "</p>  <br/>\t", "<b>x</b>  ",
+    '<div\n class="c">multilínea</div>', "&#32;&#32;<b>entidad de espacio</b>", "<P>MAYÚSCULAS</P>",
+    # Marcado irregular (pasa por BeautifulSoup)
+    "a < b > c", "1 <3 2", "sin cierre <b", '<a title="x>y">atributo</a>', "&amp sin punto y coma",
+    "&desconocida; entidad", "<!-- comentario -->visible", "<script>oculto()</script>visible",
+    "<b>sin cerrar", "</i>cierre suelto",
+]
+
+
+@pytest.mark.parametrize("texto", HTML)
+def test_quitar_etiquetas_igual_que_beautifulsoup(texto):
+    from bs4 import BeautifulSoup
+
+    assert remove_html_tags(texto) == BeautifulSoup(texto, "html.parser").get_text()
+
+
+def test_quitar_etiquetas_vacio():
+    assert remove_html_tags(None) == remove_html_tags("") == ""
+
+
+def test_bloques_crecen_al_doble():
+    tamanos = [len(bloque) for bloque in iter_chunks(range(1000))]
+    assert (PRIMER_BLOQUE, MAX_BLOQUE) == (20, 200)
+    assert tamanos == [20, 40, 80, 160, 200, 200, 200, 100]
+    assert [x for bloque in iter_chunks(range(1000)) for x in bloque] == list(range(1000))
+    assert [len(b) for b in iter_chunks(range(5), first=2, maximum=3)] == [2, 3]
+    assert list(iter_chunks([])) == []
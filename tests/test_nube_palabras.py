@@ -0,0 +1,63 @@
+# tests/test_nube_palabras.py
+import os
+
+import feedparser
+import pytest
+from wordcloud import WordCloud
+
+from noticias import entry_to_raw, iter_articles
+from nube_palabras import TokenFrequencies
+
+FEED_GRABADO = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                            "benchmarks", "fixtures", "google_news_tecnologia.xml")
+
+TEXTOS = [
+    "Apple's stock rallies as Apple shares hit a record; apple STOCK Stocks 2024",
+    "Wall Street rallies: Wall Street closes higher, Wall Street banks gain",
+    "The Fed's rate cuts: the Fed cut rates, Fed rate cut hopes lift Wall Street",
+    "buses buss bus 123 45th it's", "", "Wall Street Wall Street Wall Street Wall Street",
+]
+
+
+@pytest.fixture(scope="module")
+def articulos():
+    feed = feedparser.parse(FEED_GRABADO)
+    return list(iter_articles({**entry_to_raw(e), 'topic': "tecnología"} for e in feed.entries))
+
+
+def _referencia(textos):
+    return WordCloud().process_text(" ".join(textos))
+
+
+def test_igual_que_process_text():
+    frecuencias = TokenFrequencies()
+    for texto in TEXTOS:
+        frecuencias.add_text(texto)
+    esperado = _referencia(TEXTOS)
+    assert frecuencias.frequencies() == esperado
+    # El caso incluye plurales, mayúsculas, "'s", números y una colocación
+    assert esperado["Wall Street"] == 8 and "Wall" not in esperado
+    assert esperado["stock"] == 3 and esperado["Apple"] == 3 and esperado["rate"] == 3
+
+
+def test_igual_que_process_text_con_el_feed(articulos):
+    frecuencias = TokenFrequencies()
+    # Por bloques, como en la página de análisis
+    for inicio in range(0, len(articulos), 7):
+        frecuencias.add_articles(articulos[inicio:inicio + 7])
+    esperado = _referencia([a['title'] + " " + a['summary'] for a in articulos])
+    assert frecuencias.frequencies() == esperado
+    assert any(" " in palabra for palabra in esperado)
+
+
+def test_huella_y_cache():
+    frecuencias = TokenFrequencies()
+    assert not frecuencias and frecuencias.frequencies() == {}
+    frecuencias.add_text("market rally")
+    huella, tabla = frecuencias.fingerprint(), frecuencias.frequencies()
+    assert frecuencias.frequencies() is tabla
+    frecuencias.add_text("the of and")  # solo palabras vacías: los conteos no cambian
+    assert frecuencias.fingerprint() == huella
+    frecuencias.add_text("market")
+    assert frecuencias.fingerprint() != huella and frecuencias.frequencies()["market"] == 2
+    assert frecuencias.nbytes() > 0
@@ -0,0 +1,36 @@
+# tests/test_resultados_sesion.py
+from nube_palabras import TokenFrequencies
+from resultados_sesion import SessionResults, result_key
+from tendencias import SentimentRollups
+
+
+def _articulos(n, tema="t"):
+    return [dict(title=f"{tema} {i}", summary="s", link=f"{tema}{i}",
+                 published="Sat, 17 Oct 2026 12:00:00 GMT", sentiment="Neutro",
+                 polarity=0.0, subjectivity=0.0) for i in range(n)]
+
+
+def test_clave_incluye_los_parametros_del_analisis():
+    claves = {
+        result_key("tesla"),
+        result_key("tesla", max_articles=500),
+        result_key("tesla", group_duplicates=False),
+        result_key("tesla", scorer="modelo"),
+    }
+    assert len(claves) == 4
+    assert result_key("tesla") == result_key("tesla", "textblob", 100, True)
+
+
+def test_otro_maximo_no_reutiliza_el_resultado():
+    resultados = SessionResults()
+    resultados.put(result_key("tesla", max_articles=10), _articulos(10), TokenFrequencies(), SentimentRollups())
+    assert resultados.get(result_key("tesla", max_articles=50)) is None
+    assert len(resultados.get(result_key("tesla", max_articles=10)).df) == 10
+
+
+def test_presupuesto_conserva_el_actual():
+    resultados = SessionResults(budget_mb=0)
+    resultados.put("a", _articulos(50, "a"), TokenFrequencies(), SentimentRollups())
+    desalojados = resultados.put("b", _articulos(50, "b"), TokenFrequencies(), SentimentRollups())
+    assert desalojados == ["a"]
+    assert resultados.keys() == ["b"] and resultados.current.key == "b"
@@ -0,0 +1,78 @@
+# tests/test_sentimiento_vs_precios.py
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+import streamlit as st
+from streamlit.testing.v1 import AppTest
+
+import almacen_precios
+from almacen_precios import DescargadorFalso
+from nube_palabras import TokenFrequencies
+from resultados_sesion import SessionResults
+from tendencias import SentimentRollups
+
+PAGINA = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                      "pages", "03Sentimiento vs Precios.py")
+
+
+@pytest.fixture
+def app(tmp_path, monkeypatch):
+    """Página con artículos analizados en la sesión y precios sintéticos sin red."""
+    falso, conjuntas = DescargadorFalso(), []
+
+    def descargar_varios(tickers, inicio, fin):
+        conjuntas.append(list(tickers))
+        return {t: falso(t, inicio, fin) for t in tickers}
+
+    monkeypatch.setenv("PRECIOS_CACHE", str(tmp_path))
+    monkeypatch.setattr(almacen_precios, "descargar_yfinance", falso)
+    monkeypatch.setattr(almacen_precios, "descargar_yfinance_varios", descargar_varios)
+    st.cache_resource.clear()
+    st.cache_data.clear()
+
+    rng = np.random.default_rng(0)
+    fechas = pd.date_range("2025-01-01", "2025-12-31", freq="D").strftime("%a, %d %b %Y 12:00:00 GMT")
+    articulos = [
+        dict(title="t", summary="s", link=f"l{i}", published=fecha,
+             sentiment="Neutro", polarity=float(p), subjectivity=0.1)
+        for i, (fecha, p) in enumerate(zip(rng.choice(fechas, 1500), rng.normal(0, 0.3, 1500)))
+    ]
+    resultados = SessionResults()
+    resultados.put("tema", articulos, TokenFrequencies(), SentimentRollups())
+
+    app = AppTest.from_file(PAGINA, default_timeout=60)
+    app.session_state["results"] = resultados
+    app.conjuntas = conjuntas
+    yield app
+    st.cache_resource.clear()
+
+
+def _slider(app, etiqueta):
+    return next((s for s in app.sidebar.slider if s.label.startswith(etiqueta)), None)
+
+
+def test_correlaciones_con_rezagos(app):
+    app.run()
+    assert not app.exception
+    assert _slider(app, "Rezago de la correlación móvil") is not None
+    assert app.get("plotly_chart")
+
+
+def test_una_descarga_para_varias_empresas(app):
+    app.run()
+    app.sidebar.multiselect[0].select("Apple (AAPL)").run()
+    assert not app.exception
+    # TSLA ya estaba en el almacén; AAPL llega en una descarga conjunta
+    assert app.conjuntas == [["TSLA"], ["AAPL"]]
+    app.sidebar.multiselect[0].select("Microsoft (MSFT)").select("Amazon (AMZN)").run()
+    assert app.conjuntas[-1] == ["MSFT", "AMZN"]
+
+
+def test_rezago_maximo_cero(app):
+    app.run()
+    _slider(app, "Rezago máximo").set_value(0).run()
+    assert not app.exception
+    assert _slider(app, "Rezago de la correlación móvil") is None
+    assert app.get("plotly_chart")
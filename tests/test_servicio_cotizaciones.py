@@ -0,0 +1,123 @@
+# tests/test_servicio_cotizaciones.py
+import threading
+import time
+
+import pytest
+
+from servicio_cotizaciones import ServicioCotizaciones
+
+SIMBOLOS = ["^GSPC", "AAPL"]
+
+
+class DescargadorFalso:
+    """Devuelve ``respuestas`` en orden (la última se repite); una excepción se lanza.
+
+    Con ``bloquear`` puesto, cada descarga espera a ``liberar`` antes de responder.
+    """
+
+    def __init__(self, *respuestas, bloquear=False):
+        self.respuestas = list(respuestas) or [{"^GSPC": 5000.0, "AAPL": 200.0}]
+        self.llamadas = 0
+        self.empezada = threading.Event()
+        self.liberar = threading.Event()
+        if not bloquear:
+            self.liberar.set()
+
+    def __call__(self, simbolos):
+        self.llamadas += 1
+        self.empezada.set()
+        self.liberar.wait(5)
+        respuesta = self.respuestas[min(self.llamadas, len(self.respuestas)) - 1]
+        if isinstance(respuesta, Exception):
+            raise respuesta
+        return dict(respuesta)
+
+
+@pytest.fixture
+def servicios():
+    creados = []
+
+    def crear(*args, **kwargs):
+        creados.append(ServicioCotizaciones(*args, **kwargs))
+        return creados[-1]
+
+    yield crear
+    for servicio in creados:
+        servicio.detener()
+
+
+def test_refresco_periodico(servicios):
+    descargador = DescargadorFalso({"AAPL": 1.0}, {"AAPL": 2.0}, {"AAPL": 3.0})
+    servicio = servicios(SIMBOLOS, ttl=0.05, descargador=descargador).iniciar()
+    assert servicio.iniciar() is servicio  # un solo hilo aunque se llame dos veces
+    limite = time.time() + 5
+    while servicio.instantanea().precios != {"AAPL": 3.0} and time.time() < limite:
+        time.sleep(0.01)
+    assert servicio.instantanea().precios == {"AAPL": 3.0} and descargador.llamadas >= 3
+    assert servicio.instantanea().edad < 1
+
+
+def test_descarga_en_curso_compartida(servicios):
+    descargador = DescargadorFalso(bloquear=True)
+    servicio = servicios(SIMBOLOS, descargador=descargador)
+    resultados = []
+    hilos = [threading.Thread(target=lambda: resultados.append(servicio.refrescar())) for _ in range(5)]
+    hilos[0].start()
+    assert descargador.empezada.wait(5)
+    for hilo in hilos[1:]:
+        hilo.start()
+    time.sleep(0.05)
+    assert resultados == []  # todas esperan a la descarga en curso
+    descargador.liberar.set()
+    for hilo in hilos:
+        hilo.join(5)
+    assert descargador.llamadas == 1
+    assert len(resultados) == 5 and all(r is resultados[0] for r in resultados)
+    # Terminada la descarga, la siguiente petición descarga de nuevo
+    servicio.refrescar()
+    assert descargador.llamadas == 2
+
+
+def test_fallo_conserva_la_ultima_instantanea(servicios):
+    descargador = DescargadorFalso({"^GSPC": 5000.0, "AAPL": 200.0}, RuntimeError("sin red"), {},
+                                   {"AAPL": 201.0})
+    servicio = servicios(SIMBOLOS, descargador=descargador)
+    buena = servicio.refrescar()
+    assert buena.error is None and buena.actualizado is not None
+
+    fallida = servicio.refrescar()
+    assert fallida.precios == buena.precios and fallida.actualizado == buena.actualizado
+    assert fallida.error == "sin red"
+
+    vacia = servicio.refrescar()
+    assert vacia.precios == buena.precios and "no devolvió precios" in vacia.error
+
+    # Un símbolo que falta en la descarga conserva su último valor
+    parcial = servicio.refrescar()
+    assert parcial.precios == {"^GSPC": 5000.0, "AAPL": 201.0} and parcial.error is None
+
+
+def test_espera_limitada_de_la_primera_carga(servicios):
+    descargador = DescargadorFalso(bloquear=True)
+    servicio = servicios(SIMBOLOS, descargador=descargador).iniciar()
+    inicio = time.perf_counter()
+    instantanea = servicio.esperar_primera_carga(timeout=0.2)
+    transcurrido = time.perf_counter() - inicio
+    # La red colgada no bloquea la página más allá del timeout
+    assert 0.2 <= transcurrido < 2
+    assert instantanea.precios == {} and instantanea.actualizado is None
+
+    descargador.liberar.set()
+    assert servicio.esperar_primera_carga(timeout=5).precios == {"^GSPC": 5000.0, "AAPL": 200.0}
+    # Ya cargada, no espera
+    inicio = time.perf_counter()
+    servicio.esperar_primera_carga(timeout=5)
+    assert time.perf_counter() - inicio < 0.1
+
+
+def test_primera_carga_fallida_no_hace_esperar(servicios):
+    servicio = servicios(SIMBOLOS, descargador=DescargadorFalso(RuntimeError("sin red"))).iniciar()
+    inicio = time.perf_counter()
+    instantanea = servicio.esperar_primera_carga(timeout=5)
+    assert time.perf_counter() - inicio < 2
+    assert instantanea.precios == {} and instantanea.error == "sin red" and instantanea.edad is None
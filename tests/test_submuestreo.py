@@ -0,0 +1,74 @@
+# tests/test_submuestreo.py
+import numpy as np
+import pandas as pd
+import pytest
+
+from graficos_sentimiento import plot_polarity_subjectivity
+from submuestreo import lttb, min_max, submuestrear
+
+
+@pytest.fixture
+def serie():
+    rng = np.random.default_rng(0)
+    y = np.cumsum(rng.normal(size=10_000))
+    y[4321] += 500  # pico aislado que un muestreo regular perdería
+    return np.arange(len(y), dtype=np.float64), y
+
+
+@pytest.mark.parametrize("puntos", [3, 4, 100, 1500])
+def test_lttb_extremos_y_longitud(serie, puntos):
+    x, y = serie
+    indices = lttb(x, y, puntos)
+    assert len(indices) == puntos
+    assert indices[0] == 0 and indices[-1] == len(y) - 1
+    assert (np.diff(indices) > 0).all()
+    assert 4321 in indices
+
+
+@pytest.mark.parametrize("puntos", [2, 4, 100, 1500])
+def test_min_max_extremos_y_longitud(serie, puntos):
+    _, y = serie
+    indices = min_max(y, puntos)
+    assert len(indices) == puntos
+    assert indices[0] == 0 and indices[-1] == len(y) - 1
+    assert (np.diff(indices) > 0).all()
+    if puntos >= 4:
+        assert {int(np.argmin(y)), int(np.argmax(y))} <= set(indices.tolist())
+
+
+def test_min_max_puntos_impares(serie):
+    assert len(min_max(serie[1], 101)) == 100
+
+
+@pytest.mark.parametrize("metodo", [lttb, min_max])
+def test_series_cortas_sin_cambios(metodo):
+    y = np.array([3.0, 1.0, 2.0, 5.0])
+    args = (y, 4) if metodo is min_max else (np.arange(4.0), y, 4)
+    np.testing.assert_array_equal(metodo(*args), np.arange(4))
+    args = (y, 10) if metodo is min_max else (np.arange(4.0), y, 10)
+    np.testing.assert_array_equal(metodo(*args), np.arange(4))
+
+
+@pytest.mark.parametrize("metodo", ["lttb", "minmax"])
+def test_submuestrear_dataframe(serie, metodo):
+    _, y = serie
+    datos = pd.DataFrame({"a": y, "b": -y}, index=pd.date_range("2000-01-01", periods=len(y)))
+    datos.iloc[::7, 1] = np.nan
+    reducido = submuestrear(datos, puntos=200, metodo=metodo)
+    assert 200 <= len(reducido) <= 400 and reducido.index.is_monotonic_increasing
+    assert reducido.index[0] == datos.index[0] and reducido.index[-1] == datos.index[-1]
+    pd.testing.assert_frame_equal(reducido, datos.loc[reducido.index])
+
+
+def test_submuestrear_corta_y_metodo_desconocido(serie):
+    corta = pd.Series([1.0, 2.0, 3.0])
+    assert submuestrear(corta, puntos=10) is corta
+    with pytest.raises(ValueError):
+        submuestrear(pd.Series(serie[1]), puntos=10, metodo="aleatorio")
+
+
+@pytest.mark.parametrize("n, tipo", [(500, "scatter"), (1500, "scattergl")])
+def test_dispersion_webgl_automatica(n, tipo):
+    df = pd.DataFrame({"polarity": np.linspace(-1, 1, n), "subjectivity": 0.5,
+                       "sentiment": "Neutro", "title": "t"})
+    assert {traza.type for traza in plot_polarity_subjectivity(df).data} == {tipo}
@@ -0,0 +1,41 @@
+# tests/test_tendencias.py
+import numpy as np
+import pandas as pd
+
+from tendencias import SentimentRollups, parse_published
+
+
+def test_parse_published_igual_que_pandas():
+    valores = [
+        "Sat, 17 Oct 2026 23:59:00 GMT",
+        "Thu, 29 Feb 2024 00:00:01 GMT",
+        "Fri, 30 Feb 2024 00:00:01 GMT",     # día inexistente
+        "Sat, 17 Foo 2026 23:59:00 GMT",     # mes desconocido
+        "Sat, 17 Oct 2026 23:59:00 GMT trailing",
+        "Sat, 17 Oct 2026 23:59:00 +0200",   # otro formato: pasa por pandas
+        "2026-10-17",
+        "",
+        None,
+        "no es una fecha",
+    ]
+    esperado = pd.to_datetime(pd.Series(valores), errors="coerce", utc=True, format="mixed")
+    esperado = esperado.dt.tz_localize(None).to_numpy(dtype="datetime64[s]")
+    np.testing.assert_array_equal(parse_published(valores), esperado)
+
+
+def test_parse_published_vacio():
+    assert len(parse_published([])) == 0
+    assert np.isnat(parse_published(["", ""])).all()
+
+
+def test_rollups_por_bloques_igual_que_de_una_vez():
+    fechas = pd.date_range("2026-10-01", periods=500, freq="37min").strftime("%a, %d %b %Y %H:%M:%S GMT")
+    articulos = [{"published": f, "sentiment": ("Positivo", "Neutro", "Negativo")[i % 3],
+                  "polarity": (i % 7 - 3) / 10} for i, f in enumerate(fechas)]
+    por_bloques = SentimentRollups()
+    for inicio in range(0, len(articulos), 64):
+        por_bloques.add_articles(articulos[inicio:inicio + 64])
+    de_una_vez = SentimentRollups.from_dataframe(pd.DataFrame(articulos))
+    for frecuencia in ("hora", "día", "semana"):
+        pd.testing.assert_frame_equal(por_bloques.frame(frecuencia), de_una_vez.frame(frecuencia))
+        assert por_bloques.frame(frecuencia)[["Positivo", "Neutro", "Negativo"]].to_numpy().sum() == 500
@@ -0,0 +1,119 @@
+# tests/test_vigilancia_noticias.py
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+import pytest
+
+from vigilancia_noticias import VigilanteNoticias
+
+LAST_MODIFIED = "Mon, 03 Mar 2025 10:00:00 GMT"
+
+_ITEM = ("<item><title>{titulo}</title><link>https://ejemplo.com/{n}</link>"
+         "<description>{titulo}</description><pubDate>Mon, 03 Mar 2025 09:00:00 GMT</pubDate></item>")
+
+
+def _feed(titulos):
+    items = "".join(_ITEM.format(titulo=t, n=i) for i, t in enumerate(titulos))
+    return f'<?xml version="1.0"?><rss version="2.0"><channel><title>Feed</title>{items}</channel></rss>'.encode()
+
+
+class _FeedVersionado(BaseHTTPRequestHandler):
+    """Sirve ``server.titulos`` con un ETag por versión y responde 304 si los validadores coinciden."""
+
+    def do_GET(self):
+        etag = f'"v{len(self.server.titulos)}"'
+        self.server.cabeceras.append(dict(self.headers))
+        if self.headers.get("If-None-Match") == etag and self.headers.get("If-Modified-Since") == LAST_MODIFIED:
+            self.send_response(304)
+            self.end_headers()
+            return
+        cuerpo = _feed(self.server.titulos)
+        self.send_response(200)
+        self.send_header("Content-Type", "application/rss+xml")
+        self.send_header("Content-Length", str(len(cuerpo)))
+        self.send_header("ETag", etag)
+        self.send_header("Last-Modified", LAST_MODIFIED)
+        self.end_headers()
+        self.wfile.write(cuerpo)
+
+    def log_message(self, *args):
+        pass
+
+
+class _Contador:
+    """Puntuador que anota los textos recibidos; con ``falla`` lanza una excepción."""
+    name = "contador"
+    version = "1"
+
+    def __init__(self):
+        self.textos = []
+        self.falla = False
+
+    def score(self, texts):
+        if self.falla:
+            raise RuntimeError("fallo del puntuador")
+        self.textos.extend(texts)
+        return np.full(len(texts), 0.5), np.zeros(len(texts))
+
+
+@pytest.fixture
+def servidor():
+    servidor = ThreadingHTTPServer(("127.0.0.1", 0), _FeedVersionado)
+    servidor.daemon_threads = True
+    servidor.titulos = ["Primera noticia", "Segunda noticia"]
+    servidor.cabeceras = []
+    hilo = threading.Thread(target=servidor.serve_forever, daemon=True)
+    hilo.start()
+    yield servidor
+    servidor.shutdown()
+    servidor.server_close()
+
+
+@pytest.fixture
+def contador():
+    return _Contador()
+
+
+@pytest.fixture
+def vigilante(servidor, contador):
+    plantilla = f"http://127.0.0.1:{servidor.server_address[1]}/rss?q={{topic}}"
+    return VigilanteNoticias(["bolsa"], url_template=plantilla, timeout=5, scorer=contador)
+
+
+def test_respuesta_304_con_validadores(servidor, vigilante, contador):
+    estado = vigilante.consultar("bolsa")
+    assert len(estado.nuevos) == 2 and estado.sin_cambios == 0
+
+    estado = vigilante.consultar("bolsa")
+    assert servidor.cabeceras[-1]["If-None-Match"] == '"v2"'
+    assert servidor.cabeceras[-1]["If-Modified-Since"] == LAST_MODIFIED
+    assert estado.nuevos == () and estado.sin_cambios == 1 and estado.consultas == 2
+    assert len(estado.articulos) == 2 and len(contador.textos) == 2
+
+
+def test_solo_se_puntuan_las_entradas_nuevas(servidor, vigilante, contador):
+    vigilante.consultar("bolsa")
+    servidor.titulos = servidor.titulos + ["Tercera noticia"]
+    estado = vigilante.consultar("bolsa")
+    assert [a['title'] for a in estado.nuevos] == ["Tercera noticia"]
+    assert len(contador.textos) == 3 and contador.textos[-1].startswith("Tercera noticia")
+    assert len(estado.articulos) == 3
+
+
+def test_fallo_del_analisis_no_avanza_validadores(servidor, vigilante, contador):
+    contador.falla = True
+    estado = vigilante.consultar("bolsa")
+    assert estado.error == "fallo del puntuador" and estado.articulos == ()
+
+    # Sin validadores guardados: la siguiente consulta no es condicional y
+    # vuelve a puntuar todas las entradas
+    contador.falla = False
+    estado = vigilante.consultar("bolsa")
+    assert "If-None-Match" not in servidor.cabeceras[-1]
+    assert estado.error is None and len(estado.nuevos) == 2 and len(contador.textos) == 2
+
+
+def test_tema_no_vigilado(vigilante):
+    with pytest.raises(KeyError):
+        vigilante.consultar("otro")
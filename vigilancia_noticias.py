@@ -0,0 +1,221 @@
+# vigilancia_noticias.py
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field, replace
+
+from noticias import (
+    MAX_CONCURRENCIA,
+    URL_GOOGLE_NEWS,
+    build_feed_url,
+    entry_to_raw,
+    iter_articles,
+    score_articles
+)
+
+# Segundos entre dos consultas de la lista de vigilancia
+INTERVALO_VIGILANCIA = float(os.environ.get("INTERVALO_VIGILANCIA", 300))
+
+# Artículos analizados que se conservan por tema (los más recientes)
+MAX_ARTICULOS_TEMA = 200
+
+# Enlaces vistos que se recuerdan por tema; los que siguen en el feed se
+# renuevan en cada consulta, así que basta con que supere al tamaño del feed
+MAX_ENLACES_VISTOS = 5000
+
+
+@dataclass(frozen=True)
+class EstadoTema:
+    """Últimos resultados de un tema vigilado.
+
+    ``nuevos`` son los artículos que aparecieron en la última consulta (los
+    primeros de ``articulos``); ``sin_cambios`` cuenta las respuestas 304
+    (feed sin modificar, sin cuerpo que descargar ni analizar).
+    """
+    tema: str
+    articulos: tuple = ()
+    nuevos: tuple = ()
+    consultas: int = 0
+    sin_cambios: int = 0
+    bytes_descargados: int = 0
+    actualizado: float | None = None
+    error: str | None = None
+
+    @property
+    def edad(self):
+        """Segundos desde la última consulta correcta (``None`` si nunca la hubo)."""
+        return None if self.actualizado is None else time.time() - self.actualizado
+
+
+@dataclass
+class _Seguimiento:
+    """Validadores HTTP y enlaces ya vistos de un tema (solo los usa el vigilante)."""
+    etag: str | None = None
+    modified: str | None = None
+    vistos: OrderedDict = field(default_factory=OrderedDict)
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+
+class VigilanteNoticias:
+    """Consulta periódica de una lista de temas que solo analiza las noticias nuevas.
+
+    Cada consulta es un GET condicional (``If-None-Match`` /
+    ``If-Modified-Since`` con el ``ETag`` y el ``Last-Modified`` de la
+    anterior): si el feed no cambió, el servidor responde 304 sin cuerpo. Si
+    cambió, solo se limpian y puntúan las entradas cuyo enlace no estaba ya
+    entre los vistos del tema. Un hilo en segundo plano repite la consulta
+    cada ``intervalo`` segundos; las páginas solo leen ``instantanea()``.
+
+    ``kwargs`` se pasan a ``score_articles`` (``cache``, ``scorer``...).
+    """
+
+    def __init__(self, temas=(), intervalo=INTERVALO_VIGILANCIA, max_articles=100,
+                 url_template=URL_GOOGLE_NEWS, http=None, timeout=15, **kwargs):
+        import urllib3
+
+        self.intervalo = intervalo
+        self.max_articles = max_articles
+        self.url_template = url_template
+        self.timeout = timeout
+        self.http = http or urllib3.PoolManager(
+            maxsize=MAX_CONCURRENCIA, block=True, retries=urllib3.Retry(total=2, backoff_factor=0.5)
+        )
+        self.kwargs = {"mode": "lexicon", **kwargs}
+        self._estados = {}
+        self._seguimiento = {}
+        self._lock = threading.Lock()
+        self._despertar = threading.Event()
+        self._detener = threading.Event()
+        self._hilo = None
+        self.vigilar(temas)
+
+    # ------------------------ LISTA DE VIGILANCIA ------------------------
+    @property
+    def temas(self):
+        return list(self._estados)
+
+    def vigilar(self, temas):
+        """Sustituir la lista de vigilancia; los temas nuevos se consultan enseguida."""
+        temas = list(dict.fromkeys(t.strip() for t in temas if t and t.strip()))
+        with self._lock:
+            nuevos = [t for t in temas if t not in self._estados]
+            self._estados = {t: self._estados.get(t) or EstadoTema(t) for t in temas}
+            self._seguimiento = {t: self._seguimiento.get(t) or _Seguimiento() for t in temas}
+        if nuevos:
+            self._despertar.set()
+        return nuevos
+
+    def instantanea(self) -> dict:
+        """Estado de cada tema vigilado, sin esperar a la red."""
+        return dict(self._estados)
+
+    # ------------------------ CONSULTA ------------------------
+    def _descargar(self, tema, seguimiento):
+        """GET condicional del feed: ``None`` si no cambió, si no la respuesta."""
+        cabeceras = {}
+        if seguimiento.etag:
+            cabeceras["If-None-Match"] = seguimiento.etag
+        if seguimiento.modified:
+            cabeceras["If-Modified-Since"] = seguimiento.modified
+        response = self.http.request("GET", build_feed_url(tema, self.url_template),
+                                     headers=cabeceras, timeout=self.timeout)
+        if response.status == 304:
+            return None
+        if response.status != 200:
+            raise IOError(f"HTTP {response.status} al obtener el tema {tema!r}")
+        return response
+
+    def _entradas(self, tema, cuerpo):
+        """Entradas del feed con la clave (enlace, o título si no hay) que se marca como vista."""
+        import feedparser
+
+        entradas = {}
+        for entry in feedparser.parse(cuerpo).entries[:self.max_articles]:
+            raw = {**entry_to_raw(entry), 'topic': tema}
+            entradas.setdefault(raw['link'] or raw['title'], raw)
+        return list(entradas.items())
+
+    @staticmethod
+    def _marcar_vistas(seguimiento, claves):
+        for clave in claves:
+            seguimiento.vistos[clave] = None
+            seguimiento.vistos.move_to_end(clave)
+        while len(seguimiento.vistos) > MAX_ENLACES_VISTOS:
+            seguimiento.vistos.popitem(last=False)
+
+    def consultar(self, tema) -> EstadoTema:
+        """Consultar un tema y analizar sus entradas nuevas; devuelve su estado actualizado."""
+        with self._lock:
+            seguimiento = self._seguimiento.get(tema)
+        if seguimiento is None:
+            raise KeyError(f"El tema {tema!r} no está en la lista de vigilancia")
+        with seguimiento.lock:
+            with self._lock:
+                estado = self._estados.get(tema) or EstadoTema(tema)
+            estado = replace(estado, consultas=estado.consultas + 1)
+            try:
+                response = self._descargar(tema, seguimiento)
+                if response is None:
+                    estado = replace(estado, nuevos=(), sin_cambios=estado.sin_cambios + 1,
+                                     actualizado=time.time(), error=None)
+                else:
+                    entradas = self._entradas(tema, response.data)
+                    articulos = list(iter_articles(
+                        raw for clave, raw in entradas if clave not in seguimiento.vistos
+                    ))
+                    nuevos = tuple(score_articles(articulos, **self.kwargs)) if articulos else ()
+                    # Validadores y vistos solo avanzan si el análisis terminó: tras
+                    # un fallo, la siguiente consulta vuelve a traer el feed completo
+                    self._marcar_vistas(seguimiento, [clave for clave, _ in entradas])
+                    seguimiento.etag = response.headers.get("ETag")
+                    seguimiento.modified = response.headers.get("Last-Modified")
+                    estado = replace(
+                        estado,
+                        articulos=(nuevos + estado.articulos)[:MAX_ARTICULOS_TEMA],
+                        nuevos=nuevos,
+                        bytes_descargados=estado.bytes_descargados + len(response.data),
+                        actualizado=time.time(),
+                        error=None
+                    )
+            except Exception as e:
+                estado = replace(estado, error=str(e))
+            with self._lock:
+                # Si el tema dejó de vigilarse mientras tanto, su estado se descarta
+                if tema in self._estados:
+                    self._estados[tema] = estado
+        return estado
+
+    def consultar_todos(self):
+        """Consultar en paralelo todos los temas de la lista de vigilancia."""
+        temas = self.temas
+        if not temas:
+            return {}
+        with ThreadPoolExecutor(max_workers=max(1, min(MAX_CONCURRENCIA, len(temas)))) as executor:
+            return dict(zip(temas, executor.map(self.consultar, temas)))
+
+    # ------------------------ HILO EN SEGUNDO PLANO ------------------------
+    def consultar_ahora(self):
+        """Adelantar la siguiente consulta del hilo en segundo plano."""
+        self._despertar.set()
+
+    def iniciar(self):
+        """Arrancar el hilo de vigilancia (no hace nada si ya está en marcha)."""
+        with self._lock:
+            if self._hilo is not None and self._hilo.is_alive():
+                return self
+            self._detener.clear()
+            self._hilo = threading.Thread(target=self._bucle, name="vigilancia-noticias", daemon=True)
+            self._hilo.start()
+        return self
+
+    def detener(self):
+        self._detener.set()
+        self._despertar.set()
+
+    def _bucle(self):
+        while not self._detener.is_set():
+            self._despertar.clear()
+            self.consultar_todos()
+            self._despertar.wait(self.intervalo)